@@ -1,11 +1,16 @@
 import logging
-from pygame.locals import *
-from .controller.game_controller import GameController
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger('CheeseChase')
 
 __all__ = ["GameController"]
 
+def __getattr__(name):
+    # the game pulls in pygame and every view module, so load it on first use;
+    # headless tools can import CheeseChase.model or CheeseChase.batch without it
+    if name == "GameController":
+        from .controller.game_controller import GameController
+        return GameController
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 # let this be the last line of this file
 logger.info("CheeseChase loaded")
\ No newline at end of file
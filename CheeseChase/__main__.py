@@ -1,10 +1,88 @@
+import argparse
+import logging
+import random
+import time
 import CheeseChase
 
-if __name__ == "__main__":
-    game = CheeseChase.GameController()
-    game.startGame()
-    while True:
-        game.update()
+# where the profile goes when it was switched on in game rather than with --profile
+PROFILEPATH = "cheesechase-profile.json"
 
+def parseArgs(args=None):
+    parser = argparse.ArgumentParser(prog="CheeseChase")
+    parser.add_argument("--headless", action="store_true",
+                        help="simulate without a window, at a fixed dt and no frame cap")
+    parser.add_argument("--frames", type=int, default=None,
+                        help="stop after this many frames")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the cats and the scripted mouse")
+    parser.add_argument("--pathfinding", action="store_true",
+                        help="cats follow shortest paths through the maze")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="time each frame phase and dump the stats to this JSON file on exit "
+                             "(profiles started with F3 go to %s)" % PROFILEPATH)
+    parser.add_argument("--profile-window", type=int, default=600,
+                        help="number of recent frames the profile stats cover")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="record the input and random seed of this session to PATH")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="replay a recorded session as fast as possible")
+    parser.add_argument("--render", action="store_true",
+                        help="draw the game while replaying")
+    return parser.parse_args(args)
 
+def main(args=None):
+    options = parseArgs(args)
+    # the package leaves logging alone; the command line shows info and up
+    logging.basicConfig(level=logging.INFO)
+    # pygame and the game load only once the arguments are known to be good
+    from CheeseChase.controller.inputs import RandomControls
+    from CheeseChase.controller.recording import InputRecorder
+    from CheeseChase.controller.assets import AssetLoader
+    if options.replay is not None:
+        return replaySession(options)
+    # sprites, font and mazes decode on worker threads while the window opens
+    assets = AssetLoader()
+    assets.preload()
+    if options.seed is not None:
+        random.seed(options.seed)
+    controls = None
+    if options.headless:
+        controls = RandomControls(options.seed)
+    if options.record is not None:
+        controls = InputRecorder(controls, options.seed)
+    game = CheeseChase.GameController(headless=options.headless, controls=controls,
+                                         pathfinding=options.pathfinding,
+                                         profile=options.profile is not None,
+                                         profileWindow=options.profile_window,
+                                         assets=assets)
+    game.startGame()
+    frames = 0
+    start = time.perf_counter()
+    try:
+        while options.frames is None or frames < options.frames:
+            game.update()
+            frames += 1
+    finally:
+        if options.profile is not None or game.profiler.samples:
+            print(game.profiler.report())
+            game.profiler.dump(options.profile or PROFILEPATH)
+        if options.record is not None:
+            controls.save(options.record)
+        assets.shutdown()
+    elapsed = time.perf_counter() - start
+    print("%d frames in %.2fs (%.0f fps): level %d, score %d, lives %d"
+          % (frames, elapsed, frames / elapsed, game.level, game.score, game.lives))
+    return game
 
+def replaySession(options):
+    from CheeseChase.controller.recording import Recording, replay
+    recording = Recording.load(options.replay)
+    start = time.perf_counter()
+    game = replay(recording, render=options.render)
+    elapsed = time.perf_counter() - start
+    print("%d steps (%.0fs of play) replayed in %.2fs: level %d, score %d, lives %d"
+          % (len(recording), len(recording) * recording.stepDt, elapsed, game.level, game.score, game.lives))
+    return game
+
+if __name__ == "__main__":
+    main()
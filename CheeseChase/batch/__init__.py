@@ -0,0 +1,4 @@
+from .maze import BatchMaze, loadMaze
+from .engine import BatchEngine
+
+__all__ = ["BatchMaze", "BatchEngine", "loadMaze"]
@@ -0,0 +1,275 @@
+import numpy as np
+from ..model.constants import *
+from .maze import LINKDIRECTIONS, ENTITIES
+
+# lookups indexed by direction code + 2, i.e. RIGHT, DOWN, STOP, UP, LEFT
+LINKINDEX = np.array([3, 1, 0, 0, 2])
+VECTORS = np.array([[1, 0], [0, 1], [0, 0], [0, -1], [-1, 0]], dtype=float)
+LINKCODES = np.array(LINKDIRECTIONS)
+LINKVECTORS = VECTORS[LINKCODES + 2]
+# access bit of the entity in each slot
+ACCESSSHIFTS = np.array(ENTITIES)
+
+# cat speed by mode, as set by Cat.normalMode, startFreight and startSpawn
+CATSPEEDS = np.array([100, 100, 50, 150]) * TILEWIDTH / 16
+MAINTIMES = np.array([7, 20], dtype=float)
+FREIGHTTIME = 7
+CATPAUSE = 1
+ENDPAUSE = 3
+
+class BatchEngine(object):
+    """N independent games, one life on one level each, stepped in lockstep."""
+
+    def __init__(self, maze, n, seed=None, stepDt=1.0/60):
+        self.maze = maze
+        self.n = n
+        self.stepDt = stepDt
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        n, maze = self.n, self.maze
+        self.random = np.random.default_rng(seed)
+        self.draws = np.zeros((n, 4))
+        self.position = np.zeros((n, 5, 2))
+        self.direction = np.zeros((n, 5), dtype=np.int64)
+        self.node = np.zeros((n, 5), dtype=np.int64)
+        self.target = np.zeros((n, 5), dtype=np.int64)
+        self.access = np.zeros((n,) + maze.access.shape, dtype=np.uint8)
+        self.mode = np.zeros((n, 4), dtype=np.int64)
+        self.mainMode = np.zeros(n, dtype=np.int64)
+        self.mainTimer = np.zeros(n)
+        self.freightTimer = np.zeros((n, 4))
+        self.points = np.zeros(n, dtype=np.int64)
+        self.cheeses = np.zeros((n, len(maze.cheesePoints)), dtype=bool)
+        self.numEaten = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.alive = np.zeros(n, dtype=bool)
+        self.cleared = np.zeros(n, dtype=bool)
+        self.done = np.zeros(n, dtype=bool)
+        self.paused = np.zeros(n, dtype=bool)
+        self.pauseTimer = np.zeros(n)
+        self.pauseTime = np.zeros(n)
+        self.steps = 0
+        self.restart(np.ones(n, dtype=bool))
+
+    def restart(self, games):
+        """Put the selected games back at the start of the level."""
+        maze = self.maze
+        self.position[games] = maze.startPositions
+        self.direction[games] = maze.startDirections
+        self.node[games] = maze.startNodes
+        self.target[games] = maze.startTargets
+        self.access[games] = maze.access
+        self.mode[games] = SCATTER
+        self.mainMode[games] = SCATTER
+        self.mainTimer[games] = 0
+        self.freightTimer[games] = 0
+        self.points[games] = 200
+        self.cheeses[games] = True
+        self.numEaten[games] = 0
+        self.score[games] = 0
+        self.alive[games] = True
+        self.cleared[games] = False
+        self.done[games] = False
+        self.paused[games] = False
+        self.pauseTimer[games] = 0
+        self.pauseTime[games] = np.nan
+
+    def step(self, actions):
+        actions = np.broadcast_to(np.asarray(actions, dtype=np.int64), (self.n,))
+        dt = self.stepDt
+        rewards = np.zeros(self.n, dtype=np.int64)
+        # one uniform draw per cat and step; a frightened cat at a node picks
+        # directions[int(draw * len(directions))], whether or not it needs it
+        self.draws = self.random.random((self.n, 4))
+        active = ~self.done
+        run = active & ~self.paused
+        if run.any():
+            self.updateModes(run, dt)
+            self.moveCats(run, dt)
+            self.checkCheeseEvents(run, rewards)
+            self.checkCatEvents(run, rewards)
+        self.moveMouse(active & (~self.alive | ~self.paused), actions, dt)
+        self.updatePause(active, dt)
+        self.score += rewards
+        self.done |= ~self.alive | self.cleared
+        self.steps += 1
+        return rewards, self.done.copy()
+
+    def setPause(self, games, pauseTime):
+        self.paused[games] = ~self.paused[games]
+        self.pauseTimer[games] = 0
+        self.pauseTime[games] = pauseTime
+
+    def updatePause(self, games, dt):
+        timed = games & ~np.isnan(self.pauseTime)
+        self.pauseTimer[timed] += dt
+        over = timed & (self.pauseTimer >= self.pauseTime)
+        self.pauseTimer[over] = 0
+        self.paused[over] = False
+        self.pauseTime[over] = np.nan
+        # what EventsManager.resumeIfWaiting does for headless games
+        waiting = games & self.paused & np.isnan(self.pauseTime) & self.alive
+        self.paused[waiting] = False
+
+    def updateModes(self, run, dt):
+        self.mainTimer[run] += dt
+        switch = run & (self.mainTimer >= MAINTIMES[self.mainMode])
+        self.mainMode[switch] = CHASE - self.mainMode[switch]
+        self.mainTimer[switch] = 0
+
+        runs = run[:, None]
+        mainMode = np.broadcast_to(self.mainMode[:, None], self.mode.shape)
+        freight = runs & (self.mode == FREIGHT)
+        self.freightTimer[freight] += dt
+        ended = freight & (self.freightTimer >= FREIGHTTIME)
+        normal = runs & ((self.mode == SCATTER) | (self.mode == CHASE))
+        self.mode[ended | normal] = mainMode[ended | normal]
+        self.normalMode(ended)
+        home = self.node[:, 1:] == self.maze.spawnNode
+        spawned = runs & (self.mode == SPAWN) & home
+        self.mode[spawned] = mainMode[spawned]
+        self.normalMode(spawned)
+
+    def normalMode(self, cats):
+        games, slots = np.nonzero(cats)
+        # every cat shares a home node, so several may close it in one game at once
+        masks = ~np.left_shift(1, ACCESSSHIFTS[slots + 1]).astype(np.uint8)
+        np.bitwise_and.at(self.access, (games, self.maze.catHomes[slots], 1), masks)
+
+    def newTarget(self, games, slots, nodes, directions):
+        links = LINKINDEX[directions + 2]
+        allowed = (self.access[games, nodes, links] >> ACCESSSHIFTS[slots]) & 1
+        neighbor = self.maze.links[nodes, links]
+        valid = (directions != STOP) & (allowed == 1) & (neighbor >= 0)
+        return np.where(valid, neighbor, nodes)
+
+    def overshot(self, games, slots):
+        nodes = self.maze.positions[self.node[games, slots]]
+        targets = self.maze.positions[self.target[games, slots]]
+        positions = self.position[games, slots]
+        dx = targets[:, 0] - nodes[:, 0]
+        dy = targets[:, 1] - nodes[:, 1]
+        node2Target = dx*dx + dy*dy
+        dx = positions[:, 0] - nodes[:, 0]
+        dy = positions[:, 1] - nodes[:, 1]
+        return dx*dx + dy*dy >= node2Target
+
+    def moveCats(self, run, dt):
+        games, cats = np.nonzero(np.broadcast_to(run[:, None], self.mode.shape))
+        slots = cats + 1
+        modes = self.mode[games, cats]
+        speeds = CATSPEEDS[modes] * dt
+        self.position[games, slots] += VECTORS[self.direction[games, slots] + 2] * speeds[:, None]
+
+        arrived = self.overshot(games, slots)
+        games, cats, slots, modes = games[arrived], cats[arrived], slots[arrived], modes[arrived]
+        nodes = self.target[games, slots]
+        direction = self.direction[games, slots]
+        allowed = (self.access[games, nodes] >> ACCESSSHIFTS[slots][:, None]) & 1
+        valid = (allowed == 1) & (self.maze.links[nodes] >= 0) & (LINKCODES != -direction[:, None])
+
+        goals = np.zeros((len(games), 2))
+        chase = modes == CHASE
+        goals[chase] = self.position[games[chase], 0]
+        goals[modes == SPAWN] = self.maze.positions[self.maze.spawnNode]
+        candidates = self.maze.positions[nodes][:, None, :] + LINKVECTORS * TILEWIDTH
+        dx = candidates[..., 0] - goals[:, 0, None]
+        dy = candidates[..., 1] - goals[:, 1, None]
+        byGoal = np.argmin(np.where(valid, dx*dx + dy*dy, np.inf), axis=1)
+
+        pick = (self.draws[games, cats] * valid.sum(axis=1)).astype(np.int64)
+        byChance = np.argmax(np.cumsum(valid, axis=1) > pick[:, None], axis=1)
+        chosen = LINKCODES[np.where(modes == FREIGHT, byChance, byGoal)]
+        chosen = np.where(valid.any(axis=1), chosen, -direction)
+
+        portals = self.maze.portals[nodes]
+        nodes = np.where(portals >= 0, portals, nodes)
+        self.settle(games, slots, nodes, chosen, direction)
+
+    def settle(self, games, slots, nodes, chosen, direction):
+        targets = self.newTarget(games, slots, nodes, chosen)
+        moved = targets != nodes
+        self.direction[games, slots] = np.where(moved, chosen, direction)
+        targets = np.where(moved, targets, self.newTarget(games, slots, nodes, direction))
+        self.node[games, slots] = nodes
+        self.target[games, slots] = targets
+        self.position[games, slots] = self.maze.positions[nodes]
+        return targets
+
+    def moveMouse(self, games, actions, dt):
+        games = np.nonzero(games)[0]
+        slots = np.zeros(len(games), dtype=np.int64)
+        self.position[games, 0] += VECTORS[self.direction[games, 0] + 2] * (self.maze.mouseSpeed * dt)
+        keys = actions[games]
+
+        arrived = self.overshot(games, slots)
+        reverse = ~arrived & (keys != STOP) & (keys == -self.direction[games, 0])
+        turn = games[reverse]
+        self.direction[turn, 0] *= -1
+        self.node[turn, 0], self.target[turn, 0] = self.target[turn, 0], self.node[turn, 0]
+
+        games, slots, keys = games[arrived], slots[arrived], keys[arrived]
+        nodes = self.target[games, 0]
+        portals = self.maze.portals[nodes]
+        nodes = np.where(portals >= 0, portals, nodes)
+        targets = self.settle(games, slots, nodes, keys, self.direction[games, 0])
+        stopped = games[targets == nodes]
+        self.direction[stopped, 0] = STOP
+
+    def checkCheeseEvents(self, run, rewards):
+        maze = self.maze
+        games = np.nonzero(run)[0]
+        mouse = self.position[games, 0]
+        rows = np.clip(np.rint(mouse[:, 1] / TILEHEIGHT).astype(np.int64), 0, NROWS)
+        cols = np.clip(np.rint(mouse[:, 0] / TILEWIDTH).astype(np.int64), 0, NCOLS)
+        nearest = maze.cheeseGrid[rows, cols]
+        candidate = nearest >= 0
+        games, mouse, nearest = games[candidate], mouse[candidate], nearest[candidate]
+        dx = mouse[:, 0] - maze.cheesePositions[nearest, 0]
+        dy = mouse[:, 1] - maze.cheesePositions[nearest, 1]
+        reach = (maze.collideRadius + maze.cheeseRadius)**2
+        hit = (dx*dx + dy*dy <= reach) & self.cheeses[games, nearest]
+        games, eaten = games[hit], nearest[hit]
+        if len(games) == 0:
+            return
+        self.cheeses[games, eaten] = False
+        self.numEaten[games] += 1
+        rewards[games] += maze.cheesePoints[eaten]
+        gate = games[self.numEaten[games] == 30]
+        self.access[gate, maze.cat3Gate, 3] |= 1 << CAT3
+        gate = games[self.numEaten[games] == 70]
+        self.access[gate, maze.cat4Gate, 2] |= 1 << CAT4
+        self.startFreight(games[maze.cheesePower[eaten]])
+        cleared = games[~self.cheeses[games].any(axis=1)]
+        self.cleared[cleared] = True
+        self.setPause(cleared, ENDPAUSE)
+
+    def startFreight(self, games):
+        modes = self.mode[games]
+        start = (modes == SCATTER) | (modes == CHASE) | (modes == FREIGHT)
+        modes[(modes == SCATTER) | (modes == CHASE)] = FREIGHT
+        self.mode[games] = modes
+        timers = self.freightTimer[games]
+        timers[start] = 0
+        self.freightTimer[games] = timers
+        self.points[games] = 200
+
+    def checkCatEvents(self, run, rewards):
+        mouse = self.position[:, 0]
+        reach = (2 * self.maze.collideRadius)**2
+        for cat in range(4):
+            dx = mouse[:, 0] - self.position[:, cat + 1, 0]
+            dy = mouse[:, 1] - self.position[:, cat + 1, 1]
+            hit = run & (dx*dx + dy*dy <= reach)
+            mode = self.mode[:, cat].copy()
+            eat = hit & (mode == FREIGHT)
+            rewards[eat] += self.points[eat]
+            self.points[eat] *= 2
+            self.setPause(eat, CATPAUSE)
+            self.mode[eat, cat] = SPAWN
+            self.access[eat, self.maze.homeNode, 1] |= 1 << ENTITIES[cat + 1]
+            kill = hit & ~eat & (mode != SPAWN) & self.alive
+            self.alive[kill] = False
+            self.direction[kill, 0] = STOP
+            self.setPause(kill, ENDPAUSE)
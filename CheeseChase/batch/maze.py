@@ -0,0 +1,51 @@
+import numpy as np
+from ..model.constants import *
+from ..model.cheeses import CHEESERADIUS, CHEESEPOINTS, POWERPOINTS
+
+# entity names by engine slot; each name is also its access bit
+ENTITIES = (MOUSE, CAT1, CAT2, CAT3, CAT4)
+LINKDIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+class BatchMaze(object):
+    def __init__(self, game):
+        # read everything off a started game so the batch engine shares its setup
+        # rules; the node arrays are the game's own graph, so the entity in slot e
+        # may leave node i towards direction j when access[i, j] >> ENTITIES[e] & 1
+        graph = game.nodes.graph
+        self.positions = graph.positions.copy()
+        self.links = graph.links[:, :4].astype(np.int64)
+        self.portals = graph.links[:, 4].astype(np.int64)
+        self.access = graph.access.copy()
+
+        entities = [game.mouse] + list(game.cats)
+        self.startNodes = np.array([entity.node.index for entity in entities], dtype=np.int64)
+        self.startTargets = np.array([entity.target.index for entity in entities], dtype=np.int64)
+        self.startPositions = np.array([entity.position.asTuple() for entity in entities], dtype=float)
+        self.startDirections = np.array([entity.direction for entity in entities], dtype=np.int64)
+        self.mouseSpeed = game.mouse.speed
+        self.catHomes = np.array([cat.homeNode.index for cat in game.cats], dtype=np.int64)
+        self.spawnNode = game.cats.cat1.spawnNode.index
+        self.homeNode = game.nodes.nodesLUT[game.nodes.homekey].index
+        self.cat3Gate = game.cats.cat3.startNode.index
+        self.cat4Gate = game.cats.cat4.startNode.index
+
+        rows, cols, power = game.cheeses.remaining()
+        self.cheesePositions = np.stack([cols * TILEWIDTH, rows * TILEHEIGHT], axis=1).astype(float)
+        self.cheesePoints = np.where(power, POWERPOINTS, CHEESEPOINTS).astype(np.int64)
+        self.cheesePower = power
+        self.cheeseRadius = CHEESERADIUS
+        # cheeses sit on tile corners further apart than the eating reach, so only
+        # the one at the mouse's nearest corner can be eaten
+        self.cheeseGrid = np.full((NROWS + 1, NCOLS + 1), -1, dtype=np.int64)
+        cols = (self.cheesePositions[:, 0] // TILEWIDTH).astype(np.int64)
+        rows = (self.cheesePositions[:, 1] // TILEHEIGHT).astype(np.int64)
+        self.cheeseGrid[rows, cols] = np.arange(len(cols))
+        self.collideRadius = game.mouse.collideRadius
+
+def loadMaze(level=0):
+    # a real game is only needed here, so pygame loads when a maze does
+    from ..controller.game_controller import GameController
+    game = GameController(headless=True)
+    game.level = level
+    game.startGame()
+    return BatchMaze(game)
@@ -0,0 +1,65 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from importlib import resources
+from time import perf_counter
+from ..model.mazedata import MazeData
+from ..model.mazecache import MazeCache
+from ..view.sprites import sheets, SPRITESHEET
+from ..view.text import textcache, FONT
+
+logger = logging.getLogger('CheeseChase')
+
+# startup milestones, in the order they normally happen
+MILESTONES = ("window", "first frame", "playable", "preloaded")
+
+class AssetLoader(object):
+    def __init__(self, mazecache=None, workers=3):
+        self.origin = perf_counter()
+        self.timeline = {}
+        self.mazecache = mazecache or MazeCache()
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="CheeseChase-assets")
+        self.futures = []
+
+    def preload(self, levels=None):
+        # queue everything the game will ask for, first level first; the caches
+        # hand the results over when the main thread asks for them
+        base = resources.files("CheeseChase.resources")
+        self.futures.append(sheets.preload(SPRITESHEET, self.executor))
+        self.futures.append(textcache.preloadFont(str(base / FONT), self.executor))
+        mazedata = MazeData()
+        if levels is None:
+            levels = range(len(mazedata.mazedict))
+        for level in levels:
+            mazedata.loadMaze(level)
+            name = mazedata.obj.name
+            self.futures.append(self.mazecache.preload(str(base / f"{name}.txt"), str(base / f"{name}_rotation.txt"),
+                                                       mazedata.obj.portalPairs, self.executor))
+        self.futures = [future for future in self.futures if future is not None]
+        for future in self.futures:
+            future.add_done_callback(self.finished)
+        if not self.futures:
+            self.mark("preloaded")
+
+    def finished(self, future):
+        # runs on the worker thread that finished the future
+        if future.exception() is not None:
+            logger.warning("Asset preload failed: %s", future.exception())
+        if all(f.done() for f in self.futures):
+            self.mark("preloaded")
+
+    @property
+    def done(self):
+        return all(future.done() for future in self.futures)
+
+    def mark(self, milestone):
+        # only the first time a milestone is reached counts
+        if milestone not in self.timeline:
+            self.timeline[milestone] = (perf_counter() - self.origin) * 1000
+            logger.info("startup: %s after %.1f ms", milestone, self.timeline[milestone])
+
+    def report(self):
+        return ", ".join("%s %.1f ms" % (milestone, self.timeline[milestone])
+                         for milestone in MILESTONES if milestone in self.timeline)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
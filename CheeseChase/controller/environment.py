@@ -0,0 +1,76 @@
+import random
+import time
+import numpy as np
+from ..model.constants import *
+from .game_controller import GameController
+
+ACTIONS = (STOP, UP, DOWN, LEFT, RIGHT)
+
+class GameEnv(object):
+    def __init__(self, frameskip=1, level=0, stepDt=1.0/60):
+        if frameskip < 1:
+            raise ValueError("frameskip must be at least 1, got %r" % (frameskip,))
+        self.frameskip = frameskip
+        self.level = level
+        self.stepDt = stepDt
+        self.game = None
+        self.mazecache = None
+        self.action = STOP
+        self.steps = 0
+        self.frames = 0
+        self.elapsed = 0
+        self.done = True
+
+    def reset(self, seed=None):
+        if seed is not None:
+            # cats pick frightened directions from the random module
+            random.seed(seed)
+        self.game = GameController(headless=True, stepDt=self.stepDt, controls=self.controls)
+        if self.mazecache is None:
+            self.mazecache = self.game.mazecache
+        self.game.mazecache = self.mazecache
+        self.game.level = self.level
+        self.game.startGame()
+        self.cheeses = self.game.cheeses.remaining()[:2]
+        self.action = STOP
+        self.done = False
+        return self.observe()
+
+    def controls(self):
+        return self.action
+
+    def step(self, action):
+        if self.game is None or self.done:
+            raise RuntimeError("call reset() before stepping a finished environment")
+        if action not in ACTIONS:
+            raise ValueError("unknown action %r" % (action,))
+        game = self.game
+        self.action = action
+        score = game.score
+        lives = game.lives
+        start = time.perf_counter()
+        for i in range(self.frameskip):
+            game.update()
+            self.frames += 1
+            if game.lives <= 0 or game.cheeses.isEmpty():
+                self.done = True
+                break
+        self.elapsed += time.perf_counter() - start
+        self.steps += 1
+        info = {"score": game.score, "lives": game.lives, "level": game.level,
+                "lifeLost": game.lives < lives, "cleared": game.cheeses.isEmpty(),
+                "paused": game.pause.paused, "frames": self.frames}
+        return self.observe(), game.score - score, self.done, info
+
+    def observe(self):
+        game = self.game
+        return {"mouse": np.array([game.mouse.position.x, game.mouse.position.y, game.mouse.direction]),
+                "cats": np.array([[cat.position.x, cat.position.y, cat.direction, cat.mode.current]
+                                  for cat in game.cats]),
+                "cheeses": game.cheeses.present()[self.cheeses],
+                "lives": game.lives}
+
+    def stepsPerSecond(self):
+        if self.elapsed == 0:
+            return 0.0
+        return self.steps / self.elapsed
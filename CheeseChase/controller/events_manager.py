@@ -14,16 +14,27 @@ class EventsManager:
                 exit()
             elif event.type == KEYDOWN:
                 if event.key == K_SPACE:
-                    if self.gc.mouse.alive:
-                        self.gc.pause.setPause(playerPaused=True)
-                        if not self.gc.pause.paused:
-                            self.gc.textgroup.hideText()
-                            self.gc.showEntities()
-                        else:
-                            self.gc.textgroup.showText(PAUSETXT)
+                    self.togglePause()
+                elif event.key == K_F3:
+                    self.gc.profiler.toggle()
+
+    def togglePause(self):
+        self.gc.controls.pauseToggled()
+        if self.gc.mouse.alive:
+            self.gc.pause.setPause(playerPaused=True)
+            if not self.gc.pause.paused:
+                self.gc.textgroup.hideText()
+                self.gc.showEntities()
+            else:
+                self.gc.textgroup.showText(PAUSETXT)
+
+    def resumeIfWaiting(self):
+        # headless games have nobody to press SPACE after a reset or a new level
+        if self.gc.pause.paused and self.gc.pause.pauseTime is None:
+            self.togglePause()
 
     def checkCheeseEvents(self):
-        cheese = self.gc.mouse.eatCheeses(self.gc.cheeses.cheeseList)
+        cheese = self.gc.mouse.eatCheeses(self.gc.cheeses)
         if cheese:
             self.gc.cheeses.numEaten += 1
             self.gc.updateScore(cheese.points)
@@ -31,7 +42,7 @@ class EventsManager:
                 self.gc.cats.cat3.startNode.allowAccess(RIGHT, self.gc.cats.cat3)
             if self.gc.cheeses.numEaten == 70:
                 self.gc.cats.cat4.startNode.allowAccess(LEFT, self.gc.cats.cat4)
-            self.gc.cheeses.cheeseList.remove(cheese)
+            self.gc.cheeses.removeCheese(cheese)
             if cheese.name == POWERCHEESE:
                 self.gc.cats.startFreight()
             if self.gc.cheeses.isEmpty():
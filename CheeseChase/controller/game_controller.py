@@ -1,3 +1,4 @@
+import os
 import pygame
 from pygame.locals import *
 from ..model.constants import *
@@ -5,52 +6,111 @@ from ..model.mouse import Mouse
 from ..model.nodes import NodeGroup
 from ..model.cheeses import CheeseGroup
 from ..model.cats import CatGroup
+from ..model.fields import DistanceField
 from .pauser import Pause
-from ..view.text import TextGroup
-from ..view.sprites import LifeSprites
-from ..view.sprites import MazeSprites
+from .inputs import asProvider
+from .profiler import FrameProfiler
+from ..view.text import TextGroup, HeadlessTextGroup
+from ..view.sprites import LifeSprites, HeadlessLifeSprites
+from ..view.sprites import MazeSprites, HeadlessMazeSprites
 from ..model.mazedata import MazeData
+from ..model.mazecache import MazeCache
 from .events_manager import EventsManager
 from .levels_manager import LevelManager
 from ..view.game_view import GameView 
 from importlib import resources
 
-class GameController(object):
-    def __init__(self):
+def initPygame(headless):
+    # headless games ask for the dummy video driver only while pygame.init()
+    # reads it, and a later window doesn't inherit a display they started
+    if not headless:
+        if (pygame.display.get_init() and pygame.display.get_driver() == "dummy"
+                and os.environ.get("SDL_VIDEODRIVER") != "dummy"):
+            pygame.display.quit()
+        pygame.init()
+        return
+    previous = os.environ.get("SDL_VIDEODRIVER")
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    try:
         pygame.init()
-        self.screen = pygame.display.set_mode(SCREENSIZE, 0, 32)
+    finally:
+        if previous is None:
+            del os.environ["SDL_VIDEODRIVER"]
+        else:
+            os.environ["SDL_VIDEODRIVER"] = previous
+
+class GameController(object):
+    def __init__(self, dirtyRects=False, headless=False, stepDt=1.0/60, controls=None, maxSteps=5, pathfinding=False,
+                 profile=False, profileWindow=600, assets=None, maze=0):
+        self.headless = headless
+        self.pathfinding = pathfinding
+        self.stepDt = stepDt
+        self.maxSteps = maxSteps
+        self.accumulator = 0
+        self.droppedTime = 0
+        self.controls = asProvider(controls)
+        self.profiler = FrameProfiler(profileWindow, enabled=profile)
+        initPygame(headless)
+        self.assets = assets
+        self.screen = None
+        if not headless:
+            self.screen = pygame.display.set_mode(SCREENSIZE, 0, 32)
+            if assets is not None:
+                assets.mark("window")
         self.background = None
         self.background_norm = None
         self.background_flash = None
         self.clock = pygame.time.Clock()
-        self.pause = Pause(True)
+        self.pause = Pause(not headless)
         self.level = 0
         self.lives = 5
         self.score = 0
-        self.textgroup = TextGroup()
-        self.lifesprites = LifeSprites(self.lives)
+        # headless games keep score and lives without opening the font or the spritesheet
+        if headless:
+            self.textgroup = HeadlessTextGroup()
+            self.lifesprites = HeadlessLifeSprites(self.lives)
+        else:
+            self.textgroup = TextGroup()
+            # READY only needs the font, so it goes up before anything waits on the spritesheet
+            if assets is not None:
+                self.showLoading()
+            self.lifesprites = LifeSprites(self.lives)
         self.flashBG = False
         self.flashTime = 0.2
         self.flashTimer = 0
-        self.mazedata = MazeData()
+        self.mazedata = MazeData(maze)
+        self.mazecache = assets.mazecache if assets is not None else MazeCache()
         self.events_manager = EventsManager(self)
         self.level_manager = LevelManager(self)
-        self.view = GameView(self)
+        self.view = GameView(self, dirtyRects=dirtyRects)
+        self.controls.attach(self)
+
+    def showLoading(self):
+        # READY on a blank screen; the spritesheet and mazes are still decoding on the
+        # loader's workers, and the main thread waits for each one when it first needs it
+        self.screen.fill(BLACK)
+        self.textgroup.render(self.screen)
+        pygame.display.update()
+        self.assets.mark("first frame")
 
     def startGame(self):      
         self.mazedata.loadMaze(self.level)
         base = resources.files("CheeseChase.resources")
         maze_txt = base / f"{self.mazedata.obj.name}.txt"
         rotation_txt = base / f"{self.mazedata.obj.name}_rotation.txt"
-        self.mazesprites = MazeSprites(str(maze_txt), str(rotation_txt))
-        self.setBackground()
-        self.nodes = NodeGroup(str(maze_txt))
-        
-        self.mazedata.obj.setPortalPairs(self.nodes)
+        compiled = self.mazecache.load(str(maze_txt), str(rotation_txt), self.mazedata.obj.portalPairs)
+        if self.headless:
+            self.mazesprites = HeadlessMazeSprites(str(maze_txt), str(rotation_txt), compiled)
+        else:
+            self.mazesprites = MazeSprites(str(maze_txt), str(rotation_txt), compiled)
+            self.setBackground()
+        # the compiled maze brings its portals along
+        self.nodes = NodeGroup(str(maze_txt), compiled)
         self.mazedata.obj.connectHomeNodes(self.nodes)
         
         self.mouse = Mouse(self.nodes.getNodeFromTiles(*self.mazedata.obj.mouseStart))
-        self.cheeses = CheeseGroup(str(maze_txt), self.mazesprites)
+        self.mouse.controls = self.controls
+        self.cheeses = CheeseGroup(str(maze_txt), self.mazesprites, compiled)
 
         self.cats = CatGroup(self.nodes.getStartTempNode(), self.mouse)
 
@@ -65,6 +125,11 @@ class GameController(object):
         self.cats.cat3.startNode.denyAccess(RIGHT, self.cats.cat3)
         self.cats.cat4.startNode.denyAccess(LEFT, self.cats.cat4)
         self.mazedata.obj.denyCatsAccess(self.cats, self.nodes)
+        if self.pathfinding:
+            self.cats.usePaths(self.nodes)
+            self.cats.useDistanceField(DistanceField(compiled.data, self.mazedata.obj.portalPairs, self.nodes.graph))
+        if self.assets is not None:
+            self.assets.mark("playable")
 
     def setBackground(self):
         self.background_norm = pygame.surface.Surface(SCREENSIZE).convert()
@@ -77,19 +142,73 @@ class GameController(object):
         self.background = self.background_norm
 
     def update(self):
-        dt = self.clock.tick(30) / 1000.0
+        profiler = self.profiler if self.profiler.enabled else None
+        if not self.headless:
+            # the frame cap's sleep is kept out of the frame's own time
+            if profiler:
+                profiler.begin()
+            self.accumulator += self.clock.tick(30) / 1000.0
+            if profiler:
+                profiler.mark("sleep")
+        if profiler:
+            profiler.beginFrame()
+        self.controls.poll()
+        if profiler:
+            profiler.mark("input")
+        if self.headless:
+            self.step(self.stepDt)
+            self.events_manager.resumeIfWaiting()
+            if profiler:
+                profiler.endFrame()
+            return
+        steps = 0
+        while self.accumulator >= self.stepDt and steps < self.maxSteps:
+            self.step(self.stepDt)
+            self.accumulator -= self.stepDt
+            steps += 1
+        if self.accumulator >= self.stepDt:
+            # too far behind to catch up: drop the backlog instead of spiralling
+            self.droppedTime += self.accumulator - self.accumulator % self.stepDt
+            self.accumulator %= self.stepDt
+        if profiler:
+            profiler.begin()
+        self.events_manager.checkEvents()
+        if profiler:
+            profiler.mark("events")
+        self.view.render(self.accumulator / self.stepDt)
+        if profiler:
+            profiler.mark("render")
+            profiler.endFrame()
+
+    def step(self, dt):
+        # marks are skipped entirely unless the profiler is switched on
+        profiler = self.profiler if self.profiler.enabled else None
+        if profiler:
+            profiler.begin()
+        self.mouse.savePosition()
+        self.cats.savePositions()
         self.textgroup.update(dt)
+        if profiler:
+            profiler.mark("text")
         self.cheeses.update(dt)
+        if profiler:
+            profiler.mark("cheeses")
         if not self.pause.paused:
-            self.cats.update(dt)      
+            self.cats.update(dt)
+            if profiler:
+                profiler.mark("cats")
             self.events_manager.checkCheeseEvents()
             self.events_manager.checkCatEvents()
+            if profiler:
+                profiler.mark("collisions")
 
         if self.mouse.alive:
             if not self.pause.paused:
                 self.mouse.update(dt)
         else:
             self.mouse.update(dt)
+        if profiler:
+            profiler.mark("mouse")
 
         if self.flashBG:
             self.flashTimer += dt
@@ -99,12 +218,15 @@ class GameController(object):
                     self.background = self.background_flash
                 else:
                     self.background = self.background_norm
+        if profiler:
+            profiler.mark("flash")
 
         afterPauseMethod = self.pause.update(dt)
         if afterPauseMethod is not None:
             afterPauseMethod()
-        self.events_manager.checkEvents() 
-        self.view.render()
+        self.controls.endStep()
+        if profiler:
+            profiler.mark("pause")
 
     def showEntities(self):
         self.mouse.visible = True
@@ -0,0 +1,147 @@
+import random
+from multiprocessing import shared_memory
+import pygame
+from pygame.locals import *
+from ..model.constants import *
+
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# small integer codes for directions, for files and shared memory
+CODES = (STOP, UP, DOWN, LEFT, RIGHT)
+CODEOF = {direction: code for code, direction in enumerate(CODES)}
+
+class InputProvider(object):
+    # GameController calls attach() once, poll() once per frame and endStep()
+    # after every simulation step; the mouse calls the provider itself whenever
+    # it needs a direction, and pauseToggled() reports the player's pauses
+    def attach(self, game):
+        pass
+
+    def poll(self):
+        pass
+
+    def endStep(self):
+        pass
+
+    def pauseToggled(self):
+        pass
+
+    def __call__(self):
+        return STOP
+
+
+def asProvider(controls):
+    # None is the keyboard, any other callable returning a direction is wrapped
+    if controls is None:
+        return KeyboardControls()
+    if isinstance(controls, InputProvider):
+        return controls
+    return CallableControls(controls)
+
+
+class CallableControls(InputProvider):
+    def __init__(self, function):
+        self.function = function
+
+    def __call__(self):
+        return self.function()
+
+
+class KeyboardControls(InputProvider):
+    # the arrow keys are read once per frame, not every time a step asks
+    def __init__(self):
+        self.direction = STOP
+
+    def poll(self):
+        key_pressed = pygame.key.get_pressed()
+        if key_pressed[K_UP]:
+            self.direction = UP
+        elif key_pressed[K_DOWN]:
+            self.direction = DOWN
+        elif key_pressed[K_LEFT]:
+            self.direction = LEFT
+        elif key_pressed[K_RIGHT]:
+            self.direction = RIGHT
+        else:
+            self.direction = STOP
+
+    def __call__(self):
+        return self.direction
+
+
+class ScriptedControls(InputProvider):
+    def __init__(self, script, loop=True):
+        # script is a list of (frames, direction) pairs, one direction returned per call
+        self.script = [(frames, direction) for frames, direction in script if frames > 0]
+        self.loop = loop
+        self.index = 0
+        self.remaining = self.script[0][0] if self.script else 0
+
+    def __call__(self):
+        if self.index >= len(self.script):
+            return STOP
+        frames, direction = self.script[self.index]
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.index += 1
+            if self.index >= len(self.script) and self.loop:
+                self.index = 0
+            if self.index < len(self.script):
+                self.remaining = self.script[self.index][0]
+        return direction
+
+
+class RandomControls(InputProvider):
+    def __init__(self, seed=None, hold=15):
+        self.random = random.Random(seed)
+        self.hold = hold
+        self.remaining = 0
+        self.direction = STOP
+
+    def __call__(self):
+        if self.remaining <= 0:
+            self.direction = self.random.choice(DIRECTIONS)
+            self.remaining = self.hold
+        self.remaining -= 1
+        return self.direction
+
+
+class PolicyControls(InputProvider):
+    # policy(game) is asked for a direction whenever the mouse needs one
+    def __init__(self, policy):
+        self.policy = policy
+        self.game = None
+
+    def attach(self, game):
+        self.game = game
+
+    def __call__(self):
+        return self.policy(self.game)
+
+
+class SharedControls(InputProvider):
+    # a one byte command slot in shared memory: another process (or thread)
+    # writes direction codes with send() and the mouse reads the latest one,
+    # without going through SDL's event queue
+    def __init__(self, name=None, create=None):
+        if create is None:
+            create = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=create, size=1)
+        self.owner = create
+        if create:
+            self.memory.buf[0] = 0
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def send(self, direction):
+        self.memory.buf[0] = CODEOF[direction]
+
+    def __call__(self):
+        return CODES[self.memory.buf[0] % len(CODES)]
+
+    def close(self):
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
@@ -0,0 +1,78 @@
+import json
+from collections import deque
+from time import perf_counter_ns
+import numpy as np
+
+# input polling, the step phases in the order GameController.step runs them,
+# then the per frame ones; "sleep" is the frame cap's wait, which "frame" leaves out
+PHASES = ("input", "text", "cheeses", "cats", "collisions", "mouse", "flash", "pause", "events", "render",
+          "sleep", "frame")
+
+class FrameProfiler(object):
+    def __init__(self, window=600, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self.samples = {}
+        self.current = {}
+        self.last = 0
+        self.frameStart = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def reset(self):
+        self.samples = {}
+        self.current = {}
+
+    def begin(self):
+        self.last = perf_counter_ns()
+
+    def mark(self, phase):
+        # time since the previous mark, charged to the phase that just ran;
+        # a phase that runs in several steps of one frame adds up
+        now = perf_counter_ns()
+        self.current[phase] = self.current.get(phase, 0) + now - self.last
+        self.last = now
+
+    def beginFrame(self):
+        self.frameStart = self.last = perf_counter_ns()
+
+    def endFrame(self):
+        # one row per frame, with 0 for the phases that didn't run, so every
+        # phase's window covers the same frames and the breakdown adds up
+        self.current["frame"] = perf_counter_ns() - self.frameStart
+        for phase in PHASES:
+            self.record(phase, self.current.pop(phase, 0))
+        for phase, elapsed in self.current.items():
+            self.record(phase, elapsed)
+        self.current = {}
+
+    def record(self, phase, elapsed):
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(elapsed)
+
+    def stats(self):
+        # microseconds over the last window samples of each phase
+        stats = {}
+        for phase in sorted(self.samples, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES)):
+            values = np.fromiter(self.samples[phase], dtype=np.int64) / 1000.0
+            if not len(values):
+                continue
+            p95, p99 = np.percentile(values, (95, 99))
+            stats[phase] = {"count": len(values), "mean": float(values.mean()),
+                            "p95": float(p95), "p99": float(p99), "max": float(values.max())}
+        return stats
+
+    def report(self):
+        lines = ["%-11s %6s %9s %9s %9s %9s" % ("phase (us)", "count", "mean", "p95", "p99", "max")]
+        for phase, s in self.stats().items():
+            lines.append("%-11s %6d %9.2f %9.2f %9.2f %9.2f"
+                         % (phase, s["count"], s["mean"], s["p95"], s["p99"], s["max"]))
+        return "\n".join(lines)
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump({"window": self.window, "unit": "us", "phases": self.stats()}, f, indent=2)
@@ -0,0 +1,194 @@
+import random
+import struct
+import numpy as np
+import pygame
+from ..model.constants import *
+from .inputs import InputProvider, asProvider, CODES, CODEOF
+from .game_controller import GameController
+
+MAGIC = b"CCRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBqdBB")  # magic, version, seed, stepDt, paused, pathfinding
+
+# one byte per simulation step: the direction the mouse read (or STOP when it
+# didn't ask) in the low bits, and above them how many times the player
+# toggled the pause just before the step; past MAXTOGGLES only the parity
+# is kept, which is all the pause state depends on
+DIRECTIONMASK = 0x07
+TOGGLESHIFT = 3
+MAXTOGGLES = 0xFF >> TOGGLESHIFT
+
+def encodeRuns(values):
+    # run-length encode as (value, LEB128 length) pairs
+    values = np.asarray(values, dtype=np.uint8)
+    if not len(values):
+        return b""
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(values)) + 1))
+    lengths = np.diff(np.concatenate((starts, [len(values)])))
+    out = bytearray()
+    for value, length in zip(values[starts].tolist(), lengths.tolist()):
+        out.append(value)
+        while length >= 0x80:
+            out.append(length & 0x7F | 0x80)
+            length >>= 7
+        out.append(length)
+    return bytes(out)
+
+def decodeRuns(data):
+    values, lengths = [], []
+    i = 0
+    while i < len(data):
+        values.append(data[i])
+        length = shift = 0
+        while True:
+            i += 1
+            if i >= len(data):
+                raise ValueError("truncated recording")
+            length |= (data[i] & 0x7F) << shift
+            shift += 7
+            if not data[i] & 0x80:
+                break
+        lengths.append(length)
+        i += 1
+    return np.repeat(np.array(values, dtype=np.uint8), lengths)
+
+
+class Recording(object):
+    def __init__(self, seed, stepDt, paused, pathfinding, values):
+        self.seed = seed
+        self.stepDt = stepDt
+        self.paused = paused
+        self.pathfinding = pathfinding
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def toBytes(self):
+        return HEADER.pack(MAGIC, VERSION, self.seed, self.stepDt, self.paused, self.pathfinding) + encodeRuns(self.values)
+
+    @classmethod
+    def fromBytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("not a CheeseChase recording")
+        magic, version, seed, stepDt, paused, pathfinding = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a CheeseChase recording, or an unsupported version")
+        return cls(seed, stepDt, bool(paused), bool(pathfinding), decodeRuns(data[HEADER.size:]))
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.toBytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.fromBytes(f.read())
+
+
+class InputRecorder(InputProvider):
+    # wraps the game's real input and writes down what it returned each step
+    def __init__(self, controls=None, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**32)
+        if not -2**63 <= seed < 2**63:
+            raise ValueError("recording seeds must fit in 64 bits, got %d" % seed)
+        self.seed = seed
+        self.controls = asProvider(controls)
+        self.stepDt = 1.0/60
+        self.paused = False
+        self.pathfinding = False
+        self.values = bytearray()
+        self.direction = STOP
+        self.toggles = 0
+
+    def attach(self, game):
+        self.stepDt = game.stepDt
+        self.paused = game.pause.paused
+        self.pathfinding = game.pathfinding
+        self.controls.attach(game)
+        # the cats pick frightened directions from the random module
+        random.seed(self.seed)
+
+    def poll(self):
+        self.controls.poll()
+
+    def __call__(self):
+        self.direction = self.controls()
+        return self.direction
+
+    def pauseToggled(self):
+        self.toggles += 1
+        self.controls.pauseToggled()
+
+    def endStep(self):
+        toggles = self.toggles
+        if toggles > MAXTOGGLES:
+            toggles = MAXTOGGLES - (MAXTOGGLES - toggles) % 2
+        self.values.append(CODEOF.get(self.direction, 0) | toggles << TOGGLESHIFT)
+        self.direction = STOP
+        self.toggles = 0
+        self.controls.endStep()
+
+    def recording(self):
+        return Recording(self.seed, self.stepDt, self.paused, self.pathfinding,
+                         np.frombuffer(bytes(self.values), dtype=np.uint8))
+
+    def save(self, path):
+        self.recording().save(path)
+
+
+class ReplayControls(InputProvider):
+    # plays a recording back one step at a time; start() once the game has
+    # started, as the player may have unpaused before the first step
+    def __init__(self, recording):
+        self.recording = recording
+        self.values = recording.values.tolist()
+        self.index = 0
+        self.game = None
+
+    @classmethod
+    def load(cls, path):
+        return cls(Recording.load(path))
+
+    @property
+    def done(self):
+        return self.index >= len(self.values)
+
+    def attach(self, game):
+        self.game = game
+        game.pause.paused = self.recording.paused
+        random.seed(self.recording.seed)
+
+    def start(self):
+        self.applyToggles()
+
+    def applyToggles(self):
+        if not self.done:
+            for i in range(self.values[self.index] >> TOGGLESHIFT):
+                self.game.events_manager.togglePause()
+
+    def __call__(self):
+        if self.done:
+            return STOP
+        return CODES[self.values[self.index] & DIRECTIONMASK]
+
+    def endStep(self):
+        self.index += 1
+        self.applyToggles()
+
+
+def replay(recording, render=False):
+    # run the recorded steps back to back: no clock, no input polling,
+    # and no drawing unless asked for
+    controls = ReplayControls(recording)
+    game = GameController(headless=not render, controls=controls,
+                          stepDt=recording.stepDt, pathfinding=recording.pathfinding)
+    game.startGame()
+    controls.start()
+    while not controls.done:
+        game.step(recording.stepDt)
+        if render:
+            game.view.render()
+            pygame.event.pump()
+    return game
@@ -0,0 +1,127 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pygame
+from ..model.constants import *
+from .game_controller import GameController
+from .inputs import RandomControls
+
+def idleControls(seed):
+    return lambda: STOP
+
+# policy name -> factory(seed) returning the mouse controls callable
+POLICIES = {"random": RandomControls, "idle": idleControls}
+
+class Job(object):
+    def __init__(self, seed, maze=0, policy="random", frames=20000, stepDt=1.0/60):
+        self.seed = seed
+        self.maze = maze
+        self.policy = policy
+        self.frames = frames
+        self.stepDt = stepDt
+
+    def controls(self):
+        factory = POLICIES[self.policy] if isinstance(self.policy, str) else self.policy
+        return factory(self.seed)
+
+    def policyName(self):
+        if isinstance(self.policy, str):
+            return self.policy
+        return getattr(self.policy, "__name__", repr(self.policy))
+
+
+def initWorker():
+    # workers never open a window, whatever the parent's environment says
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+
+def runGame(job):
+    start = time.perf_counter()
+    random.seed(job.seed)
+    game = GameController(headless=True, stepDt=job.stepDt, controls=job.controls(), maze=job.maze)
+    game.startGame()
+    livesLost = 0
+    frames = 0
+    while frames < job.frames:
+        lives = game.lives
+        game.update()
+        frames += 1
+        if game.lives < lives:
+            livesLost += lives - game.lives
+            if game.lives <= 0:
+                break
+    return {"seed": job.seed, "maze": job.maze, "policy": job.policyName(),
+            "score": game.score, "level": game.level, "frames": frames,
+            "livesLost": livesLost, "gameOver": game.lives <= 0,
+            "wallTime": time.perf_counter() - start}
+
+def runRollouts(jobs, workers=None):
+    """Yield one result per job, in the order the games finish."""
+    if workers == 0:
+        for job in jobs:
+            yield runGame(job)
+        return
+    # spawned, not forked: the parent may already run pygame and the asset threads,
+    # so each worker starts clean and initWorker alone sets up SDL
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=initWorker) as pool:
+        futures = [pool.submit(runGame, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+def aggregate(results):
+    groups = {}
+    for result in results:
+        groups.setdefault((result["policy"], result["maze"]), []).append(result)
+    summary = {}
+    for key, group in sorted(groups.items()):
+        n = len(group)
+        scores = [result["score"] for result in group]
+        summary[key] = {"games": n,
+                        "meanScore": sum(scores) / n,
+                        "maxScore": max(scores),
+                        "meanLevel": sum(result["level"] for result in group) / n,
+                        "meanFrames": sum(result["frames"] for result in group) / n,
+                        "meanLivesLost": sum(result["livesLost"] for result in group) / n,
+                        "gameOvers": sum(result["gameOver"] for result in group),
+                        "wallTime": sum(result["wallTime"] for result in group)}
+    return summary
+
+
+def parseArgs(args=None):
+    parser = argparse.ArgumentParser(prog="python -m CheeseChase.controller.rollouts")
+    parser.add_argument("--seeds", type=int, default=32, help="games per policy and maze")
+    parser.add_argument("--mazes", type=int, nargs="+", default=[0])
+    parser.add_argument("--policies", nargs="+", default=["random"], choices=sorted(POLICIES))
+    parser.add_argument("--frames", type=int, default=20000, help="frame budget per game")
+    parser.add_argument("--workers", type=int, default=None, help="pool size, 0 runs in this process")
+    return parser.parse_args(args)
+
+def main(args=None):
+    options = parseArgs(args)
+    jobs = [Job(seed, maze, policy, options.frames)
+            for policy in options.policies for maze in options.mazes for seed in range(options.seeds)]
+    start = time.perf_counter()
+    results = []
+    for result in runRollouts(jobs, options.workers):
+        results.append(result)
+        print("%-8s maze %d seed %4d: score %6d level %d frames %6d lives lost %d (%.2fs)"
+              % (result["policy"], result["maze"], result["seed"], result["score"], result["level"],
+                 result["frames"], result["livesLost"], result["wallTime"]))
+    elapsed = time.perf_counter() - start
+    print("%-8s %5s %6s %10s %9s %7s %11s %10s" % ("policy", "maze", "games", "mean score", "max score",
+                                                   "level", "lives lost", "frames"))
+    for (policy, maze), stats in aggregate(results).items():
+        print("%-8s %5d %6d %10.1f %9d %7.2f %11.2f %10.0f" % (policy, maze, stats["games"], stats["meanScore"],
+                                                             stats["maxScore"], stats["meanLevel"],
+                                                             stats["meanLivesLost"], stats["meanFrames"]))
+    frames = sum(result["frames"] for result in results)
+    print("%d games, %d frames in %.1fs (%.0f frames/s)" % (len(results), frames, elapsed, frames / elapsed))
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,4 @@
-#__init__.py
+# The model modules that need neither pygame nor the view, for headless tools:
+# constants, vector, nodes, fields, mazecache, mazedata, modes, entity and
+# cheeses (which only loads pygame to draw). mouse and cats build their
+# sprites, so they bring in pygame with the view.
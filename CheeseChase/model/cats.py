@@ -1,4 +1,3 @@
-from pygame.locals import *
 from .vector import Vector2
 from .constants import *
 from .entity import Entity
@@ -11,10 +10,13 @@ class Cat(Entity):
         self.name = name
         self.points = 200
         self.goal = Vector2()
+        self.scatterGoal = Vector2()
         self.directionMethod = self.goalDirection
         self.mouse = mouse
         self.mode = ModeController(self)
         self.homeNode = node
+        self.paths = None
+        self.field = None
         self.sprites = CatSprites(self)
 
     def reset(self):
@@ -32,11 +34,38 @@ class Cat(Entity):
         Entity.update(self, dt)
 
     def scatter(self):
-        self.goal = Vector2()
+        self.goal = self.scatterGoal
 
     def chase(self):
         self.goal = self.mouse.position
 
+    def usePaths(self, nodes):
+        # steer by shortest paths through the maze instead of straight-line distance
+        self.paths = nodes
+
+    def useDistanceField(self, field):
+        # chase by steps through the maze from a field shared with the other cats
+        self.field = field
+
+    def goalDirection(self, directions):
+        if self.field is not None and self.mode.current is CHASE:
+            direction = self.field.bestDirection(self.node, self.direction, self.name)
+            if direction is not None:
+                return direction
+        if self.paths is not None:
+            tables = self.paths.pathTables(self.name)
+            direction = tables.bestDirection(self.node, self.goalNode(tables), directions)
+            if direction is not None:
+                return direction
+        return Entity.goalDirection(self, directions)
+
+    def goalNode(self, tables):
+        if self.mode.current is CHASE:
+            return self.mouse.target
+        if self.mode.current is SPAWN:
+            return self.spawnNode
+        return tables.nearestNode(self.goal)
+
     def spawn(self):
         self.goal = self.spawnNode.position
 
@@ -68,11 +97,15 @@ class CatGroup(object):
         self.cat3 = Cat(node, mouse, name = CAT3)
         self.cat4 = Cat(node, mouse, name = CAT4)
         self.cats = [self.cat1, self.cat2, self.cat3, self.cat4]
+        self.mouse = mouse
+        self.field = None
 
     def __iter__(self):
         return iter(self.cats)
 
     def update(self, dt):
+        if self.field is not None:
+            self.field.update(self.mouse.position)
         for cat in self:
             cat.update(dt)
 
@@ -105,7 +138,20 @@ class CatGroup(object):
         for cat in self:
             cat.reset()
 
-    def render(self, screen):
+    def usePaths(self, nodes):
+        for cat in self:
+            cat.usePaths(nodes)
+
+    def useDistanceField(self, field):
+        self.field = field
+        for cat in self:
+            cat.useDistanceField(field)
+
+    def savePositions(self):
+        for cat in self:
+            cat.savePosition()
+
+    def render(self, screen, alpha=1.0):
         for cat in self:
-            cat.render(screen)
+            cat.render(screen, alpha)
 
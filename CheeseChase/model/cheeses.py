@@ -1,13 +1,20 @@
+import math
 from .vector import Vector2
 from .constants import *
 import numpy as np
 
+CHEESERADIUS = 2 * TILEWIDTH / 16
+CHEESEPOINTS = 10
+POWERPOINTS = 50
+
 class Cheese(object):
     def __init__(self, row, column, spritesheet=None):
         self.name = CHEESE
+        self.row = row
+        self.column = column
         self.position = Vector2(column*TILEWIDTH, row*TILEHEIGHT)
-        self.collideRadius = 2 * TILEWIDTH / 16
-        self.points = 10
+        self.collideRadius = CHEESERADIUS
+        self.points = CHEESEPOINTS
         self.visible = True
         self.spritesheet = spritesheet
         self.image = spritesheet.getImage(8, 0)
@@ -20,7 +27,7 @@ class PowerCheese(Cheese):
     def __init__(self, row, column, spritesheet):
         Cheese.__init__(self, row, column,spritesheet)
         self.name = POWERCHEESE
-        self.points = 50
+        self.points = POWERPOINTS
         self.flashTime = 0.4
         self.timer= 0
         self.image = spritesheet.getImage(10,0)
@@ -32,37 +39,130 @@ class PowerCheese(Cheese):
             self.timer = 0
 
 
+class CheeseTile(object):
+    __slots__ = ("row", "column", "name", "points")
+
+    def __init__(self, row, column, power=False):
+        self.row = row
+        self.column = column
+        self.name = POWERCHEESE if power else CHEESE
+        self.points = POWERPOINTS if power else CHEESEPOINTS
+
+
 class CheeseGroup(object):
-    def __init__(self, cheesefile, spritesheet=None):
-        self.cheeseList = []
+    def __init__(self, cheesefile, spritesheet=None, compiled=None):
         self.powercheeses = []
         self.spritesheet = spritesheet
-        self.createCheeseList(cheesefile)
+        self.layer = None
+        # tiles wiped from the layer since the view last drew, for dirty rects
+        self.erased = []
+        if compiled is None:
+            self.createCheeseList(cheesefile)
+        else:
+            self.loadCompiled(compiled)
         self.numEaten = 0
 
+    def setGrid(self, shape, rows, cols, power):
+        self.rows, self.cols = shape
+        cheeses = np.zeros(shape, dtype=bool)
+        powers = np.zeros(shape, dtype=bool)
+        cheeses[rows, cols] = True
+        powers[rows, cols] = power
+        # one bit per tile, packed eight to a byte, for every cheese and for the power ones
+        self.cheeses = np.packbits(cheeses)
+        self.powers = np.packbits(powers)
+        self.numLeft = int(len(rows))
+        for row, col in zip(*np.nonzero(powers)):
+            self.powercheeses.append(PowerCheese(int(row), int(col), self.spritesheet))
+
+    def hasCheese(self, row, col):
+        if row < 0 or col < 0 or row >= self.rows or col >= self.cols:
+            return False
+        index = row * self.cols + col
+        return bool(self.cheeses[index >> 3] & (128 >> (index & 7)))
+
+    def isPower(self, row, col):
+        index = row * self.cols + col
+        return bool(self.powers[index >> 3] & (128 >> (index & 7)))
+
+    def present(self):
+        return np.unpackbits(self.cheeses, count=self.rows * self.cols).reshape(self.rows, self.cols).astype(bool)
+
+    def remaining(self):
+        rows, cols = np.nonzero(self.present())
+        power = np.unpackbits(self.powers, count=self.rows * self.cols).reshape(self.rows, self.cols)
+        return rows, cols, power[rows, cols].astype(bool)
+
+    def find(self, position, radius=0):
+        reach = radius + CHEESERADIUS
+        x, y = position.x, position.y
+        for row in range(math.ceil((y - reach) / TILEHEIGHT), math.floor((y + reach) / TILEHEIGHT) + 1):
+            for col in range(math.ceil((x - reach) / TILEWIDTH), math.floor((x + reach) / TILEWIDTH) + 1):
+                if self.hasCheese(row, col):
+                    dx = col * TILEWIDTH - x
+                    dy = row * TILEHEIGHT - y
+                    if dx * dx + dy * dy <= reach * reach:
+                        return CheeseTile(row, col, self.isPower(row, col))
+        return None
+
+    def removeCheese(self, cheese):
+        row, col = cheese.row, cheese.column
+        if not self.hasCheese(row, col):
+            return
+        index = row * self.cols + col
+        self.cheeses[index >> 3] &= 255 ^ (128 >> (index & 7))
+        self.numLeft -= 1
+        if self.isPower(row, col):
+            self.powercheeses = [p for p in self.powercheeses if (p.row, p.column) != (row, col)]
+        elif self.layer is not None:
+            self.layer.fill(self.layer.get_colorkey(), (col * TILEWIDTH, row * TILEHEIGHT, TILEWIDTH, TILEHEIGHT))
+            self.erased.append((row, col))
+
     def update(self, dt):
         for powercheese in self.powercheeses:
             powercheese.update(dt)
                 
     def createCheeseList(self, cheesefile):
-        data = self.readCheesefile(cheesefile)        
-        for row in range(data.shape[0]):
-            for col in range(data.shape[1]):
-                if data[row][col] in ['.', '+']:
-                    self.cheeseList.append(Cheese(row, col, self.spritesheet))
-                elif data[row][col] in ['P', 'p']:
-                    pp = PowerCheese(row, col, self.spritesheet)
-                    self.cheeseList.append(pp)
-                    self.powercheeses.append(pp)
+        data = self.readCheesefile(cheesefile)
+        power = np.isin(data, ['P', 'p'])
+        rows, cols = np.nonzero(np.isin(data, ['.', '+']) | power)
+        self.setGrid(data.shape, rows, cols, power[rows, cols])
                     
+    def loadCompiled(self, compiled):
+        rows, cols, power = compiled.cheeses.T
+        self.setGrid(compiled.tiles.shape, rows, cols, power.astype(bool))
+
     def readCheesefile(self, textfile):
         return np.loadtxt(textfile, dtype='<U1')
     
     def isEmpty(self):
-        if len(self.cheeseList) == 0:
+        if self.numLeft == 0:
             return True
         return False
-    
-    def render(self, screen):
-        for cheese in self.cheeseList:
-            cheese.render(screen)
\ No newline at end of file
+
+    def buildLayer(self):
+        # every plain cheese drawn once; eating one erases its tile instead of redrawing the rest
+        import pygame
+        image = self.spritesheet.getImage(8, 0)
+        self.layer = pygame.Surface((self.cols * TILEWIDTH, self.rows * TILEHEIGHT))
+        self.layer.fill(image.get_colorkey())
+        self.layer.set_colorkey(image.get_colorkey())
+        rows, cols, power = self.remaining()
+        for row, col in zip(rows[~power].tolist(), cols[~power].tolist()):
+            self.layer.blit(image, (col * TILEWIDTH, row * TILEHEIGHT))
+
+    def render(self, screen, area=None):
+        if self.layer is None:
+            self.buildLayer()
+        if area is None:
+            screen.blit(self.layer, (0, 0))
+            for powercheese in self.powercheeses:
+                powercheese.render(screen)
+            return
+        import pygame
+        for rect in area:
+            screen.blit(self.layer, rect, rect)
+        for powercheese in self.powercheeses:
+            x, y = powercheese.position.asTuple()
+            if pygame.Rect(x, y, TILEWIDTH, TILEHEIGHT).collidelist(area) != -1:
+                powercheese.render(screen)
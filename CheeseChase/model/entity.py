@@ -1,9 +1,10 @@
-import pygame
-from pygame.locals import *
 from .vector import Vector2
 from .constants import *
+from .nodes import accessBit
 from random import randint
 
+SNAPDISTANCE = 2 * TILEWIDTH
+
 class Entity(object):
     def __init__(self, node):
         self.name = None
@@ -18,14 +19,43 @@ class Entity(object):
         self.disablePortal = False
         self.goal = None
         self.directionMethod = self.randomDirection
+        self.lastPosition = None
         self.setStartNode(node)
         self.image = None
 
     def setPosition(self):
         self.position = self.node.position.copy()
 
+    def savePosition(self):
+        if self.lastPosition is None:
+            self.lastPosition = self.position.copy()
+        else:
+            self.lastPosition.x = self.position.x
+            self.lastPosition.y = self.position.y
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        # the node access bit is looked up once, not at every junction
+        self._name = name
+        self.accessBit = accessBit(name)
+
+    def renderPosition(self, alpha=1.0):
+        last = self.lastPosition
+        if last is None or alpha >= 1.0:
+            return self.position.x, self.position.y
+        dx = self.position.x - last.x
+        dy = self.position.y - last.y
+        # portal jumps and resets are drawn where the entity ended up
+        if dx*dx + dy*dy > SNAPDISTANCE**2:
+            return self.position.x, self.position.y
+        return last.x + dx*alpha, last.y + dy*alpha
+
     def update(self, dt):
-        self.position += self.directions[self.direction]*self.speed*dt
+        self.position.addScaled(self.directions[self.direction], self.speed*dt)
          
         if self.overshotTarget():
             self.node = self.target
@@ -44,7 +74,7 @@ class Entity(object):
           
     def validDirection(self, direction):
         if direction is not STOP:
-            if self.name in self.node.access[direction]:
+            if self.node.allows(direction, self.accessBit):
                 if self.node.neighbors[direction] is not None:
                     return True
         return False
@@ -56,10 +86,8 @@ class Entity(object):
 
     def overshotTarget(self):
         if self.target is not None:
-            vec1 = self.target.position - self.node.position
-            vec2 = self.position - self.node.position
-            node2Target = vec1.magnitudeSquared()
-            node2Self = vec2.magnitudeSquared()
+            node2Target = self.target.position.distanceSquaredTo(self.node.position)
+            node2Self = self.position.distanceSquaredTo(self.node.position)
             return node2Self >= node2Target
         return False
 
@@ -90,9 +118,12 @@ class Entity(object):
 
     def goalDirection(self, directions):
         distances = []
+        position = self.node.position
         for direction in directions:
-            vec = self.node.position  + self.directions[direction]*TILEWIDTH - self.goal
-            distances.append(vec.magnitudeSquared())
+            vec = self.directions[direction]
+            dx = position.x + vec.x*TILEWIDTH - self.goal.x
+            dy = position.y + vec.y*TILEWIDTH - self.goal.y
+            distances.append(dx*dx + dy*dy)
         index = distances.index(min(distances))
         return directions[index]
 
@@ -101,11 +132,13 @@ class Entity(object):
         self.startNode = node
         self.target = node
         self.setPosition()
+        self.lastPosition = None
 
     def setBetweenNodes(self, direction):
         if self.node.neighbors[direction] is not None:
             self.target = self.node.neighbors[direction]
             self.position = (self.node.position + self.target.position) / 2.0
+            self.lastPosition = None
 
     def reset(self):
         self.setStartNode(self.startNode)
@@ -116,12 +149,11 @@ class Entity(object):
     def setSpeed(self, speed):
         self.speed = speed * TILEWIDTH / 16
 
-    def render(self, screen):
+    def render(self, screen, alpha=1.0):
         if self.visible:
+            x, y = self.renderPosition(alpha)
             if self.image is not None:
-                adjust = Vector2(TILEWIDTH, TILEHEIGHT) / 2
-                p = self.position - adjust
-                screen.blit(self.image, p.asTuple())
+                screen.blit(self.image, (x - TILEWIDTH/2, y - TILEHEIGHT/2))
             else:
-                p = self.position.asInt()
-                pygame.draw.circle(screen, self.color, p, self.radius)
\ No newline at end of file
+                import pygame
+                pygame.draw.circle(screen, self.color, (int(x), int(y)), self.radius)
\ No newline at end of file
@@ -0,0 +1,140 @@
+from collections import deque
+from .constants import *
+import numpy as np
+
+# the node and path symbols NodeGroup walks along
+WALKABLE = ['+', 'P', 'n', '.', '-', '|', 'p']
+STEPS = {UP:(0, -1), DOWN:(0, 1), LEFT:(-1, 0), RIGHT:(1, 0)}
+
+# direction codes by column of the node graph's links and access arrays
+LINKDIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+class DistanceField(object):
+    def __init__(self, data, portalPairs=(), graph=None):
+        if isinstance(portalPairs, dict):
+            portalPairs = list(portalPairs.values())
+        self.rows, self.cols = data.shape
+        walkable = np.isin(data, WALKABLE).ravel()
+        self.neighbors = [[] for i in range(self.rows * self.cols)]
+        for index in np.nonzero(walkable)[0].tolist():
+            row, col = divmod(index, self.cols)
+            for r, c in ((row-1, col), (row+1, col), (row, col-1), (row, col+1)):
+                if 0 <= r < self.rows and 0 <= c < self.cols and walkable[r * self.cols + c]:
+                    self.neighbors[index].append(r * self.cols + c)
+        for (col1, row1), (col2, row2) in portalPairs:
+            index1 = row1 * self.cols + col1
+            index2 = row2 * self.cols + col2
+            self.neighbors[index1].append(index2)
+            self.neighbors[index2].append(index1)
+        self.walkable = walkable.tolist()
+        self.distances = [-1] * (self.rows * self.cols)
+        self.root = None
+        self.builds = 0
+        self.graph = None
+        self.best = None
+        if graph is not None:
+            self.attach(graph)
+
+    def attach(self, graph):
+        # the node graph the cats decide on; a decision is then one lookup in a
+        # table rebuilt with the field, or when the graph's access rights change
+        self.graph = graph
+        positions = graph.positions
+        links = graph.links[:, :4]
+        cols = positions[:, 0] / TILEWIDTH
+        rows = positions[:, 1] / TILEHEIGHT
+        onGrid = ((cols == np.floor(cols)) & (rows == np.floor(rows)) & (cols >= 0) & (cols < self.cols)
+                  & (rows >= 0) & (rows < self.rows))
+        cols = np.where(onGrid, cols, 0).astype(np.int64)
+        rows = np.where(onGrid, rows, 0).astype(np.int64)
+        self.nodeTiles = np.where(onGrid, rows * self.cols + cols, -1)
+        # the first tile a cat reaches leaving each node in each direction
+        firstTiles = np.full(links.shape, -1, dtype=np.int64)
+        for j, direction in enumerate(LINKDIRECTIONS):
+            dcol, drow = STEPS[direction]
+            r, c = rows + drow, cols + dcol
+            inside = onGrid & (links[:, j] >= 0) & (r >= 0) & (r < self.rows) & (c >= 0) & (c < self.cols)
+            firstTiles[:, j] = np.where(inside, r * self.cols + c, -1)
+        self.firstTiles = firstTiles
+        safe = np.maximum(links, 0)
+        self.edgeLengths = np.where(links >= 0, np.abs(positions[safe] - positions[:, None, :]).sum(axis=2) / TILEWIDTH,
+                                    np.inf)
+        self.links = links.copy()
+        self.graphVersion = graph.version
+        self.best = None
+
+    def update(self, position):
+        # only a new tile under the target moves the field
+        col = int(round(position.x / TILEWIDTH))
+        row = int(round(position.y / TILEHEIGHT))
+        root = None
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            root = row * self.cols + col
+        if root != self.root:
+            self.root = root
+            self.build()
+
+    def build(self):
+        distances = [-1] * (self.rows * self.cols)
+        if self.root is not None and self.walkable[self.root]:
+            distances[self.root] = 0
+            queue = deque([self.root])
+            while queue:
+                index = queue.popleft()
+                distance = distances[index] + 1
+                for neighbor in self.neighbors[index]:
+                    if distances[neighbor] < 0:
+                        distances[neighbor] = distance
+                        queue.append(neighbor)
+        self.distances = distances
+        self.builds += 1
+        self.best = None
+
+    def distance(self, col, row):
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.distances[row * self.cols + col]
+        return -1
+
+    def buildTable(self):
+        # best[node, arrival direction + 2, access bit]: the direction whose way
+        # out is fewest steps from the target, never back the way the cat came
+        # and only where that bit may go, or STOP when there is none
+        tiles = np.array(self.distances, dtype=float)
+        tiles[tiles < 0] = np.inf
+        nodes = np.where(self.nodeTiles >= 0, tiles[self.nodeTiles], np.inf)
+        # nodes off the tile grid, like the home nodes, take their distance
+        # over the node graph from the nearest ones on it
+        for i in range(len(nodes)):
+            through = (self.edgeLengths + np.where(self.links >= 0, nodes[np.maximum(self.links, 0)], np.inf)).min(axis=1)
+            relaxed = np.minimum(nodes, through)
+            if (relaxed == nodes).all():
+                break
+            nodes = relaxed
+        costs = np.where(self.firstTiles >= 0, tiles[self.firstTiles] + 1, np.inf)
+        costs = np.where(np.isfinite(costs), costs,
+                         self.edgeLengths + np.where(self.links >= 0, nodes[np.maximum(self.links, 0)], np.inf))
+        access = self.graph.access
+        allowed = (access[:, None, :] >> np.arange(8)[:, None]) & 1 == 1        # (N, 8, 4)
+        codes = np.array(LINKDIRECTIONS)
+        best = np.zeros((len(nodes), 5, 8), dtype=np.int8)
+        for arrival in (STOP, UP, DOWN, LEFT, RIGHT):
+            ways = allowed & (codes != -arrival)
+            masked = np.where(ways, costs[:, None, :], np.inf)
+            choice = masked.argmin(axis=2)
+            found = np.isfinite(np.take_along_axis(masked, choice[..., None], axis=2)[..., 0])
+            best[:, arrival + 2, :] = np.where(found, codes[choice], STOP)
+        self.best = best
+
+    def bestDirection(self, node, direction, name):
+        # None when no graph is attached, or no allowed way out leads to the target
+        if self.graph is None or node.graph is not self.graph:
+            return None
+        if self.graphVersion != self.graph.version:
+            # links, nodes or access rights changed since the table was built
+            self.attach(self.graph)
+        if self.best is None:
+            self.buildTable()
+        best = self.best.item(node.index, direction + 2, name)
+        if best == STOP:
+            return None
+        return best
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import os
+import sys
+import numpy as np
+from .constants import *
+from .nodes import NodeGroup
+
+# hashed into every cache key: bump it whenever compileMaze, NodeGroup's node
+# order or the npz layout changes, or stale artefacts keep loading
+FORMAT = 2
+
+logger = logging.getLogger('CheeseChase')
+
+def cacheDir():
+    # empty variables count as unset, or the cache would land in the working directory
+    path = os.environ.get("CHEESECHASE_CACHE")
+    if path:
+        return path
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "CheeseChase")
+
+
+class CompiledMaze(object):
+    def __init__(self, key, tiles, rotations, nodes, links, portals, cheeses):
+        self.key = key
+        self.tiles = tiles          # (rows, cols) uint8 ascii code of each maze symbol
+        self.rotations = rotations  # (rows, cols) uint8 ascii code of each rotation symbol
+        self.nodes = nodes          # (N, 2) pixel position of each node, in nodesLUT order
+        self.links = links          # (N, 4) neighbour index towards UP, DOWN, LEFT, RIGHT or -1
+        self.portals = portals      # (P, 2) node index pairs
+        self.cheeses = cheeses      # (M, 3) row, col, 1 for power cheeses
+        self.paths = {}             # NodeGroup path tables by graph digest, built on demand in memory only
+
+    @property
+    def data(self):
+        return self.tiles.view('S1').astype('<U1')
+
+    @property
+    def rotdata(self):
+        return self.rotations.view('S1').astype('<U1')
+
+    def arrays(self):
+        return {"key": np.array(self.key), "tiles": self.tiles, "rotations": self.rotations,
+                "nodes": self.nodes, "links": self.links, "portals": self.portals, "cheeses": self.cheeses}
+
+
+def readSymbols(textfile):
+    return np.loadtxt(textfile, dtype='S1').view(np.uint8)
+
+def compileMaze(key, mazefile, rotfile, portalPairs=()):
+    tiles = readSymbols(mazefile)
+    rotations = readSymbols(rotfile)
+    nodegroup = NodeGroup(mazefile)
+    graph = nodegroup.graph
+    portals = []
+    for pair1, pair2 in portalPairs:
+        node1 = nodegroup.getNodeFromTiles(*pair1)
+        node2 = nodegroup.getNodeFromTiles(*pair2)
+        if node1 is not None and node2 is not None:
+            portals.append((node1.index, node2.index))
+    symbols = tiles.view('S1')
+    power = np.isin(symbols, [b'P', b'p'])
+    rows, cols = np.nonzero(np.isin(symbols, [b'.', b'+']) | power)
+    cheeses = np.stack([rows, cols, power[rows, cols]], axis=1).astype(np.int16)
+    return CompiledMaze(key, tiles, rotations,
+                        graph.positions.astype(np.int32), graph.links[:, :4].copy(), np.array(portals, dtype=np.int32).reshape(-1, 2), cheeses)
+
+
+class MazeCache(object):
+    def __init__(self, directory=None):
+        self.directory = directory or cacheDir()
+        self.compiled = {}
+        self.pending = {}
+        self.keys = {}
+        self.memoryHits = 0
+        self.diskHits = 0
+        self.compiles = 0
+
+    def contentKey(self, mazefile, rotfile, portalPairs):
+        digest = hashlib.sha256(str(FORMAT).encode())
+        for textfile in (mazefile, rotfile):
+            with open(textfile, 'rb') as f:
+                digest.update(f.read())
+        digest.update(repr(sorted(portalPairs)).encode())
+        return digest.hexdigest()
+
+    def fileKey(self, mazefile, rotfile, portalPairs):
+        # the files are only hashed again once their size or mtime changes
+        stamp = [mazefile, rotfile, tuple(portalPairs)]
+        for textfile in (mazefile, rotfile):
+            stat = os.stat(textfile)
+            stamp += [stat.st_mtime_ns, stat.st_size]
+        stamp = tuple(stamp)
+        key = self.keys.get(stamp)
+        if key is None:
+            key = self.keys[stamp] = self.contentKey(mazefile, rotfile, portalPairs)
+        return key
+
+    def path(self, mazefile, key):
+        name = os.path.splitext(os.path.basename(mazefile))[0]
+        return os.path.join(self.directory, "%s-%s.npz" % (name, key[:16]))
+
+    def load(self, mazefile, rotfile, portalPairs=()):
+        portalPairs = self.pairList(portalPairs)
+        key = self.fileKey(mazefile, rotfile, portalPairs)
+        if key in self.compiled:
+            self.memoryHits += 1
+            return self.compiled[key]
+        pending = self.pending.pop(key, None)
+        if pending is not None:
+            compiled, fromDisk = pending.result()
+        else:
+            compiled, fromDisk = self.build(key, mazefile, rotfile, portalPairs)
+        if fromDisk:
+            self.diskHits += 1
+        else:
+            self.compiles += 1
+        self.compiled[key] = compiled
+        return compiled
+
+    def preload(self, mazefile, rotfile, portalPairs, executor):
+        # read or compile on a worker; load() picks the result up on the main thread
+        portalPairs = self.pairList(portalPairs)
+        key = self.fileKey(mazefile, rotfile, portalPairs)
+        if key not in self.compiled and key not in self.pending:
+            self.pending[key] = executor.submit(self.build, key, mazefile, rotfile, portalPairs)
+        return self.pending.get(key)
+
+    def pairList(self, portalPairs):
+        if isinstance(portalPairs, dict):
+            portalPairs = list(portalPairs.values())
+        return [tuple(pair) for pair in portalPairs]
+
+    def build(self, key, mazefile, rotfile, portalPairs):
+        path = self.path(mazefile, key)
+        compiled = self.read(path, key)
+        if compiled is not None:
+            return compiled, True
+        compiled = compileMaze(key, mazefile, rotfile, portalPairs)
+        self.write(path, compiled)
+        return compiled, False
+
+    def read(self, path, key):
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as f:
+                if str(f["key"]) != key:
+                    return None
+                return CompiledMaze(key, f["tiles"], f["rotations"], f["nodes"],
+                                    f["links"], f["portals"], f["cheeses"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable maze cache %s: %s", path, e)
+            return None
+
+    def write(self, path, compiled):
+        tmp = "%s.%d.tmp" % (path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                np.savez(f, **compiled.arrays())
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("Could not write maze cache %s: %s", path, e)
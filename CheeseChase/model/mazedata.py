@@ -54,9 +54,11 @@ class Maze2(MazeBase):
 
 
 class MazeData(object):
-    def __init__(self):
+    def __init__(self, first=0):
+        # first is the maze level 0 is played on, later levels go round from there
         self.obj = None
+        self.first = first
         self.mazedict = {0:Maze1, 1:Maze2}
 
     def loadMaze(self, level):
-        self.obj = self.mazedict[level%len(self.mazedict)]()
+        self.obj = self.mazedict[(level+self.first)%len(self.mazedict)]()
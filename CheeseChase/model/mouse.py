@@ -1,5 +1,3 @@
-import pygame
-from pygame.locals import *
 from .constants import *
 from .entity import Entity
 from ..view.sprites import MouseSprites
@@ -12,6 +10,7 @@ class Mouse(Entity):
         self.direction = LEFT
         self.setBetweenNodes(LEFT)
         self.alive = True
+        self.controls = None
         self.sprites = MouseSprites(self)
 
     def reset(self):
@@ -28,7 +27,7 @@ class Mouse(Entity):
 
     def update(self, dt):	
         self.sprites.update(dt)
-        self.position += self.directions[self.direction]*self.speed*dt
+        self.position.addScaled(self.directions[self.direction], self.speed*dt)
         direction = self.getValidKey()
         if self.overshotTarget():
             self.node = self.target
@@ -48,29 +47,19 @@ class Mouse(Entity):
                 self.reverseDirection()
 
     def getValidKey(self):
-        key_pressed = pygame.key.get_pressed()
-        if key_pressed[K_UP]:
-            return UP
-        if key_pressed[K_DOWN]:
-            return DOWN
-        if key_pressed[K_LEFT]:
-            return LEFT
-        if key_pressed[K_RIGHT]:
-            return RIGHT
-        return STOP  
+        # the game hands the mouse an input provider; without one it stands still
+        if self.controls is not None:
+            return self.controls()
+        return STOP
 
-    def eatCheeses(self, cheeseList):
-        for cheese in cheeseList:
-            if self.collideCheck(cheese):
-                return cheese
-        return None    
+    def eatCheeses(self, cheeses):
+        return cheeses.find(self.position, self.collideRadius)    
     
     def collideCat(self, cat):
         return self.collideCheck(cat)
 
     def collideCheck(self, other):
-        d = self.position - other.position
-        dSquared = d.magnitudeSquared()
+        dSquared = self.position.distanceSquaredTo(other.position)
         rSquared = (self.collideRadius + other.collideRadius)**2
         if dSquared <= rSquared:
             return True
@@ -1,26 +1,283 @@
-import pygame
 from .vector import Vector2
 from .constants import *
+import hashlib
 import numpy as np
 
+PATHDIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+NEIGHBORCOLUMNS = {UP:0, DOWN:1, LEFT:2, RIGHT:3, PORTAL:4}
+ACCESSCOLUMNS = {UP:0, DOWN:1, LEFT:2, RIGHT:3}
+ACCESSNAMES = (MOUSE, CAT1, CAT2, CAT3, CAT4)
+
+def accessBit(name):
+    # entity names are small ints, each owning one bit of an access mask
+    if name is None:
+        return 0
+    if not isinstance(name, int) or not 0 <= name < 8:
+        raise ValueError("no access bit for entity name %r" % (name,))
+    return 1 << name
+
+def accessBits(entities):
+    bits = 0
+    for entity in entities:
+        bits |= accessBit(entity.name)
+    return bits
+
+DEFAULTACCESS = sum(accessBit(name) for name in ACCESSNAMES)
+
+
+class NodeGraph(object):
+    # nodes numbered 0..N-1 with positions, links and access masks held in arrays;
+    # Node objects are views onto one row; version is bumped on every link or
+    # access change so cached path tables know to rebuild
+    def __init__(self, capacity=16, loose=False):
+        self.nodes = []
+        self.version = 0
+        # a loose graph holds free-standing nodes and merges into whatever
+        # graph they get linked to
+        self.loose = loose
+        self.positionBuffer = np.zeros((capacity, 2))
+        self.linkBuffer = np.full((capacity, 5), -1, dtype=np.int32)
+        self.accessBuffer = np.zeros((capacity, 4), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def positions(self):
+        return self.positionBuffer[:len(self.nodes)]   # (N, 2) pixel position of each node
+
+    @property
+    def links(self):
+        return self.linkBuffer[:len(self.nodes)]       # (N, 5) neighbour towards UP, DOWN, LEFT, RIGHT, PORTAL or -1
+
+    @property
+    def access(self):
+        return self.accessBuffer[:len(self.nodes)]     # (N, 4) entity bits allowed towards UP, DOWN, LEFT, RIGHT
+
+    def reserve(self, count):
+        capacity = len(self.linkBuffer)
+        if count <= capacity:
+            return
+        capacity = max(count, 2 * capacity)
+        self.positionBuffer = np.resize(self.positionBuffer, (capacity, 2))
+        self.linkBuffer = np.resize(self.linkBuffer, (capacity, 5))
+        self.accessBuffer = np.resize(self.accessBuffer, (capacity, 4))
+
+    def add(self, node, x, y):
+        index = len(self.nodes)
+        self.reserve(index + 1)
+        self.positionBuffer[index] = x, y
+        self.linkBuffer[index] = -1
+        self.accessBuffer[index] = DEFAULTACCESS
+        self.nodes.append(node)
+        return index
+
+    def addNodes(self, positions):
+        self.reserve(len(self.nodes) + len(positions))
+        return [Node(x, y, self) for x, y in positions]
+
+    def merge(self, other):
+        # take over another graph's nodes, links and access, moving the views along
+        base = len(self.nodes)
+        count = len(other.nodes)
+        self.reserve(base + count)
+        rows = slice(base, base + count)
+        self.positionBuffer[rows] = other.positions
+        self.linkBuffer[rows] = np.where(other.links >= 0, other.links + base, -1)
+        self.accessBuffer[rows] = other.access
+        for node in other.nodes:
+            node.graph = self
+            node.index += base
+        self.nodes.extend(other.nodes)
+        other.nodes = []
+        self.version += 1
+
+    def __getstate__(self):
+        # arrays only; the node views are rebuilt on the other side
+        return {"positions": self.positions.copy(), "links": self.links.copy(), "access": self.access.copy(),
+                "loose": self.loose}
+
+    def __setstate__(self, state):
+        self.nodes = []
+        self.version = 0
+        self.loose = state["loose"]
+        self.positionBuffer = state["positions"]
+        self.linkBuffer = state["links"]
+        self.accessBuffer = state["access"]
+        for index, (x, y) in enumerate(self.positionBuffer.tolist()):
+            node = Node.__new__(Node)
+            node.attach(self, index, x, y)
+            self.nodes.append(node)
+
+
+def nodeAt(graph, index):
+    return graph.nodes[index]
+
+
+class Neighbors(object):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def __getitem__(self, direction):
+        node = self.node
+        index = node.graph.linkBuffer.item(node.index, NEIGHBORCOLUMNS[direction])
+        if index < 0:
+            return None
+        return node.graph.nodes[index]
+
+    def __setitem__(self, direction, other):
+        node = self.node
+        index = -1
+        if other is not None:
+            if other.graph is not node.graph:
+                if other.graph.loose:
+                    node.graph.merge(other.graph)
+                elif node.graph.loose:
+                    other.graph.merge(node.graph)
+                else:
+                    raise ValueError("cannot link nodes from different graphs")
+            index = other.index
+        node.graph.linkBuffer[node.index, NEIGHBORCOLUMNS[direction]] = index
+        node.graph.version += 1
+
+    def keys(self):
+        return list(NEIGHBORCOLUMNS)
+
+    def __iter__(self):
+        return iter(NEIGHBORCOLUMNS)
+
+    def __len__(self):
+        return len(NEIGHBORCOLUMNS)
+
+    def __contains__(self, direction):
+        return direction in NEIGHBORCOLUMNS
+
+    def get(self, direction, default=None):
+        if direction in NEIGHBORCOLUMNS:
+            return self[direction]
+        return default
+
+    def values(self):
+        return [self[direction] for direction in NEIGHBORCOLUMNS]
+
+    def items(self):
+        return [(direction, self[direction]) for direction in NEIGHBORCOLUMNS]
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class AccessRights(object):
+    # the entity names allowed one way out of a node, read from its bit mask
+    __slots__ = ("node", "column")
+
+    def __init__(self, node, column):
+        self.node = node
+        self.column = column
+
+    @property
+    def mask(self):
+        return self.node.graph.accessBuffer.item(self.node.index, self.column)
+
+    def __contains__(self, name):
+        if not isinstance(name, int) or not 0 <= name < 8:
+            return False
+        return bool(self.mask >> name & 1)
+
+    def __iter__(self):
+        mask = self.mask
+        return iter([name for name in range(8) if mask >> name & 1])
+
+    def __len__(self):
+        return bin(self.mask).count("1")
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def setMask(self, mask):
+        if mask != self.mask:
+            self.node.graph.accessBuffer[self.node.index, self.column] = mask
+            self.node.graph.version += 1
+
+    def append(self, name):
+        self.setMask(self.mask | accessBit(name))
+
+    def remove(self, name):
+        if name not in self:
+            raise ValueError("%r is not allowed here" % (name,))
+        self.setMask(self.mask & ~accessBit(name))
+
+
+class Access(object):
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def __getitem__(self, direction):
+        return AccessRights(self.node, ACCESSCOLUMNS[direction])
+
+    def __setitem__(self, direction, names):
+        mask = 0
+        for name in names:
+            mask |= accessBit(name)
+        self[direction].setMask(mask)
+
+    def keys(self):
+        return list(PATHDIRECTIONS)
+
+    def __iter__(self):
+        return iter(PATHDIRECTIONS)
+
+    def items(self):
+        return [(direction, self[direction]) for direction in PATHDIRECTIONS]
+
+
 class Node(object):
-    def __init__(self, x, y):
+    def __init__(self, x, y, graph=None):
+        # a free-standing node gets a graph of its own, merged away once it is linked
+        if graph is None:
+            graph = NodeGraph(1, loose=True)
+        self.attach(graph, graph.add(self, x, y), x, y)
+
+    def attach(self, graph, index, x, y):
+        self.graph = graph
+        self.index = index
         self.position = Vector2(x, y)
-        self.neighbors = {UP:None, DOWN:None, LEFT:None, RIGHT:None, PORTAL:None}
-        self.access = {UP:[MOUSE, CAT1, CAT2, CAT3, CAT4], 
-                       DOWN:[MOUSE, CAT1, CAT2, CAT3, CAT4], 
-                       LEFT:[MOUSE, CAT1, CAT2, CAT3, CAT4], 
-                       RIGHT:[MOUSE, CAT1, CAT2, CAT3, CAT4]}
+        self.neighbors = Neighbors(self)
+        self.access = Access(self)
+
+    def __reduce__(self):
+        return nodeAt, (self.graph, self.index)
+
+    def allows(self, direction, bits):
+        return self.graph.accessBuffer.item(self.index, ACCESSCOLUMNS[direction]) & bits
+
+    def denyBits(self, direction, bits):
+        rights = self.access[direction]
+        rights.setMask(rights.mask & ~bits)
+
+    def allowBits(self, direction, bits):
+        rights = self.access[direction]
+        rights.setMask(rights.mask | bits)
 
     def denyAccess(self, direction, entity):
-        if entity.name in self.access[direction]:
-            self.access[direction].remove(entity.name)
+        self.denyBits(direction, accessBit(entity.name))
 
     def allowAccess(self, direction, entity):
-        if entity.name not in self.access[direction]:
-            self.access[direction].append(entity.name)
+        self.allowBits(direction, accessBit(entity.name))
 
     def render(self, screen):
+        import pygame
         for n in self.neighbors.keys():
             if self.neighbors[n] is not None:
                 line_start = self.position.asTuple()
@@ -29,27 +286,135 @@ class Node(object):
                 pygame.draw.circle(screen, RED, self.position.asInt(), 12)
 
 
+class PathTables(object):
+    def __init__(self, nodes, distances, nextHops):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.positions = np.array([node.position.asTuple() for node in nodes], dtype=float).reshape(-1, 2)
+        self.distances = distances  # (N, N) shortest path length in pixels, inf when unreachable
+        self.nextHops = nextHops    # (N, N) first direction to take, PORTAL for a jump, STOP when none
+
+    def distance(self, start, goal):
+        return float(self.distances[self.index[start], self.index[goal]])
+
+    def nextDirection(self, start, goal):
+        return int(self.nextHops[self.index[start], self.index[goal]])
+
+    def nearestNode(self, position):
+        dSquared = ((self.positions - (position.x, position.y))**2).sum(axis=1)
+        return self.nodes[int(dSquared.argmin())]
+
+    def bestDirection(self, node, goal, directions):
+        # the allowed direction with the shortest path to goal, or None if goal is out of reach
+        column = self.distances[:, self.index[goal]]
+        best = None
+        bestDistance = np.inf
+        for direction in directions:
+            neighbor = node.neighbors[direction]
+            if neighbor is None:
+                continue
+            distance = (abs(neighbor.position.x - node.position.x) + abs(neighbor.position.y - node.position.y)
+                        + column[self.index[neighbor]])
+            if distance < bestDistance:
+                best = direction
+                bestDistance = distance
+        return best
+
+
+def shortestPaths(positions, links, portals):
+    # Floyd-Warshall over the node graph, carrying the first step of each path along
+    n = len(positions)
+    distances = np.full((n, n), np.inf)
+    nextHops = np.zeros((n, n), dtype=np.int8)
+    np.fill_diagonal(distances, 0)
+    for j, direction in enumerate(PATHDIRECTIONS):
+        sources = np.nonzero(links[:, j] >= 0)[0]
+        targets = links[sources, j]
+        distances[sources, targets] = np.abs(positions[sources] - positions[targets]).sum(axis=1)
+        nextHops[sources, targets] = direction
+    sources = np.nonzero(portals >= 0)[0]
+    distances[sources, portals[sources]] = 0
+    nextHops[sources, portals[sources]] = PORTAL
+    for k in range(n):
+        via = distances[:, k, None] + distances[None, k, :]
+        better = via < distances
+        distances = np.where(better, via, distances)
+        nextHops = np.where(better, nextHops[:, k, None], nextHops)
+    return distances, nextHops
+
+
 class NodeGroup(object):
-    def __init__(self, level):
+    def __init__(self, level, compiled=None):
         self.level = level
+        self.graph = NodeGraph()
         self.nodesLUT = {}
         self.nodeSymbols = ['+', 'P', 'n']
         self.pathSymbols = ['.', '-', '|', 'p']
-        data = self.readMazeFile(level)
-        self.createNodeTable(data)
-        self.connectHorizontally(data)
-        self.connectVertically(data)
+        # path tables by graph and access layout, shared by every group built from the same maze
+        self.pathCache = {}
+        self.paths = {}
+        self.pathVersion = None
+        if compiled is None:
+            self.buildNodes(self.readMazeFile(level))
+        else:
+            self.pathCache = compiled.paths
+            self.loadCompiled(compiled)
         self.homekey = None
 
     def readMazeFile(self, textfile):
         return np.loadtxt(textfile, dtype='<U1')
 
+    def loadCompiled(self, compiled):
+        self.graph.version += 1
+        positions = compiled.nodes.tolist()
+        nodes = self.graph.addNodes(positions)
+        for (x, y), node in zip(positions, nodes):
+            self.nodesLUT[(x, y)] = node
+        if nodes:
+            base = nodes[0].index
+            rows = slice(base, base + len(nodes))
+            self.graph.linkBuffer[rows, :4] = np.where(compiled.links >= 0, compiled.links + base, -1)
+            pairs = compiled.portals + base
+            self.graph.linkBuffer[pairs[:, 0], NEIGHBORCOLUMNS[PORTAL]] = pairs[:, 1]
+            self.graph.linkBuffer[pairs[:, 1], NEIGHBORCOLUMNS[PORTAL]] = pairs[:, 0]
+
+    def buildNodes(self, data, xoffset=0, yoffset=0):
+        self.graph.version += 1
+        rows, cols, horizontal, vertical = self.findLinks(data)
+        keys = [self.constructKey(col+xoffset, row+yoffset) for row, col in zip(rows.tolist(), cols.tolist())]
+        nodes = self.graph.addNodes(keys)
+        for key, node in zip(keys, nodes):
+            self.nodesLUT[key] = node
+        index = np.array([node.index for node in nodes], dtype=np.int32)
+        links = self.graph.linkBuffer
+        links[index[horizontal[:, 0]], NEIGHBORCOLUMNS[RIGHT]] = index[horizontal[:, 1]]
+        links[index[horizontal[:, 1]], NEIGHBORCOLUMNS[LEFT]] = index[horizontal[:, 0]]
+        links[index[vertical[:, 0]], NEIGHBORCOLUMNS[DOWN]] = index[vertical[:, 1]]
+        links[index[vertical[:, 1]], NEIGHBORCOLUMNS[UP]] = index[vertical[:, 0]]
+
+    def findLinks(self, data):
+        # node cells in row-major order, plus (i, j) index pairs of linked nodes:
+        # consecutive nodes along an axis link when no wall cell lies between them
+        isNode = np.isin(data, self.nodeSymbols)
+        isWall = ~(isNode | np.isin(data, self.pathSymbols))
+        rows, cols = np.nonzero(isNode)
+        index = np.arange(len(rows))
+        walls = np.cumsum(isWall, axis=1)[rows, cols]
+        linked = (rows[1:] == rows[:-1]) & (walls[1:] == walls[:-1])
+        horizontal = np.stack([index[:-1][linked], index[1:][linked]], axis=1)
+        order = np.lexsort((rows, cols))
+        rowsT, colsT = rows[order], cols[order]
+        walls = np.cumsum(isWall, axis=0)[rowsT, colsT]
+        linked = (colsT[1:] == colsT[:-1]) & (walls[1:] == walls[:-1])
+        vertical = np.stack([order[:-1][linked], order[1:][linked]], axis=1)
+        return rows, cols, horizontal, vertical
+
     def createNodeTable(self, data, xoffset=0, yoffset=0):
         for row in list(range(data.shape[0])):
             for col in list(range(data.shape[1])):
                 if data[row][col] in self.nodeSymbols:
                     x, y = self.constructKey(col+xoffset, row+yoffset)
-                    self.nodesLUT[(x, y)] = Node(x, y)
+                    self.nodesLUT[(x, y)] = Node(x, y, self.graph)
 
     def constructKey(self, x, y):
         return x * TILEWIDTH, y * TILEHEIGHT
@@ -105,9 +470,7 @@ class NodeGroup(object):
                              ['+','.','+','.','+'],
                              ['+','X','X','X','+']])
 
-        self.createNodeTable(homedata, xoffset, yoffset)
-        self.connectHorizontally(homedata, xoffset, yoffset)
-        self.connectVertically(homedata, xoffset, yoffset)
+        self.buildNodes(homedata, xoffset, yoffset)
         self.homekey = self.constructKey(xoffset+2, yoffset)
         return self.homekey
 
@@ -138,12 +501,14 @@ class NodeGroup(object):
             node.allowAccess(direction, entity)
 
     def denyAccessList(self, col, row, direction, entities):
-        for entity in entities:
-            self.denyAccess(col, row, direction, entity)
+        node = self.getNodeFromTiles(col, row)
+        if node is not None:
+            node.denyBits(direction, accessBits(entities))
 
     def allowAccessList(self, col, row, direction, entities):
-        for entity in entities:
-            self.allowAccess(col, row, direction, entity)
+        node = self.getNodeFromTiles(col, row)
+        if node is not None:
+            node.allowBits(direction, accessBits(entities))
 
     def denyHomeAccess(self, entity):
         self.nodesLUT[self.homekey].denyAccess(DOWN, entity)
@@ -152,12 +517,32 @@ class NodeGroup(object):
         self.nodesLUT[self.homekey].allowAccess(DOWN, entity)
 
     def denyHomeAccessList(self, entities):
-        for entity in entities:
-            self.denyHomeAccess(entity)
+        self.nodesLUT[self.homekey].denyBits(DOWN, accessBits(entities))
 
     def allowHomeAccessList(self, entities):
-        for entity in entities:
-            self.allowHomeAccess(entity)
+        self.nodesLUT[self.homekey].allowBits(DOWN, accessBits(entities))
+
+    def pathTables(self, name):
+        if self.pathVersion != self.graph.version:
+            self.paths = {}
+            self.pathVersion = self.graph.version
+        tables = self.paths.get(name)
+        if tables is None:
+            tables = self.buildPathTables(name)
+            self.paths[name] = tables
+        return tables
+
+    def buildPathTables(self, name):
+        graph = self.graph
+        positions = graph.positions
+        links = np.where(graph.access & accessBit(name), graph.links[:, :4], -1)
+        portals = graph.links[:, 4]
+        digest = hashlib.sha1(positions.tobytes() + links.tobytes() + portals.tobytes()).hexdigest()
+        tables = self.pathCache.get(digest)
+        if tables is None:
+            tables = shortestPaths(positions, links, portals)
+            self.pathCache[digest] = tables
+        return PathTables(graph.nodes, *tables)
 
     def render(self, screen):
         for node in self.nodesLUT.values():
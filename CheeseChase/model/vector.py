@@ -1,10 +1,12 @@
 import math
 
 class Vector2(object):
+    __slots__ = ("x", "y")
+    thresh = 0.000001
+
     def __init__(self, x=0, y=0):
         self.x = x
         self.y = y
-        self.thresh = 0.000001
 
     def __add__(self, other):
         return Vector2(self.x + other.x, self.y + other.y)
@@ -26,12 +28,37 @@ class Vector2(object):
     def __truediv__(self, scalar):
         return self.__div__(scalar)
 
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
     def __eq__(self, other):
         if abs(self.x - other.x) < self.thresh:
             if abs(self.y - other.y) < self.thresh:
                 return True
         return False
 
+    def addScaled(self, other, scalar):
+        self.x += other.x * scalar
+        self.y += other.y * scalar
+        return self
+
+    def distanceSquaredTo(self, other):
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx*dx + dy*dy
+
     def magnitudeSquared(self):
         return self.x**2 + self.y**2
 
@@ -48,4 +75,4 @@ class Vector2(object):
         return int(self.x), int(self.y)
 
     def __str__(self):
-        return "<"+str(self.x)+", "+str(self.y)+">"
\ No newline at end of file
+        return "<"+str(self.x)+", "+str(self.y)+">"
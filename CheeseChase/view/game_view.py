@@ -3,22 +3,117 @@ from pygame.locals import *
 from ..model.constants import *
 
 class GameView:
-    def __init__(self, controller):
-        self.controller = controller 
+    def __init__(self, controller, dirtyRects=False):
+        self.controller = controller
+        self.dirtyRects = dirtyRects
+        self.background = None
+        self.lives = None
+        self.previous = {}
+        self.pixelsPushed = 0
+        self.totalPixelsPushed = 0
+        self.frames = 0
 
-    def render(self):
+    def render(self, alpha=1.0):
+        if self.dirtyRects and self.canRenderDirty():
+            pushed = self.renderDirty(alpha)
+        else:
+            self.renderFull(alpha)
+            pygame.display.update()
+            pushed = SCREENWIDTH * SCREENHEIGHT
+            if self.dirtyRects:
+                self.rememberFrame(alpha)
+            del self.controller.cheeses.erased[:]
+        self.pixelsPushed = pushed
+        self.totalPixelsPushed += pushed
+        self.frames += 1
+
+    def renderFull(self, alpha=1.0):
         screen = self.controller.screen
         screen.blit(self.controller.background, (0, 0))
         self.controller.cheeses.render(screen)
-        self.controller.mouse.render(screen)
-        self.controller.cats.render(screen)
+        self.controller.mouse.render(screen, alpha)
+        self.controller.cats.render(screen, alpha)
         self.controller.textgroup.render(screen)
+        self.renderLives(screen)
 
+    def renderLives(self, screen):
         for i, img in enumerate(self.controller.lifesprites.images):
             x = img.get_width() * i
             y = SCREENHEIGHT - img.get_height()
             screen.blit(img, (x, y))
-            
-        pygame.display.update()
 
-    
\ No newline at end of file
+    def canRenderDirty(self):
+        return (self.controller.background is self.background and
+                len(self.controller.lifesprites.images) == self.lives)
+
+    def rememberFrame(self, alpha=1.0):
+        self.background = self.controller.background
+        self.lives = len(self.controller.lifesprites.images)
+        self.previous = self.collectState(alpha)
+
+    def collectState(self, alpha=1.0):
+        state = {}
+        c = self.controller
+        for entity in [c.mouse] + list(c.cats):
+            state[("entity", id(entity))] = (self.entityRect(entity, alpha), None)
+        for cheese in c.cheeses.powercheeses:
+            x, y = cheese.position.asTuple()
+            state[("power", id(cheese))] = (pygame.Rect(int(x), int(y), TILEWIDTH, TILEHEIGHT), cheese.visible)
+        for key, text in c.textgroup.alltext.items():
+            x, y = text.position.asTuple()
+            rect = text.label.get_rect(topleft=(int(x), int(y)))
+            state[("text", key)] = (rect, (id(text.label), text.text, text.visible))
+        return state
+
+    def entityRect(self, entity, alpha=1.0):
+        x, y = entity.renderPosition(alpha)
+        if entity.image is not None:
+            w, h = entity.image.get_size()
+            return pygame.Rect(int(x - TILEWIDTH/2) - 1, int(y - TILEHEIGHT/2) - 1, w + 2, h + 2)
+        r = entity.radius
+        return pygame.Rect(int(x) - r - 1, int(y) - r - 1, 2*r + 2, 2*r + 2)
+
+    def findDirty(self, current):
+        dirty = []
+        for key, (rect, token) in current.items():
+            old = self.previous.get(key)
+            if old is None:
+                dirty.append(rect)
+            elif token is None or old[0] != rect or old[1] != token:
+                if old[0].colliderect(rect):
+                    dirty.append(old[0].union(rect))
+                else:
+                    dirty.append(old[0])
+                    dirty.append(rect)
+        for key, (rect, token) in self.previous.items():
+            if key not in current:
+                dirty.append(rect)
+        return dirty
+
+    def renderDirty(self, alpha=1.0):
+        c = self.controller
+        screen = c.screen
+        current = self.collectState(alpha)
+        dirty = self.findDirty(current)
+        # the mouse is drawn where it was between steps, which can stop short
+        # of the cheese it ate, so eaten tiles are restored on their own
+        for row, col in c.cheeses.erased:
+            dirty.append(pygame.Rect(col * TILEWIDTH, row * TILEHEIGHT, TILEWIDTH, TILEHEIGHT))
+        del c.cheeses.erased[:]
+        # overlapping text is redrawn whole, so restore all of it
+        for key, (rect, token) in current.items():
+            if key[0] == "text" and token[2] and rect.collidelist(dirty) != -1:
+                dirty.append(rect)
+        dirty = [rect.clip(screen.get_rect()) for rect in dirty]
+        for rect in dirty:
+            screen.blit(c.background, rect, rect)
+        c.cheeses.render(screen, dirty)
+        c.mouse.render(screen, alpha)
+        c.cats.render(screen, alpha)
+        for key, text in c.textgroup.alltext.items():
+            if current[("text", key)][0].collidelist(dirty) != -1:
+                text.render(screen)
+        self.renderLives(screen)
+        pygame.display.update(dirty)
+        self.previous = current
+        return sum(rect.width * rect.height for rect in dirty)
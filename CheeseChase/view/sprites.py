@@ -1,6 +1,7 @@
 import pygame
 from ..model.constants import *
-import numpy as np
+import time
+from types import MappingProxyType
 from .animation import Animator
 from importlib import resources
 
@@ -8,13 +9,65 @@ from importlib import resources
 BASETILEWIDTH = 16
 BASETILEHEIGHT = 16
 DEATH = 5
+SPRITESHEET = "spritesheet2.png"
+
+class SheetRegistry(object):
+    def __init__(self):
+        self.sheets = {}
+        self.loads = {}
+        self.requests = {}
+        self.loadTimes = {}
+        self.pending = {}
+
+    def getSheet(self, name=SPRITESHEET):
+        self.requests[name] = self.requests.get(name, 0) + 1
+        sheet = self.sheets.get(name)
+        if sheet is None:
+            sheet = self.loadSheet(name)
+            self.sheets[name] = sheet
+        return sheet
+
+    def preload(self, name, executor):
+        # decode on a worker; the main thread still converts it in getSheet
+        if name not in self.sheets and name not in self.pending:
+            self.pending[name] = executor.submit(self.decodeSheet, name)
+        return self.pending.get(name)
+
+    def decodeSheet(self, name):
+        img_path = resources.files("CheeseChase.resources") / name
+        return pygame.image.load(str(img_path))
+
+    def loadSheet(self, name):
+        start = time.perf_counter()
+        pending = self.pending.pop(name, None)
+        sheet = pending.result() if pending is not None else self.decodeSheet(name)
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert()
+        transcolor = sheet.get_at((0,0))
+        sheet.set_colorkey(transcolor)
+        self.loads[name] = self.loads.get(name, 0) + 1
+        self.loadTimes[name] = self.loadTimes.get(name, 0) + time.perf_counter() - start
+        return sheet
+
+    def stats(self):
+        stats = {}
+        for name in self.requests.keys():
+            stats[name] = {"loads": self.loads.get(name, 0),
+                           "requests": self.requests[name],
+                           "loadTime": self.loadTimes.get(name, 0)}
+        return stats
+
+    def clear(self):
+        self.sheets.clear()
+        self.pending.clear()
+
+# decodes each sheet once per process; every Spritesheet shares the surface
+sheets = SheetRegistry()
+
 
 class Spritesheet(object):
     def __init__(self):
-        img_path = resources.files("CheeseChase.resources") / "spritesheet2.png"
-        self.sheet = pygame.image.load(str(img_path)).convert()
-        transcolor = self.sheet.get_at((0,0))
-        self.sheet.set_colorkey(transcolor)
+        self.sheet = sheets.getSheet(SPRITESHEET)
 
 
     def getImage(self, x, y, width, height):
@@ -28,39 +81,35 @@ class MouseSprites(Spritesheet):
     def __init__(self, entity):
         Spritesheet.__init__(self)
         self.entity = entity
+        self.frames = self.defineFrames()
         self.entity.image = self.getStartImage()         
         self.animations = {}
         self.defineAnimations()
-        self.stopimage = (0, 0)
+        self.stopimage = self.frames[LEFT]
+
+    def defineFrames(self):
+        return MappingProxyType({LEFT: self.getImage(0, 0), RIGHT: self.getImage(2, 0),
+                                 DOWN: self.getImage(4, 0), UP: self.getImage(6, 0)})
 
     def defineAnimations(self):
-        self.animations[DEATH] = Animator(((0, 6), (2, 6), (4, 6), (6, 6), (8, 6), (10, 6), (12, 6), (14, 6), (16, 6), (18, 6)), speed=6, loop=False)
+        frames = tuple(self.getImage(x, 6) for x in range(0, 20, 2))
+        self.animations[DEATH] = Animator(frames, speed=6, loop=False)
 
     def update(self, dt):
         if self.entity.alive == True:
-            if self.entity.direction == LEFT:
-                self.entity.image = self.getImage(0,0)
-                self.stopimage = (0, 0)
-            elif self.entity.direction == RIGHT:
-                self.entity.image = self.getImage(2,0)
-                self.stopimage = (2, 0)
-            elif self.entity.direction == DOWN:
-                self.entity.image = self.getImage(4,0)
-                self.stopimage = (4,0)
-            elif self.entity.direction == UP:
-                self.entity.image = self.getImage(6,0)
-                self.stopimage = (6,0)
-            elif self.entity.direction == STOP:
-                self.entity.image = self.getImage(*self.stopimage)
+            image = self.frames.get(self.entity.direction)
+            if image is not None:
+                self.stopimage = image
+            self.entity.image = self.stopimage
         else:
-            self.entity.image = self.getImage(*self.animations[DEATH].update(dt))
+            self.entity.image = self.animations[DEATH].update(dt)
 
     def reset(self):
         for key in list(self.animations.keys()):
             self.animations[key].reset()
 
     def getStartImage(self):
-        return self.getImage(0, 0)
+        return self.frames[LEFT]
 
     def getImage(self, x, y):
         return Spritesheet.getImage(self, x, y, 2*TILEWIDTH, 2*TILEHEIGHT)
@@ -70,33 +119,29 @@ class CatSprites(Spritesheet):
     def __init__(self, entity):
         Spritesheet.__init__(self)
         self.entity = entity
+        self.frames = self.defineFrames()
         self.entity.image = self.getStartImage()
-        self.stopimage = (0, 2)
+        self.stopimage = self.frames[(SCATTER, LEFT)]
+
+    def defineFrames(self):
+        frames = {}
+        for column, direction in ((0, LEFT), (2, RIGHT), (4, DOWN), (6, UP)):
+            normal = self.getImage(column, 2)
+            frames[(SCATTER, direction)] = normal
+            frames[(CHASE, direction)] = normal
+            frames[(SPAWN, direction)] = self.getImage(column, 4)
+        freight = self.getImage(8, 2)
+        for direction in (LEFT, RIGHT, DOWN, UP, STOP):
+            frames[(FREIGHT, direction)] = freight
+        return MappingProxyType(frames)
 
     def update(self, dt):
-        if self.entity.mode.current in [SCATTER, CHASE]:
-            if self.entity.direction == LEFT:
-                self.entity.image = self.getImage(0, 2)
-            elif self.entity.direction == RIGHT:
-                self.entity.image = self.getImage(2, 2)
-            elif self.entity.direction == DOWN:
-                self.entity.image = self.getImage(4, 2)
-            elif self.entity.direction == UP:
-                self.entity.image = self.getImage(6, 2)
-        elif self.entity.mode.current == FREIGHT:
-            self.entity.image = self.getImage(8, 2)
-        elif self.entity.mode.current == SPAWN:
-            if self.entity.direction == LEFT:
-                self.entity.image = self.getImage(0, 4)
-            elif self.entity.direction == RIGHT:
-                self.entity.image = self.getImage(2, 4)
-            elif self.entity.direction == DOWN:
-                self.entity.image = self.getImage(4, 4)
-            elif self.entity.direction == UP:
-                self.entity.image = self.getImage(6, 4)
+        image = self.frames.get((self.entity.mode.current, self.entity.direction))
+        if image is not None:
+            self.entity.image = image
                
     def getStartImage(self):
-        return self.getImage(0, 2)
+        return self.frames[(SCATTER, LEFT)]
 
     def getImage(self, x, y):
         return Spritesheet.getImage(self, x, y, 2*TILEWIDTH, 2*TILEHEIGHT)
@@ -120,20 +165,26 @@ class LifeSprites(Spritesheet):
 
 
 class MazeSprites(Spritesheet):
-    def __init__(self, mazefile, rotfile):
+    def __init__(self, mazefile, rotfile, compiled=None):
         Spritesheet.__init__(self)
-        self.data = self.readMazeFile(mazefile)
-        self.rotdata = self.readMazeFile(rotfile)
+        if compiled is None:
+            self.data = self.readMazeFile(mazefile)
+            self.rotdata = self.readMazeFile(rotfile)
+        else:
+            self.data = compiled.data
+            self.rotdata = compiled.rotdata
 
     def getImage(self, x, y):
         return Spritesheet.getImage(self, x, y, TILEWIDTH, TILEHEIGHT)
 
     def readMazeFile(self, mazefile):
-        return np.loadtxt(mazefile, dtype='<U1')
+        # one list of symbols per line; plain text needs no numpy
+        with open(mazefile) as f:
+            return [line.split() for line in f if line.strip()]
 
     def constructBackground(self, background, y):
-        for row in list(range(self.data.shape[0])):
-            for col in list(range(self.data.shape[1])):
+        for row in range(len(self.data)):
+            for col in range(len(self.data[row])):
                 if self.data[row][col].isdigit():
                     x = int(self.data[row][col]) + 12
                     sprite = self.getImage(x, y)
@@ -148,3 +199,28 @@ class MazeSprites(Spritesheet):
 
     def rotate(self, sprite, value):
         return pygame.transform.rotate(sprite, value*90)
+
+
+class HeadlessLifeSprites(object):
+    # counts lives like LifeSprites without cutting images from the spritesheet
+    def __init__(self, numlives):
+        self.resetLives(numlives)
+
+    def removeImage(self):
+        if len(self.images) > 0:
+            self.images.pop(0)
+
+    def resetLives(self, numlives):
+        self.images = [None] * numlives
+
+
+class HeadlessMazeSprites(object):
+    # stands in for MazeSprites when nothing is drawn, so the sheet is never loaded
+    def __init__(self, mazefile, rotfile, compiled=None):
+        pass
+
+    def getImage(self, x, y):
+        return None
+
+    def constructBackground(self, background, y):
+        return background
@@ -1,8 +1,82 @@
+import io
 import pygame
+from collections import OrderedDict
 from ..model.vector import Vector2
 from ..model.constants import *
 from importlib import resources
 
+FONT = "PressStart2P-Regular.ttf"
+
+class TextCache(object):
+    def __init__(self, maxlabels=128):
+        self.fonts = {}
+        self.fontData = {}
+        self.pending = {}
+        self.labels = OrderedDict()
+        self.maxlabels = maxlabels
+        self.fontHits = 0
+        self.fontMisses = 0
+        self.labelHits = 0
+        self.labelMisses = 0
+
+    def getFont(self, fontpath, size):
+        font = self.fonts.get((fontpath, size))
+        if font is None:
+            self.fontMisses += 1
+            pending = self.pending.pop(fontpath, None)
+            if pending is not None:
+                self.fontData[fontpath] = pending.result()
+            data = self.fontData.get(fontpath)
+            if data is not None:
+                font = pygame.font.Font(io.BytesIO(data), size)
+            else:
+                font = pygame.font.Font(fontpath, size)
+            self.fonts[(fontpath, size)] = font
+        else:
+            self.fontHits += 1
+        return font
+
+    def getLabel(self, fontpath, size, text, color):
+        key = (fontpath, size, text, tuple(color))
+        label = self.labels.get(key)
+        if label is None:
+            self.labelMisses += 1
+            font = self.fonts.get((fontpath, size))
+            if font is None:
+                font = self.getFont(fontpath, size)
+            label = font.render(text, 1, color)
+            self.labels[key] = label
+            if len(self.labels) > self.maxlabels:
+                self.labels.popitem(last=False)
+        else:
+            self.labelHits += 1
+            self.labels.move_to_end(key)
+        return label
+
+    def preloadFont(self, fontpath, executor):
+        # read the file on a worker; fonts of any size are then built from memory
+        if fontpath not in self.fontData and fontpath not in self.pending:
+            self.pending[fontpath] = executor.submit(readBytes, fontpath)
+        return self.pending.get(fontpath)
+
+    def stats(self):
+        return {"fonts": len(self.fonts), "fontHits": self.fontHits, "fontMisses": self.fontMisses,
+                "labels": len(self.labels), "labelHits": self.labelHits, "labelMisses": self.labelMisses}
+
+    def clear(self):
+        self.fonts.clear()
+        self.labels.clear()
+        self.fontData.clear()
+        self.pending.clear()
+
+def readBytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+# fonts keyed by (path, size), rendered labels LRU-keyed by (path, size, text, color)
+textcache = TextCache()
+
+
 class Text(object):
     def __init__(self, text, color, x, y, size, time=None, id=None, visible=True):
         self.id = id
@@ -15,15 +89,16 @@ class Text(object):
         self.lifespan = time
         self.label = None
         self.destroy = False
-        font_path = resources.files("CheeseChase.resources") / "PressStart2P-Regular.ttf"
+        font_path = resources.files("CheeseChase.resources") / FONT
         self.setupFont(str(font_path))
         self.createLabel()
 
     def setupFont(self, fontpath):
-        self.font = pygame.font.Font(fontpath, self.size)
+        self.fontpath = fontpath
+        self.font = textcache.getFont(fontpath, self.size)
 
     def createLabel(self):
-        self.label = self.font.render(self.text, 1, self.color)
+        self.label = textcache.getLabel(self.fontpath, self.size, self.text, self.color)
 
     def setText(self, newtext):
         self.text = str(newtext)
@@ -43,6 +118,39 @@ class Text(object):
             screen.blit(self.label, (x, y))
 
 
+class CounterText(Text):
+    def __init__(self, value, color, x, y, size, digits, time=None, id=None, visible=True):
+        self.digits = digits
+        self.glyphs = None
+        self.shown = None
+        self.glyphBlits = 0
+        Text.__init__(self, str(value).zfill(digits), color, x, y, size, time=time, id=id, visible=visible)
+
+    def setupGlyphs(self):
+        self.glyphs = {}
+        for digit in "0123456789":
+            self.glyphs[digit] = textcache.getLabel(self.fontpath, self.size, digit, self.color)
+        self.glyphWidth, self.glyphHeight = self.font.size("0")
+
+    def createLabel(self):
+        if self.glyphs is None:
+            self.setupGlyphs()
+        if not self.text.isdigit():
+            self.shown = None
+            Text.createLabel(self)
+            return
+        if self.shown is None or len(self.shown) != len(self.text):
+            self.label = pygame.Surface((self.glyphWidth*len(self.text), self.glyphHeight), pygame.SRCALPHA)
+            self.shown = " " * len(self.text)
+        for i in range(len(self.text)):
+            if self.shown[i] != self.text[i]:
+                x = i * self.glyphWidth
+                self.label.fill((0, 0, 0, 0), (x, 0, self.glyphWidth, self.glyphHeight))
+                self.label.blit(self.glyphs[self.text[i]], (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+                self.glyphBlits += 1
+        self.shown = self.text
+
+
 class TextGroup(object):
     def __init__(self):
         self.nextid = 10
@@ -60,8 +168,8 @@ class TextGroup(object):
         
     def setupText(self):
         size = TILEHEIGHT
-        self.alltext[SCORETXT] = Text("0".zfill(8), RED, 0, TILEHEIGHT, size)
-        self.alltext[LEVELTXT] = Text(str(1).zfill(3), RED, 23*TILEWIDTH, TILEHEIGHT, size)
+        self.alltext[SCORETXT] = CounterText(0, RED, 0, TILEHEIGHT, size, 8)
+        self.alltext[LEVELTXT] = CounterText(1, RED, 23*TILEWIDTH, TILEHEIGHT, size, 3)
         self.alltext[READYTXT] = Text("READY!", TEAL, 11.25*TILEWIDTH, 20*TILEHEIGHT, size, visible=False)
         self.alltext[PAUSETXT] = Text("PAUSED!", TEAL, 10.625*TILEWIDTH, 20*TILEHEIGHT, size, visible=False)
         self.alltext[GAMEOVERTXT] = Text("GAMEOVER!", TEAL, 10*TILEWIDTH, 20*TILEHEIGHT, size, visible=False)
@@ -96,3 +204,38 @@ class TextGroup(object):
     def render(self, screen):
         for tkey in list(self.alltext.keys()):
             self.alltext[tkey].render(screen)
+
+
+class HeadlessTextGroup(object):
+    # TextGroup's interface for games nobody watches: no font is opened and no label rendered
+    def __init__(self):
+        self.nextid = 10
+        self.alltext = {}
+
+    def addText(self, text, color, x, y, size, time=None, id=None):
+        self.nextid += 1
+        return self.nextid
+
+    def removeText(self, id):
+        pass
+
+    def update(self, dt):
+        pass
+
+    def showText(self, id):
+        pass
+
+    def hideText(self):
+        pass
+
+    def updateScore(self, score):
+        pass
+
+    def updateLevel(self, level):
+        pass
+
+    def updateText(self, id, value):
+        pass
+
+    def render(self, screen):
+        pass
@@ -0,0 +1,65 @@
+# Game-steps per second: the headless GameController stepping one game at a time
+# against BatchEngine stepping N games in lockstep. Finished games are restarted.
+#
+#   python -m benchmarks.bench_batch [games ...]
+import gc
+import sys
+import time
+import numpy as np
+from CheeseChase.controller.game_controller import GameController
+from CheeseChase.controller.inputs import RandomControls
+from CheeseChase.batch import BatchEngine, BatchMaze
+from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT
+
+DIRECTIONS = np.array([UP, DOWN, LEFT, RIGHT])
+
+
+def timeRun(run, steps):
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    run(steps)
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed
+
+
+def objectRate(steps=20000):
+    game = GameController(headless=True, controls=RandomControls(seed=0))
+    game.startGame()
+
+    def run(steps):
+        for i in range(steps):
+            game.update()
+    return steps / timeRun(run, steps)
+
+
+def batchRate(maze, n, steps=2000):
+    engine = BatchEngine(maze, n, seed=0)
+    rng = np.random.default_rng(0)
+
+    def run(steps):
+        actions = DIRECTIONS[rng.integers(0, 4, n)]
+        for i in range(steps):
+            if i % 15 == 0:
+                actions = DIRECTIONS[rng.integers(0, 4, n)]
+            engine.step(actions)
+            if engine.done.any():
+                engine.restart(engine.done)
+    return n * steps / timeRun(run, steps)
+
+
+def main(sizes=(1, 16, 256, 1024)):
+    single = objectRate()
+    game = GameController(headless=True)
+    game.startGame()
+    maze = BatchMaze(game)
+    print("%-18s %16s %8s" % ("engine", "game-steps/s", "speedup"))
+    print("%-18s %16.0f %8s" % ("GameController", single, "1.0x"))
+    for n in sizes:
+        rate = batchRate(maze, n)
+        print("%-18s %16.0f %7.1fx" % ("BatchEngine n=%d" % n, rate, rate / single))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or (1, 16, 256, 1024))
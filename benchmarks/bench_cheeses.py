@@ -0,0 +1,100 @@
+# Cheese state and rendering on mazes with thousands of cheeses. Eating runs
+# the mouse along a serpentine path over the bit grid at game speed; drawing
+# compares one blit per remaining cheese against the cached cheese layer, and
+# the state column is the bytes held per level by the bit grid.
+#
+#   python -m benchmarks.bench_cheeses [size ...]
+import gc
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pygame
+from importlib import resources
+from CheeseChase.model.cheeses import CheeseGroup
+from CheeseChase.model.mouse import Mouse
+from CheeseChase.model.nodes import Node
+from CheeseChase.model.vector import Vector2
+from CheeseChase.model.constants import TILEWIDTH, TILEHEIGHT
+from CheeseChase.view.sprites import MazeSprites
+
+FRAMES = 600
+
+
+def writeCheeses(size, path):
+    data = np.full((size, size), '.')
+    data[::7, ::7] = 'P'
+    np.savetxt(path, data, fmt='%s')
+
+
+def path(size, frames):
+    # 100 px/s at 60 steps/s, sweeping each row in turn
+    step = 100 / 60
+    width = (size - 1) * TILEWIDTH
+    for i in range(frames):
+        distance = i * step
+        row = int(distance // width)
+        along = distance % width
+        x = along if row % 2 == 0 else width - along
+        yield Vector2(x, row * TILEHEIGHT)
+
+
+def timeEating(mouse, cheeses, positions):
+    eaten = 0
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    for position in positions:
+        mouse.position = position
+        cheese = mouse.eatCheeses(cheeses)
+        if cheese:
+            cheeses.removeCheese(cheese)
+            eaten += 1
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed, eaten
+
+
+def timeDrawing(draw, frames=50):
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    for i in range(frames):
+        draw()
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed / frames
+
+
+def main(sizes=(28, 64, 128)):
+    base = resources.files("CheeseChase.resources")
+    sprites = MazeSprites(str(base / "maze1.txt"), str(base / "maze1_rotation.txt"))
+    image = sprites.getImage(8, 0)
+    mouse = Mouse(Node(0, 0))
+    print("%-10s %8s %8s %8s %10s %14s %14s %8s" % ("grid", "cheeses", "eaten", "state B", "eat us/f",
+                                                     "blits us/f", "layer us/f", "speedup"))
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            cheesefile = os.path.join(directory, "cheeses%d.txt" % size)
+            writeCheeses(size, cheesefile)
+            group = CheeseGroup(cheesefile, sprites)
+            total = group.numLeft
+            eat, eaten = timeEating(mouse, group, list(path(size, FRAMES)))
+            screen = pygame.Surface((size * TILEWIDTH, size * TILEHEIGHT))
+            rows, cols, power = group.remaining()
+            corners = [(col * TILEWIDTH, row * TILEHEIGHT) for row, col in zip(rows.tolist(), cols.tolist())]
+
+            def blits():
+                for corner in corners:
+                    screen.blit(image, corner)
+            group.render(screen)
+            layer = timeDrawing(lambda: group.render(screen))
+            each = timeDrawing(blits)
+            print("%-10s %8d %8d %8d %10.1f %14.1f %14.1f %7.1fx" % (
+                "%dx%d" % (size, size), total, eaten, group.cheeses.nbytes + group.powers.nbytes,
+                eat / FRAMES * 1e6, each * 1e6, layer * 1e6, each / layer))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or (28, 64, 128))
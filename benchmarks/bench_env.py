@@ -0,0 +1,36 @@
+# GameEnv throughput: agent steps and simulated frames per second at several
+# frame-skip settings, with a random agent and episodes restarted as they end.
+#
+#   python -m benchmarks.bench_env [frameskip ...]
+import gc
+import random
+import sys
+from CheeseChase.controller.environment import GameEnv, ACTIONS
+
+
+def run(frameskip, steps=5000, seed=0):
+    env = GameEnv(frameskip=frameskip)
+    agent = random.Random(seed)
+    episodes = 0
+    env.reset(seed=seed)
+    gc.collect()
+    gc.disable()
+    while env.steps < steps:
+        obs, reward, done, info = env.step(agent.choice(ACTIONS))
+        if done:
+            episodes += 1
+            env.reset(seed=seed + episodes)
+    gc.enable()
+    return env, episodes
+
+
+def main(frameskips=(1, 2, 4, 8)):
+    print("%-10s %12s %12s %9s" % ("frameskip", "steps/s", "frames/s", "episodes"))
+    for frameskip in frameskips:
+        env, episodes = run(frameskip)
+        rate = env.stepsPerSecond()
+        print("%-10d %12.0f %12.0f %9d" % (frameskip, rate, rate * env.frames / env.steps, episodes))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or (1, 2, 4, 8))
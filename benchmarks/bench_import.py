@@ -0,0 +1,53 @@
+# Cold import time of the package and its entry points, each in a fresh
+# interpreter, and whether pygame / numpy came along:
+#
+#   python -m benchmarks.bench_import [runs]
+import statistics
+import subprocess
+import sys
+import time
+
+TARGETS = (
+    ("package", "import CheeseChase"),
+    ("model-only", "import CheeseChase.model.nodes, CheeseChase.model.fields, CheeseChase.model.mazecache, "
+                   "CheeseChase.model.cheeses, CheeseChase.model.entity"),
+    ("batch", "import CheeseChase.batch"),
+    ("game", "from CheeseChase import GameController; GameController"),
+    ("rollout worker", "import CheeseChase.controller.rollouts"),
+)
+
+PROBE = """
+import sys, time
+start = time.perf_counter_ns()
+%s
+print(time.perf_counter_ns() - start, 'pygame' in sys.modules, 'numpy' in sys.modules)
+"""
+
+
+def importTime(statement):
+    out = subprocess.run([sys.executable, "-c", PROBE % statement], capture_output=True, text=True,
+                         check=True).stdout.split()
+    return int(out[0]) / 1e6, out[1] == "True", out[2] == "True"
+
+
+def processTime(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(runs=10):
+    print("%-15s %10s %10s %7s %6s" % ("import", "median ms", "min ms", "pygame", "numpy"))
+    for name, statement in TARGETS:
+        results = [importTime(statement) for i in range(runs)]
+        times = [ms for ms, pygame, numpy in results]
+        print("%-15s %10.1f %10.1f %7s %6s" % (name, statistics.median(times), min(times),
+                                              results[0][1], results[0][2]))
+    # whole processes, interpreter start-up included
+    for name, args in (("python -c pass", ["-c", "pass"]), ("CLI --help", ["-m", "CheeseChase", "--help"])):
+        times = [processTime(args) for i in range(runs)]
+        print("%-15s %10.1f %10.1f" % (name, statistics.median(times), min(times)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
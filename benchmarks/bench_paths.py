@@ -0,0 +1,76 @@
+# Cat decisions on the shipped mazes: straight-line goalDirection against the
+# path-table lookup and the shared chase distance field, plus the one-off cost
+# of building the tables cold (fresh maze) and warm (same maze, tables shared
+# through the compiled maze) and of rebuilding the field for a new mouse tile.
+#
+#   python -m benchmarks.bench_paths [decisions]
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+from importlib import resources
+from CheeseChase.controller.game_controller import GameController
+from CheeseChase.model.constants import CHASE, UP, DOWN, LEFT, RIGHT
+from CheeseChase.model.fields import DistanceField
+
+
+def timeDecisions(cat, nodes, decisions):
+    directions = [UP, DOWN, LEFT, RIGHT]
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    for i in range(decisions):
+        cat.node = nodes[i % len(nodes)]
+        cat.directionMethod([d for d in directions if cat.node.neighbors[d] is not None])
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return elapsed / decisions
+
+
+def main(decisions=20000):
+    print("%-6s %6s %10s %10s %14s %14s %14s %12s" % ("maze", "nodes", "cold ms", "warm ms", "line us/dec",
+                                                    "paths us/dec", "field us/dec", "field us"))
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["CHEESECHASE_CACHE"] = directory
+        for level in (0, 1):
+            random.seed(0)
+            game = GameController(headless=True)
+            game.level = level
+            game.startGame()
+            cat = game.cats.cat1
+            cat.mode.current = CHASE
+            cat.chase()
+            nodes = list(game.nodes.nodesLUT.values())
+            start = time.perf_counter()
+            game.nodes.pathTables(cat.name)
+            cold = time.perf_counter() - start
+            game.nodes.paths = {}
+            start = time.perf_counter()
+            game.nodes.pathTables(cat.name)
+            warm = time.perf_counter() - start
+            line = timeDecisions(cat, nodes, decisions)
+            cat.usePaths(game.nodes)
+            paths = timeDecisions(cat, nodes, decisions)
+            data = np.loadtxt(str(resources.files("CheeseChase.resources") / ("%s.txt" % game.mazedata.obj.name)),
+                              dtype='<U1')
+            field = DistanceField(data, game.mazedata.obj.portalPairs, game.nodes.graph)
+            tiles = [node.position for node in nodes]
+            gc.disable()
+            start = time.perf_counter()
+            for position in tiles:
+                field.update(position)
+            rebuild = (time.perf_counter() - start) / len(tiles)
+            gc.enable()
+            # the last tile above may be off the maze; decide towards the mouse
+            field.update(game.mouse.position)
+            cat.useDistanceField(field)
+            chase = timeDecisions(cat, nodes, decisions)
+            print("%-6d %6d %10.2f %10.2f %14.2f %14.2f %14.2f %12.1f" % (
+                level, len(nodes), cold * 1e3, warm * 1e3, line * 1e6, paths * 1e6, chase * 1e6, rebuild * 1e6))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
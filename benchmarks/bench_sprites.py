@@ -0,0 +1,78 @@
+# Frames/sec of sprite selection for 5 entities (1 mouse, 4 cats):
+# per-frame getImage slicing (old behaviour) against the pre-cut frame tables.
+#
+#   python -m benchmarks.bench_sprites [frames]
+import sys
+import time
+from types import SimpleNamespace
+import pygame
+from CheeseChase.model.constants import *
+from CheeseChase.view.sprites import MouseSprites, CatSprites
+
+DIRECTIONS = (LEFT, RIGHT, DOWN, UP, STOP)
+MODES = (SCATTER, CHASE, FREIGHT, SPAWN)
+
+
+def legacyMouseUpdate(sprites):
+    entity = sprites.entity
+    if entity.direction == LEFT:
+        entity.image = sprites.getImage(0, 0)
+    elif entity.direction == RIGHT:
+        entity.image = sprites.getImage(2, 0)
+    elif entity.direction == DOWN:
+        entity.image = sprites.getImage(4, 0)
+    elif entity.direction == UP:
+        entity.image = sprites.getImage(6, 0)
+    elif entity.direction == STOP:
+        entity.image = sprites.getImage(0, 0)
+
+
+def legacyCatUpdate(sprites):
+    entity = sprites.entity
+    row = 4 if entity.mode.current == SPAWN else 2
+    if entity.mode.current == FREIGHT:
+        entity.image = sprites.getImage(8, 2)
+    elif entity.direction == LEFT:
+        entity.image = sprites.getImage(0, row)
+    elif entity.direction == RIGHT:
+        entity.image = sprites.getImage(2, row)
+    elif entity.direction == DOWN:
+        entity.image = sprites.getImage(4, row)
+    elif entity.direction == UP:
+        entity.image = sprites.getImage(6, row)
+
+
+def makeEntities():
+    mouse = SimpleNamespace(direction=LEFT, alive=True, image=None)
+    cats = [SimpleNamespace(direction=LEFT, mode=SimpleNamespace(current=SCATTER), image=None)
+            for i in range(4)]
+    return MouseSprites(mouse), [CatSprites(cat) for cat in cats]
+
+
+def run(frames, mouse, cats, mouseUpdate, catUpdate):
+    start = time.perf_counter()
+    for frame in range(frames):
+        direction = DIRECTIONS[frame % 5]
+        mouse.entity.direction = direction
+        mouseUpdate(mouse)
+        for i, cat in enumerate(cats):
+            cat.entity.direction = direction
+            cat.entity.mode.current = MODES[(frame // 30 + i) % 4]
+            catUpdate(cat)
+    return frames / (time.perf_counter() - start)
+
+
+def main(frames=20000):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    mouse, cats = makeEntities()
+    before = run(frames, mouse, cats, legacyMouseUpdate, legacyCatUpdate)
+    after = run(frames, mouse, cats, lambda s: s.update(0), lambda s: s.update(0))
+    print("sprite selection, 5 entities, %d frames" % frames)
+    print("  getImage per frame : %12.0f frames/s" % before)
+    print("  frame tables       : %12.0f frames/s" % after)
+    print("  speedup            : %12.1fx" % (after / before))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,193 @@
+# Benchmark suite over the load, simulate and render hot paths, with
+# reproducible scenarios (fixed seeds, scripted input, a private maze cache):
+#
+#   load-mazeN   NodeGroup + MazeSprites + constructBackground from the text files
+#   headless     GameController.update without a window
+#   render       step + full GameView.render to an offscreen surface
+#   text         rendered frames with a changing score and popup texts
+#   level        LevelManager.nextLevel, i.e. a full startGame with a new background
+#
+# Reports ops/sec and per op percentiles, and can save a JSON baseline or
+# compare against one, exiting 1 when a scenario slows down past --threshold:
+#
+#   python -m benchmarks.suite --save baseline.json
+#   python -m benchmarks.suite --compare baseline.json --threshold 0.1
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+from time import perf_counter_ns
+import numpy as np
+import pygame
+from importlib import resources
+from CheeseChase.model.constants import *
+from CheeseChase.model.mazedata import MazeData
+from CheeseChase.model.nodes import NodeGroup
+from CheeseChase.view.sprites import MazeSprites
+from CheeseChase.controller.game_controller import GameController
+from CheeseChase.controller.inputs import RandomControls
+
+SEED = 1
+
+
+def mazeFiles(name):
+    base = resources.files("CheeseChase.resources")
+    return str(base / f"{name}.txt"), str(base / f"{name}_rotation.txt")
+
+
+def makeGame(headless=True, seed=SEED):
+    random.seed(seed)
+    game = GameController(headless=headless, controls=RandomControls(seed))
+    game.startGame()
+    return game
+
+
+def timeOps(op, count):
+    samples = np.empty(count, dtype=np.int64)
+    gc.collect()
+    gc.disable()
+    try:
+        for i in range(count):
+            start = perf_counter_ns()
+            op()
+            samples[i] = perf_counter_ns() - start
+    finally:
+        gc.enable()
+    return samples
+
+
+def loadMaze(name):
+    mazefile, rotfile = mazeFiles(name)
+    def op():
+        NodeGroup(mazefile)
+        sprites = MazeSprites(mazefile, rotfile)
+        sprites.constructBackground(pygame.Surface(SCREENSIZE), 0)
+    return op
+
+
+def headlessFrames(count):
+    return timeOps(makeGame().update, count)
+
+
+def renderedFrames(count, texts=False):
+    game = makeGame()
+    game.screen = pygame.Surface(SCREENSIZE).convert()
+    game.setBackground()
+    frame = [0]
+    def op():
+        game.step(game.stepDt)
+        game.events_manager.resumeIfWaiting()
+        if texts:
+            frame[0] += 1
+            game.updateScore(10)
+            if frame[0] % 4 == 0:
+                game.textgroup.addText(str(frame[0] % 1000), RED, (frame[0] * 37) % SCREENWIDTH,
+                                       (frame[0] * 53) % SCREENHEIGHT, 8, time=0.5)
+        game.view.render()
+    return timeOps(op, count)
+
+
+def levelTransitions(count):
+    game = makeGame(headless=False)
+    return timeOps(game.level_manager.nextLevel, count)
+
+
+def scenarios(scale=1.0):
+    def n(count):
+        return max(1, int(count * scale))
+    table = {}
+    for maze in MazeData().mazedict.values():
+        name = maze().name
+        table["load-" + name] = lambda name=name: timeOps(loadMaze(name), n(20))
+    table["headless"] = lambda: headlessFrames(n(10000))
+    table["render"] = lambda: renderedFrames(n(1000))
+    table["text"] = lambda: renderedFrames(n(1000), texts=True)
+    table["level"] = lambda: levelTransitions(n(20))
+    return table
+
+
+def summarize(samples):
+    us = samples / 1000.0
+    p50, p95, p99 = np.percentile(us, (50, 95, 99))
+    return {"ops": len(samples), "ops_per_sec": len(samples) / (samples.sum() / 1e9),
+            "mean_us": float(us.mean()), "p50_us": float(p50), "p95_us": float(p95),
+            "p99_us": float(p99), "max_us": float(us.max())}
+
+
+def run(names=None, repeat=3, scale=1.0):
+    table = scenarios(scale)
+    results = {}
+    for name in names or table:
+        # best of a few runs, so one noisy run doesn't read as a regression
+        runs = [summarize(table[name]()) for _ in range(repeat)]
+        results[name] = max(runs, key=lambda r: r["ops_per_sec"])
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        change = result["ops_per_sec"] / old["ops_per_sec"] - 1
+        result["change"] = change
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def printResults(results, regressions=()):
+    print("%-12s %7s %12s %10s %10s %10s %10s %8s" %
+          ("scenario", "ops", "ops/s", "mean us", "p50 us", "p95 us", "p99 us", "change"))
+    for name, r in results.items():
+        change = "%+7.1f%%" % (100 * r["change"]) if "change" in r else ""
+        flag = "  REGRESSION" if name in regressions else ""
+        print("%-12s %7d %12.1f %10.1f %10.1f %10.1f %10.1f %8s%s" %
+              (name, r["ops"], r["ops_per_sec"], r["mean_us"], r["p50_us"],
+               r["p95_us"], r["p99_us"], change, flag))
+
+
+def parseArgs(args=None):
+    parser = argparse.ArgumentParser(prog="benchmarks.suite")
+    parser.add_argument("scenarios", nargs="*", help="scenarios to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, best one kept")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every op count")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="fractional ops/sec drop that counts as a regression")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    options = parseArgs(args)
+    # a private maze cache keeps every run starting from the same state
+    os.environ["CHEESECHASE_CACHE"] = tempfile.mkdtemp(prefix="cheesechase-bench-")
+    pygame.init()
+    pygame.display.set_mode(SCREENSIZE)
+    unknown = set(options.scenarios) - set(scenarios())
+    if unknown:
+        sys.exit("unknown scenarios: %s" % ", ".join(sorted(unknown)))
+    results = run(options.scenarios, options.repeat, options.scale)
+    regressions = []
+    if options.compare:
+        with open(options.compare) as f:
+            regressions = compare(results, json.load(f)["scenarios"], options.threshold)
+    printResults(results, regressions)
+    if options.save:
+        with open(options.save, 'w') as f:
+            json.dump({"python": platform.python_version(), "pygame": pygame.version.ver,
+                       "scale": options.scale, "scenarios": results}, f, indent=2)
+    if regressions:
+        print("regressions past %.0f%%: %s" % (100 * options.threshold, ", ".join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
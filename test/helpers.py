@@ -0,0 +1,17 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+
+class TempCacheMixin(object):
+    # tests that build real games compile mazes into a private cache instead of
+    # the user's; environ adds more variables for the length of each test
+    environ = {}
+
+    def setUp(self):
+        super().setUp()
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        env = patch.dict(os.environ, dict(self.environ, CHEESECHASE_CACHE=cache.name))
+        env.start()
+        self.addCleanup(env.stop)
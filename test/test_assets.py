@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+from CheeseChase.controller.assets import AssetLoader
+from CheeseChase.model.mazecache import MazeCache
+from test.helpers import TempCacheMixin
+
+
+class TestAssetLoader(unittest.TestCase):
+
+    def setUp(self):
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        for name in ("sheets", "textcache"):
+            patcher = patch("CheeseChase.controller.assets.%s" % name)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+        self.sheets.preload.side_effect = self.textcache.preloadFont.side_effect = self.done
+        self.loader = AssetLoader(MazeCache(cache.name))
+        self.addCleanup(self.loader.shutdown)
+
+    def done(self, *args):
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def test_preload_queues_sprites_font_and_every_maze(self):
+        self.loader.preload()
+        for future in self.loader.futures:
+            future.result()
+        self.sheets.preload.assert_called_once()
+        self.assertTrue(self.textcache.preloadFont.call_args.args[0].endswith(".ttf"))
+        self.assertEqual(len(self.loader.mazecache.pending), 2)
+        self.assertTrue(self.loader.done)
+        self.assertIn("preloaded", self.loader.timeline)
+
+    def test_preload_selected_levels(self):
+        self.loader.preload(levels=[1])
+        self.assertEqual(len(self.loader.mazecache.pending), 1)
+
+    def test_milestones_are_marked_once(self):
+        self.loader.mark("window")
+        first = self.loader.timeline["window"]
+        self.loader.mark("window")
+        self.assertEqual(self.loader.timeline["window"], first)
+
+    def test_report_follows_startup_order(self):
+        for milestone in ("playable", "window", "first frame"):
+            self.loader.mark(milestone)
+        report = self.loader.report()
+        self.assertLess(report.index("window"), report.index("first frame"))
+        self.assertLess(report.index("first frame"), report.index("playable"))
+
+    def test_failed_preload_is_logged(self):
+        future = Future()
+        future.set_exception(OSError("missing"))
+        self.loader.futures = [future]
+        with self.assertLogs("CheeseChase", level="WARNING"):
+            self.loader.finished(future)
+        self.assertIn("preloaded", self.loader.timeline)
+
+
+class TestStartupTimeline(TempCacheMixin, unittest.TestCase):
+    environ = {"SDL_VIDEODRIVER": "dummy"}
+
+    def test_game_marks_window_first_frame_and_playable(self):
+        from CheeseChase.controller.game_controller import GameController
+        loader = AssetLoader()
+        self.addCleanup(loader.shutdown)
+        loader.preload()
+        seen = {}
+        def lifeSprites(lives):
+            seen.update(loader.timeline)
+            return MagicMock()
+        with patch("CheeseChase.controller.game_controller.LifeSprites", side_effect=lifeSprites):
+            game = GameController(assets=loader)
+        # READY is up before anything waits on the spritesheet
+        self.assertIn("first frame", seen)
+        # the suite runs without a real display mode
+        game.setBackground = MagicMock()
+        self.assertIs(game.mazecache, loader.mazecache)
+        self.assertEqual(set(loader.timeline) - {"preloaded"}, {"window", "first frame"})
+        game.startGame()
+        self.assertIn("playable", loader.timeline)
+        self.assertEqual(loader.mazecache.compiles + loader.mazecache.diskHits, 1)
@@ -0,0 +1,175 @@
+import unittest
+from collections import deque
+from unittest.mock import patch
+import numpy as np
+from CheeseChase.controller.game_controller import GameController
+from CheeseChase.batch import BatchEngine, BatchMaze
+from CheeseChase.batch.maze import LINKDIRECTIONS
+from CheeseChase.model.entity import Entity
+from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT, STOP, SCATTER, CHASE, FREIGHT, SPAWN
+from test.helpers import TempCacheMixin
+
+
+class BatchTestCase(TempCacheMixin, unittest.TestCase):
+
+    def startGame(self, level=0, controls=None):
+        game = GameController(headless=True, controls=controls)
+        game.level = level
+        game.startGame()
+        return game
+
+
+class TestBatchMaze(BatchTestCase):
+
+    def test_reads_graph_and_entities_from_a_started_game(self):
+        game = self.startGame()
+        maze = BatchMaze(game)
+        nodes = list(game.nodes.nodesLUT.values())
+        self.assertEqual(maze.positions.shape, (len(nodes), 2))
+        self.assertEqual(len(maze.cheesePoints), game.cheeses.numLeft)
+        self.assertEqual(maze.startDirections.tolist(), [LEFT, STOP, STOP, STOP, STOP])
+        portals = np.nonzero(maze.portals >= 0)[0]
+        self.assertEqual(len(portals), 2)
+        self.assertEqual(maze.portals[maze.portals[portals[0]]], portals[0])
+        # the home gate is closed to everyone going down at the start
+        self.assertEqual(maze.access[maze.homeNode, 1], 0)
+        self.assertEqual(maze.cheeseGrid[(maze.cheeseGrid >= 0)].size, len(maze.cheesePoints))
+
+
+class TestBatchEngine(BatchTestCase):
+
+    def setUp(self):
+        BatchTestCase.setUp(self)
+        self.maze = BatchMaze(self.startGame())
+        self.engine = BatchEngine(self.maze, 3, seed=0)
+
+    def test_step_moves_all_games_and_returns_rewards(self):
+        rewards, done = self.engine.step([LEFT, RIGHT, STOP])
+        self.assertEqual(rewards.shape, (3,))
+        self.assertFalse(done.any())
+        self.assertTrue((self.engine.position[:, 0, 0] < self.maze.startPositions[0, 0]).all())
+        self.assertEqual(self.engine.steps, 1)
+
+    def test_mouse_eats_cheese_and_scores(self):
+        # park each mouse next to a different cheese
+        for game, cheese in enumerate((0, 1, 2)):
+            self.engine.position[game, 0] = self.maze.cheesePositions[cheese] + (3, 0)
+            self.engine.direction[game, 0] = STOP
+        rewards, done = self.engine.step(STOP)
+        self.assertEqual(rewards.tolist(), self.maze.cheesePoints[:3].tolist())
+        self.assertEqual(self.engine.numEaten.tolist(), [1, 1, 1])
+        self.assertFalse(self.engine.cheeses[[0, 1, 2], [0, 1, 2]].any())
+
+    def test_power_cheese_frightens_cats(self):
+        power = np.nonzero(self.maze.cheesePower)[0][0]
+        self.engine.position[0, 0] = self.maze.cheesePositions[power]
+        self.engine.step(STOP)
+        self.assertEqual(self.engine.mode[0].tolist(), [FREIGHT] * 4)
+        self.assertEqual(self.engine.mode[1].tolist(), [SCATTER] * 4)
+
+    def test_catching_the_mouse_ends_the_game(self):
+        self.engine.position[1, 0] = self.engine.position[1, 1]
+        rewards, done = self.engine.step(STOP)
+        self.assertEqual(done.tolist(), [False, True, False])
+        self.assertFalse(self.engine.alive[1])
+        frozen = self.engine.position[1].copy()
+        self.engine.step(LEFT)
+        np.testing.assert_array_equal(self.engine.position[1], frozen)
+
+    def test_restart_selected_games(self):
+        for i in range(30):
+            self.engine.step(LEFT)
+        self.engine.restart(np.array([True, False, False]))
+        np.testing.assert_array_equal(self.engine.position[0], self.maze.startPositions)
+        self.assertFalse((self.engine.position[1] == self.maze.startPositions).all())
+
+    def test_same_seed_same_games(self):
+        other = BatchEngine(self.maze, 3, seed=0)
+        actions = np.random.default_rng(1).choice([UP, DOWN, LEFT, RIGHT], (300, 3))
+        for step in actions:
+            self.engine.step(step)
+            other.step(step)
+        np.testing.assert_array_equal(self.engine.position, other.position)
+        np.testing.assert_array_equal(self.engine.score, other.score)
+
+
+class TestBatchParity(BatchTestCase):
+    """The batch engine must replay the object model step for step."""
+
+    def firstHop(self, maze, start, goals):
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node in goals:
+                hop = None
+                while previous[node] is not None:
+                    node, hop = previous[node]
+                return hop
+            for j, direction in enumerate(LINKDIRECTIONS):
+                neighbor = maze.links[node, j]
+                if neighbor < 0 or not maze.access[node, j] & 1:
+                    continue
+                if maze.portals[neighbor] >= 0:
+                    neighbor = maze.portals[neighbor]
+                if neighbor not in previous:
+                    previous[neighbor] = (node, direction)
+                    queue.append(neighbor)
+        return None
+
+    def policy(self, engine, powerNodes, rng, game):
+        # head for power cheeses, then for frightened cats, with some noise
+        if rng.random() < 0.1:
+            return int(rng.choice([UP, DOWN, LEFT, RIGHT]))
+        goals = {engine.target[game, cat + 1] for cat in range(4) if engine.mode[game, cat] == FREIGHT}
+        if not goals:
+            goals = {node for cheese, node in powerNodes.items() if engine.cheeses[game, cheese]}
+        hop = self.firstHop(engine.maze, engine.target[game, 0], goals) if goals else None
+        if hop is None:
+            return int(rng.choice([UP, DOWN, LEFT, RIGHT]))
+        return int(hop)
+
+    def checkParity(self, level, n, seed):
+        actions = np.zeros(n, dtype=np.int64)
+        games = [self.startGame(level, controls=(lambda g=g: int(actions[g]))) for g in range(n)]
+        maze = BatchMaze(games[0])
+        engine = BatchEngine(maze, n, seed=seed, stepDt=games[0].stepDt)
+        slots = {id(cat): (g, c) for g, game in enumerate(games) for c, cat in enumerate(game.cats)}
+
+        def randomDirection(cat, directions):
+            g, c = slots[id(cat)]
+            return directions[int(engine.draws[g, c] * len(directions))]
+
+        powerNodes = {}
+        for cheese in np.nonzero(maze.cheesePower)[0]:
+            node = np.nonzero((maze.positions == maze.cheesePositions[cheese]).all(axis=1))[0]
+            if len(node):
+                powerNodes[cheese] = node[0]
+        rng = np.random.default_rng(seed)
+        modes = set()
+        with patch.object(Entity, "randomDirection", randomDirection):
+            while not engine.done.all():
+                for g in range(n):
+                    actions[g] = self.policy(engine, powerNodes, rng, g)
+                running = ~engine.done
+                engine.step(actions)
+                modes.update(engine.mode[running].ravel().tolist())
+                for g in np.nonzero(running)[0]:
+                    game = games[g]
+                    game.update()
+                    for slot, entity in enumerate([game.mouse] + list(game.cats)):
+                        self.assertEqual((entity.position.x, entity.position.y), tuple(engine.position[g, slot]))
+                        self.assertEqual(entity.direction, engine.direction[g, slot])
+                    self.assertEqual([cat.mode.current for cat in game.cats], engine.mode[g].tolist())
+                    self.assertEqual(game.score, engine.score[g])
+                    self.assertEqual(game.mouse.alive, engine.alive[g])
+                    self.assertEqual(game.pause.paused, engine.paused[g])
+                self.assertLess(engine.steps, 10000)
+        # the run went through every cat mode, so freight and spawn rules were compared too
+        self.assertEqual(modes, {SCATTER, CHASE, FREIGHT, SPAWN})
+
+    def test_parity_maze1(self):
+        self.checkParity(level=0, n=3, seed=5)
+
+    def test_parity_maze2(self):
+        self.checkParity(level=1, n=2, seed=3)
@@ -1,5 +1,6 @@
 import unittest
 from unittest.mock import MagicMock, patch
+import numpy as np
 from CheeseChase.model.cats import Cat, CatGroup
 from CheeseChase.model.constants import *
 
@@ -176,3 +177,97 @@ class TestCats(unittest.TestCase):
         for cat in group:
             cat.setSpawnNode.assert_called_once_with(node2)
 
+
+    def test_catgroup_usePaths_applies_to_all_cats(self, MockEntity, MockSprites, MockMode):
+        """Test usePaths() → every cat steers by the node group's path tables."""
+        group = CatGroup(self.node, self.mouse)
+        nodes = MagicMock()
+        group.usePaths(nodes)
+        for cat in group:
+            self.assertIs(cat.paths, nodes)
+
+
+@patch("CheeseChase.model.cats.CatSprites")
+class TestCatPaths(unittest.TestCase):
+    """Cats steering by shortest paths instead of straight-line distance."""
+
+    def setUp(self):
+        from CheeseChase.model.nodes import NodeGroup
+        # the crow flies towards the dead end on the right; the way round is down
+        self.data = np.array([
+            ['+', '.', '.', '.', '+'],
+            ['.', 'X', 'X', 'X', 'X'],
+            ['.', 'X', 'X', 'X', '+'],
+            ['.', 'X', 'X', 'X', '.'],
+            ['+', '.', '.', '.', '+'],
+        ])
+        with patch("CheeseChase.model.nodes.np.loadtxt", return_value=self.data):
+            self.nodes = NodeGroup("dummyfile.txt")
+        self.start = self.nodes.getNodeFromTiles(0, 0)
+        self.goal = self.nodes.getNodeFromTiles(4, 2)
+        self.mouse = MagicMock()
+        self.mouse.position = self.goal.position
+        self.mouse.target = self.goal
+
+    def chasingCat(self):
+        cat = Cat(self.start, self.mouse, name=CAT1)
+        cat.mode.current = CHASE
+        cat.chase()
+        return cat
+
+    def test_default_cats_keep_straight_line_goals(self, MockSprites):
+        cat = self.chasingCat()
+        self.assertIsNone(cat.paths)
+        self.assertEqual(cat.directionMethod([RIGHT, DOWN]), RIGHT)
+
+    def test_path_cats_take_the_way_round(self, MockSprites):
+        cat = self.chasingCat()
+        cat.usePaths(self.nodes)
+        self.assertEqual(cat.directionMethod([RIGHT, DOWN]), DOWN)
+        # reset keeps the cat on path tables
+        cat.reset()
+        cat.mode.current = CHASE
+        self.assertEqual(cat.directionMethod([RIGHT, DOWN]), DOWN)
+
+    def test_path_cats_fall_back_when_the_goal_is_out_of_reach(self, MockSprites):
+        cat = self.chasingCat()
+        cat.usePaths(self.nodes)
+        self.goal.neighbors[UP] = None
+        self.goal.neighbors[DOWN].neighbors[UP] = None
+        self.assertEqual(cat.directionMethod([RIGHT, DOWN]), RIGHT)
+
+    def test_scatter_heads_for_the_node_nearest_the_goal(self, MockSprites):
+        cat = self.chasingCat()
+        cat.usePaths(self.nodes)
+        cat.mode.current = SCATTER
+        cat.goal = self.goal.position + self.goal.position / 8
+        self.assertEqual(cat.directionMethod([RIGHT, DOWN]), DOWN)
+
+    def test_chase_uses_the_shared_distance_field(self, MockSprites):
+        cat = self.chasingCat()
+        field = MagicMock()
+        field.bestDirection.return_value = DOWN
+        cat.useDistanceField(field)
+        self.assertEqual(cat.directionMethod([RIGHT, DOWN]), DOWN)
+        field.bestDirection.assert_called_once_with(self.start, cat.direction, cat.name)
+        # the field only steers the chase, and gives way when it has no answer
+        field.bestDirection.return_value = None
+        self.assertEqual(cat.directionMethod([RIGHT, DOWN]), RIGHT)
+        cat.mode.current = SCATTER
+        field.bestDirection.reset_mock()
+        cat.directionMethod([RIGHT, DOWN])
+        field.bestDirection.assert_not_called()
+
+    def test_catgroup_updates_the_field_once_before_its_cats(self, MockSprites):
+        mouse = MagicMock()
+        group = CatGroup(self.start, mouse)
+        calls = []
+        field = MagicMock()
+        field.update.side_effect = lambda position: calls.append("field")
+        group.useDistanceField(field)
+        for cat in group:
+            self.assertIs(cat.field, field)
+            cat.update = MagicMock(side_effect=lambda dt: calls.append("cat"))
+        group.update(0.1)
+        field.update.assert_called_once_with(mouse.position)
+        self.assertEqual(calls, ["field", "cat", "cat", "cat", "cat"])
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 import numpy as np
 
-from CheeseChase.model.cheeses import Cheese, PowerCheese, CheeseGroup
+from CheeseChase.model.cheeses import Cheese, PowerCheese, CheeseGroup, CheeseTile
 from CheeseChase.model.constants import CHEESE, POWERCHEESE, TILEWIDTH, TILEHEIGHT
 
 class TestCheese(unittest.TestCase):
@@ -33,16 +33,14 @@ class TestCheese(unittest.TestCase):
         cheese = Cheese(self.row, self.col, self.mock_spritesheet)
         cheese.visible = True
         screen = MagicMock()
-        cheese.position.asTuple = MagicMock(return_value=(1,2))
         cheese.render(screen)
-        screen.blit.assert_called_once_with("img", (1,2))
+        screen.blit.assert_called_once_with("img", (self.col * TILEWIDTH, self.row * TILEHEIGHT))
 
     def test_cheese_render_if_not_visible(self):
         # If not visible, render should do nothing
         cheese = Cheese(self.row, self.col, self.mock_spritesheet)
         cheese.visible = False
         screen = MagicMock()
-        cheese.position.asTuple = MagicMock(return_value=(1,2))
         cheese.render(screen)
         screen.blit.assert_not_called()
 
@@ -91,19 +89,28 @@ class TestCheeseGroup(unittest.TestCase):
 
     def test_cheesegroup_initialization_and_createCheeseList(self):
         group = CheeseGroup("fake.txt", self.mock_spritesheet)
-        # Should create Cheese and PowerCheese objects according to cheese_map
-        # ('.' and '+' → Cheese, 'P' and 'p' → PowerCheese)
-        cheese_count = np.count_nonzero(np.isin(self.cheese_map, ['.', '+', 'P', 'p']))
+        # ('.' and '+' → plain cheese bits, 'P' and 'p' → power bits plus a PowerCheese)
+        expected = np.isin(self.cheese_map, ['.', '+', 'P', 'p'])
         power_count = np.count_nonzero(np.isin(self.cheese_map, ['P', 'p']))
-        self.assertEqual(len(group.cheeseList), cheese_count)
+        self.assertEqual((group.rows, group.cols), (3, 3))
+        self.assertTrue((group.present() == expected).all())
+        self.assertEqual(group.numLeft, np.count_nonzero(expected))
         self.assertEqual(len(group.powercheeses), power_count)
         self.assertEqual(group.spritesheet, self.mock_spritesheet)
         self.assertEqual(group.numEaten, 0)
-        # All cheeses should be Cheese or PowerCheese instances
-        for cheese in group.cheeseList:
-            self.assertTrue(isinstance(cheese, (Cheese, PowerCheese)))
         for power in group.powercheeses:
             self.assertIsInstance(power, PowerCheese)
+            self.assertTrue(group.isPower(power.row, power.column))
+
+    def test_cheesegroup_state_is_packed_bits(self):
+        group = CheeseGroup("fake.txt", self.mock_spritesheet)
+        # nine tiles fit in two bytes per grid
+        self.assertEqual(group.cheeses.nbytes, 2)
+        self.assertEqual(group.powers.nbytes, 2)
+        self.assertTrue(group.hasCheese(0, 0))
+        self.assertFalse(group.hasCheese(0, 2))
+        self.assertFalse(group.hasCheese(-1, 0))
+        self.assertFalse(group.hasCheese(0, 3))
 
     def test_cheesegroup_update_calls_update_on_powercheeses(self):
         # PowerCheese items should update each frame
@@ -117,18 +124,126 @@ class TestCheeseGroup(unittest.TestCase):
     def test_cheesegroup_isEmpty(self):
         # Empty only when no cheese left to collect
         group = CheeseGroup("fake.txt", self.mock_spritesheet)
-        group.cheeseList.clear()
-        self.assertTrue(group.isEmpty())
-        # Add one cheese, should be not empty
-        group.cheeseList.append(MagicMock())
         self.assertFalse(group.isEmpty())
+        group.numLeft = 0
+        self.assertTrue(group.isEmpty())
 
-    def test_cheesegroup_render_calls_render_on_all_cheeses(self):
-        # Render should call each cheese's render method
+    def test_cheesegroup_remaining_lists_cheeses_in_row_order(self):
         group = CheeseGroup("fake.txt", self.mock_spritesheet)
-        for cheese in group.cheeseList:
-            cheese.render = MagicMock()
-        screen = MagicMock()
-        group.render(screen)
-        for cheese in group.cheeseList:
-            cheese.render.assert_called_once_with(screen)
+        rows, cols, power = group.remaining()
+        self.assertEqual(list(zip(rows.tolist(), cols.tolist())),
+                         [(0, 0), (0, 1), (1, 0), (1, 1), (2, 0), (2, 1), (2, 2)])
+        self.assertEqual(power.tolist(), [False, False, True, True, False, False, False])
+
+    def test_cheesegroup_find_only_returns_cheeses_in_reach(self):
+        from CheeseChase.model.vector import Vector2
+        group = CheeseGroup("fake.txt", self.mock_spritesheet)
+        # standing on the power cheese at row 1, col 1
+        cheese = group.find(Vector2(16, 16), 5)
+        self.assertEqual((cheese.row, cheese.column), (1, 1))
+        self.assertEqual(cheese.name, POWERCHEESE)
+        self.assertEqual(cheese.points, 50)
+        # between two cheeses, the first in row order wins
+        cheese = group.find(Vector2(8, 32), 7)
+        self.assertEqual((cheese.row, cheese.column), (2, 0))
+        self.assertEqual(cheese.name, CHEESE)
+        self.assertEqual(cheese.points, 10)
+        # out in the empty tile
+        self.assertIsNone(group.find(Vector2(32, 16), 5))
+
+    def test_cheesegroup_find_matches_a_full_scan(self):
+        from CheeseChase.model.vector import Vector2
+        group = CheeseGroup("fake.txt", self.mock_spritesheet)
+        rows, cols, power = group.remaining()
+        for x in range(-8, 48, 3):
+            for y in range(-8, 48, 3):
+                position = Vector2(x, y)
+                reach = (5 + 2)**2
+                scanned = [(row, col) for row, col in zip(rows.tolist(), cols.tolist())
+                           if position.distanceSquaredTo(Vector2(col*TILEWIDTH, row*TILEHEIGHT)) <= reach]
+                cheese = group.find(position, 5)
+                if scanned:
+                    self.assertEqual((cheese.row, cheese.column), scanned[0])
+                else:
+                    self.assertIsNone(cheese)
+
+    def test_cheesegroup_removeCheese_clears_bits(self):
+        group = CheeseGroup("fake.txt", self.mock_spritesheet)
+        total = group.numLeft
+        group.removeCheese(CheeseTile(0, 1))
+        self.assertFalse(group.hasCheese(0, 1))
+        self.assertEqual(group.numLeft, total - 1)
+        # removing it twice changes nothing
+        group.removeCheese(CheeseTile(0, 1))
+        self.assertEqual(group.numLeft, total - 1)
+        power = group.powercheeses[0]
+        group.removeCheese(power)
+        self.assertNotIn(power, group.powercheeses)
+        self.assertFalse(group.hasCheese(power.row, power.column))
+        rows, cols, kinds = group.remaining()
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            group.removeCheese(CheeseTile(row, col))
+        self.assertTrue(group.isEmpty())
+        self.assertFalse(group.present().any())
+        self.assertEqual(group.powercheeses, [])
+
+
+class TestCheeseLayer(unittest.TestCase):
+    def setUp(self):
+        import pygame
+        self.image = pygame.Surface((TILEWIDTH, TILEHEIGHT))
+        self.image.fill((255, 0, 255))
+        self.image.fill((250, 200, 0), (6, 6, 4, 4))
+        self.image.set_colorkey((255, 0, 255))
+        self.spritesheet = MagicMock()
+        self.spritesheet.getImage.return_value = self.image
+        patcher = patch("CheeseChase.model.cheeses.np.loadtxt", return_value=np.array([
+            ['.', 'x', '.'],
+            ['x', 'P', 'x'],
+        ]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.screen = pygame.Surface((3*TILEWIDTH, 2*TILEHEIGHT))
+
+    def test_layer_is_built_once_on_first_render(self):
+        group = CheeseGroup("fake.txt", self.spritesheet)
+        self.assertIsNone(group.layer)
+        group.render(self.screen)
+        layer = group.layer
+        group.render(self.screen)
+        self.assertIs(group.layer, layer)
+        self.assertEqual(self.screen.get_at((8, 8))[:3], (250, 200, 0))
+        self.assertEqual(self.screen.get_at((2*TILEWIDTH + 8, 8))[:3], (250, 200, 0))
+        # transparent pixels leave the screen alone
+        self.assertEqual(self.screen.get_at((1, 1))[:3], (0, 0, 0))
+
+    def test_eating_erases_a_single_tile_of_the_layer(self):
+        group = CheeseGroup("fake.txt", self.spritesheet)
+        group.render(self.screen)
+        group.removeCheese(CheeseTile(0, 2))
+        self.screen.fill((0, 0, 0))
+        group.render(self.screen)
+        self.assertEqual(self.screen.get_at((8, 8))[:3], (250, 200, 0))
+        self.assertEqual(self.screen.get_at((2*TILEWIDTH + 8, 8))[:3], (0, 0, 0))
+        self.assertEqual(group.erased, [(0, 2)])
+
+    def test_render_with_area_only_draws_inside_it(self):
+        import pygame
+        group = CheeseGroup("fake.txt", self.spritesheet)
+        power = group.powercheeses[0]
+        power.render = MagicMock()
+        group.render(self.screen, [pygame.Rect(0, 0, 8, 16)])
+        self.assertEqual(self.screen.get_at((6, 6))[:3], (250, 200, 0))
+        self.assertEqual(self.screen.get_at((8, 8))[:3], (0, 0, 0))
+        self.assertEqual(self.screen.get_at((2*TILEWIDTH + 8, 8))[:3], (0, 0, 0))
+        power.render.assert_not_called()
+        group.render(self.screen, [pygame.Rect(TILEWIDTH, TILEHEIGHT, 4, 4)])
+        power.render.assert_called_once_with(self.screen)
+
+    def test_headless_groups_never_build_a_layer(self):
+        from CheeseChase.model.vector import Vector2
+        group = CheeseGroup("fake.txt", self.spritesheet)
+        group.removeCheese(group.find(Vector2(0, 0)))
+        self.assertIsNone(group.layer)
+        self.assertEqual(group.erased, [])
+        self.assertEqual(group.numLeft, 2)
@@ -1,8 +1,9 @@
 import unittest
 from unittest.mock import MagicMock, patch
 from CheeseChase.model.entity import Entity
-from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT, STOP, TILEWIDTH
+from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT, STOP, TILEWIDTH, TILEHEIGHT, CAT1, CAT2, CAT3
 from CheeseChase.model.vector import Vector2
+from CheeseChase.model.nodes import Node
 
 class TestEntity(unittest.TestCase):
 
@@ -96,18 +97,39 @@ class TestEntity(unittest.TestCase):
     # ------------------------------------------------------------
     def test_validDirection_returns_true_if_accessible(self):
         """validDirection() should return True when neighbor exists and direction is allowed."""
-        self.node.access[RIGHT] = [None]
-        self.node.neighbors[RIGHT] = MagicMock()
-        self.entity.name = None
-        result = self.entity.validDirection(RIGHT)
-        self.assertTrue(result)
+        start, end = Node(0, 0), Node(TILEWIDTH, 0)
+        start.neighbors[RIGHT] = end
+        entity = Entity(start)
+        entity.name = CAT1
+        self.assertTrue(entity.validDirection(RIGHT))
 
     def test_validDirection_returns_false_if_no_neighbor(self):
         """validDirection() should return False when no neighbor in that direction."""
-        self.node.access[RIGHT] = [None]
-        self.node.neighbors[RIGHT] = None
-        result = self.entity.validDirection(RIGHT)
-        self.assertFalse(result)
+        entity = Entity(Node(0, 0))
+        entity.name = CAT1
+        self.assertFalse(entity.validDirection(RIGHT))
+
+    def test_validDirection_returns_false_if_access_denied(self):
+        """validDirection() should return False when the node denies this entity's bit."""
+        start, end = Node(0, 0), Node(TILEWIDTH, 0)
+        start.neighbors[RIGHT] = end
+        entity = Entity(start)
+        entity.name = CAT1
+        start.denyAccess(RIGHT, entity)
+        self.assertFalse(entity.validDirection(RIGHT))
+        # other entity types keep their way through
+        entity.name = CAT2
+        self.assertTrue(entity.validDirection(RIGHT))
+        # an entity without a name has no access bit at all
+        entity.name = None
+        self.assertFalse(entity.validDirection(RIGHT))
+
+    def test_name_sets_access_bit(self):
+        """Setting name should look up the entity's node access bit once."""
+        self.entity.name = CAT3
+        self.assertEqual(self.entity.accessBit, 1 << CAT3)
+        self.entity.name = None
+        self.assertEqual(self.entity.accessBit, 0)
 
     # ------------------------------------------------------------
     # 7. goalDirection()
@@ -130,3 +152,100 @@ class TestEntity(unittest.TestCase):
         result = self.entity.randomDirection(directions)
         self.assertEqual(result, UP)
         mock_randint.assert_called_once()
+
+
+class TestEntityInterpolation(unittest.TestCase):
+
+    def setUp(self):
+        self.entity = Entity(Node(0, 0))
+
+    def test_renderPosition_without_saved_position(self):
+        self.entity.position = Vector2(5, 6)
+        self.assertEqual(self.entity.renderPosition(0.5), (5, 6))
+
+    def test_renderPosition_blends_last_and_current(self):
+        self.entity.position = Vector2(10, 20)
+        self.entity.savePosition()
+        saved = self.entity.lastPosition
+        self.entity.position.x = 14
+        self.assertEqual(self.entity.renderPosition(0.25), (11, 20))
+        self.assertEqual(self.entity.renderPosition(1.0), (14, 20))
+        # saving again reuses the same vector
+        self.entity.savePosition()
+        self.assertIs(self.entity.lastPosition, saved)
+        self.assertEqual(self.entity.lastPosition, Vector2(14, 20))
+
+    def test_renderPosition_snaps_across_portals(self):
+        self.entity.position = Vector2(0, 100)
+        self.entity.savePosition()
+        self.entity.position = Vector2(27 * TILEWIDTH, 100)
+        self.assertEqual(self.entity.renderPosition(0.5), (27 * TILEWIDTH, 100))
+
+    def test_setStartNode_forgets_last_position(self):
+        self.entity.savePosition()
+        self.entity.setStartNode(Node(32, 32))
+        self.assertIsNone(self.entity.lastPosition)
+
+    def test_render_blits_at_interpolated_position(self):
+        screen = MagicMock()
+        self.entity.image = MagicMock()
+        self.entity.position = Vector2(100, 100)
+        self.entity.savePosition()
+        self.entity.position.x = 102
+        self.entity.render(screen, 0.5)
+        screen.blit.assert_called_once_with(self.entity.image, (101 - TILEWIDTH/2, 100 - TILEHEIGHT/2))
+
+
+class TestEntityAllocations(unittest.TestCase):
+    """The per-frame movement path must not build temporary vectors."""
+
+    def setUp(self):
+        self.start = Node(0, 0)
+        self.end = Node(10 * TILEWIDTH, 0)
+        self.start.neighbors[RIGHT] = self.end
+        self.end.neighbors[LEFT] = self.start
+        self.entity = Entity(self.start)
+        self.entity.name = None
+        self.entity.direction = RIGHT
+        self.entity.target = self.end
+        self.entity.goal = Vector2(5 * TILEWIDTH, 0)
+
+    def countVectors(self, dt, frames=None):
+        created = [0]
+        init = Vector2.__init__
+
+        def counting(vector, x=0, y=0):
+            created[0] += 1
+            init(vector, x, y)
+
+        with patch.object(Vector2, "__init__", counting):
+            if frames is not None:
+                for i in range(frames):
+                    self.entity.update(dt)
+            else:
+                while self.entity.node is not self.end:
+                    self.entity.update(dt)
+        return created[0]
+
+    def test_update_between_nodes_allocates_no_vectors(self):
+        self.assertEqual(self.countVectors(0.01, frames=50), 0)
+        # the entity really moved, in place
+        self.assertGreater(self.entity.position.x, 0)
+
+    def test_update_reaching_a_node_only_copies_the_node_position(self):
+        self.assertEqual(self.countVectors(0.01), 1)
+        self.assertEqual(self.entity.position, self.end.position)
+        self.assertIsNot(self.entity.position, self.end.position)
+
+    def test_goalDirection_and_overshotTarget_allocate_no_vectors(self):
+        created = [0]
+        init = Vector2.__init__
+
+        def counting(vector, x=0, y=0):
+            created[0] += 1
+            init(vector, x, y)
+
+        with patch.object(Vector2, "__init__", counting):
+            self.entity.goalDirection([LEFT, RIGHT])
+            self.entity.overshotTarget()
+        self.assertEqual(created[0], 0)
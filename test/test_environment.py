@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from CheeseChase.controller.environment import GameEnv, ACTIONS
+from CheeseChase.model.cheeses import CheeseTile
+from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT, STOP, TILEWIDTH, TILEHEIGHT
+from CheeseChase.model.vector import Vector2
+from test.helpers import TempCacheMixin
+
+
+class TestGameEnv(TempCacheMixin, unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.env = GameEnv()
+
+    def test_reset_returns_observation_without_a_window(self):
+        with patch("CheeseChase.controller.game_controller.pygame.display.set_mode") as set_mode:
+            obs = self.env.reset(seed=0)
+        set_mode.assert_not_called()
+        self.assertEqual(obs["mouse"].shape, (3,))
+        self.assertEqual(obs["cats"].shape, (4, 4))
+        self.assertTrue(obs["cheeses"].all())
+        self.assertEqual(obs["lives"], 5)
+
+    def test_step_before_reset_raises(self):
+        with self.assertRaises(RuntimeError):
+            self.env.step(LEFT)
+
+    def test_unknown_action_raises(self):
+        self.env.reset(seed=0)
+        with self.assertRaises(ValueError):
+            self.env.step(42)
+
+    def test_frameskip_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            GameEnv(frameskip=0)
+
+    def test_action_drives_the_mouse(self):
+        self.env.reset(seed=0)
+        obs, reward, done, info = self.env.step(RIGHT)
+        # the mouse moves on its old heading, then turns around
+        self.assertEqual(obs["mouse"][2], RIGHT)
+        x = obs["mouse"][0]
+        obs, reward, done, info = self.env.step(RIGHT)
+        self.assertGreater(obs["mouse"][0], x)
+
+    def test_reward_is_score_delta(self):
+        self.env.reset(seed=0)
+        total = 0
+        for i in range(120):
+            obs, reward, done, info = self.env.step(LEFT)
+            total += reward
+        self.assertGreater(total, 0)
+        self.assertEqual(total, info["score"])
+        self.assertEqual(int((~obs["cheeses"]).sum()) * 10, total)
+
+    def test_frameskip_repeats_the_action(self):
+        env = GameEnv(frameskip=4)
+        env.reset(seed=0)
+        env.game.update = MagicMock()
+        env.step(UP)
+        self.assertEqual(env.game.update.call_count, 4)
+        self.assertEqual(env.frames, 4)
+        self.assertEqual(env.steps, 1)
+        self.assertEqual(env.controls(), UP)
+
+    def test_done_when_out_of_lives(self):
+        self.env.reset(seed=0)
+        self.env.game.lives = 1
+        done = False
+        steps = 0
+        while not done:
+            obs, reward, done, info = self.env.step(STOP)
+            steps += 1
+            self.assertLess(steps, 5000)
+        self.assertEqual(info["lives"], 0)
+        self.assertTrue(info["lifeLost"])
+        with self.assertRaises(RuntimeError):
+            self.env.step(STOP)
+
+    def test_done_when_level_cleared(self):
+        self.env.reset(seed=0)
+        cheeses = self.env.game.cheeses
+        rows, cols, power = cheeses.remaining()
+        for row, col in zip(rows[1:].tolist(), cols[1:].tolist()):
+            cheeses.removeCheese(CheeseTile(row, col))
+        self.env.game.mouse.position = Vector2(cols[0] * TILEWIDTH, rows[0] * TILEHEIGHT)
+        obs, reward, done, info = self.env.step(STOP)
+        self.assertTrue(done)
+        self.assertTrue(info["cleared"])
+        self.assertEqual(obs["cheeses"].sum(), 0)
+
+    def test_same_seed_same_episode(self):
+        actions = np.random.default_rng(0).choice([UP, DOWN, LEFT, RIGHT], 600)
+        runs = []
+        for i in range(2):
+            obs = self.env.reset(seed=3)
+            for action in actions:
+                obs, reward, done, info = self.env.step(int(action))
+                if done:
+                    break
+            runs.append((obs["mouse"].tolist(), obs["cats"].tolist(), info["score"]))
+        self.assertEqual(runs[0], runs[1])
+
+    def test_stepsPerSecond(self):
+        self.assertEqual(self.env.stepsPerSecond(), 0.0)
+        self.env.reset(seed=0)
+        for i in range(10):
+            self.env.step(LEFT)
+        self.assertGreater(self.env.stepsPerSecond(), 0)
@@ -49,6 +49,31 @@ class TestEventsManager(unittest.TestCase):
             self.em.checkEvents()
             mock_exit.assert_called_once()
 
+    def test_resumeIfWaiting_resumes_a_pause_waiting_for_space(self):
+        self.gc.pause.paused = True
+        self.gc.pause.pauseTime = None
+
+        def flip(playerPaused=False):
+            self.gc.pause.paused = False
+        self.gc.pause.setPause.side_effect = flip
+
+        self.em.resumeIfWaiting()
+
+        self.gc.pause.setPause.assert_called_once_with(playerPaused=True)
+        self.gc.textgroup.hideText.assert_called_once()
+        self.gc.showEntities.assert_called_once()
+
+    def test_resumeIfWaiting_leaves_timed_pauses_alone(self):
+        self.gc.pause.paused = True
+        self.gc.pause.pauseTime = 3
+        self.em.resumeIfWaiting()
+        self.gc.pause.setPause.assert_not_called()
+
+        self.gc.pause.paused = False
+        self.gc.pause.pauseTime = None
+        self.em.resumeIfWaiting()
+        self.gc.pause.setPause.assert_not_called()
+
     def test_checkEvents_space_key_unpaused_hides_text_and_shows_entities(self):
         # Simulate SPACE keydown when mouse is alive and pause is not active
         self.gc.mouse.alive = True
@@ -82,6 +107,20 @@ class TestEventsManager(unittest.TestCase):
         self.gc.textgroup.hideText.assert_not_called()
         self.gc.showEntities.assert_not_called()
 
+    def test_togglePause_tells_the_input_provider(self):
+        self.em.togglePause()
+        self.gc.controls.pauseToggled.assert_called_once()
+
+    def test_checkEvents_f3_toggles_profiler(self):
+        with patch("CheeseChase.controller.events_manager.KEYDOWN", new=1), \
+             patch("CheeseChase.controller.events_manager.K_F3", new=3), \
+             patch("CheeseChase.controller.events_manager.pygame.event.get",
+                   return_value=[SimpleNamespace(type=1, key=3)]):
+            self.em.checkEvents()
+
+        self.gc.profiler.toggle.assert_called_once()
+        self.gc.pause.setPause.assert_not_called()
+
     # ----------------------------------------------------------------------
     # checkCheeseEvents()
     # ----------------------------------------------------------------------
@@ -89,7 +128,6 @@ class TestEventsManager(unittest.TestCase):
         # Setup a power cheese eaten and board becomes empty
         cheese = SimpleNamespace(points=50, name="POWER")
         self.gc.mouse.eatCheeses.return_value = cheese
-        self.gc.cheeses.cheeseList = [cheese]
         self.gc.cheeses.numEaten = 0
         self.gc.cheeses.isEmpty.return_value = True
 
@@ -103,8 +141,9 @@ class TestEventsManager(unittest.TestCase):
         # Power mode for cats
         self.gc.cats.startFreight.assert_called_once()
 
-        # Cheese removed from list
-        self.assertEqual(self.gc.cheeses.cheeseList, [])
+        # The mouse looks in the cheese group, and the eaten one is removed
+        self.gc.mouse.eatCheeses.assert_called_once_with(self.gc.cheeses)
+        self.gc.cheeses.removeCheese.assert_called_once_with(cheese)
 
         # End-of-level flow
         self.assertTrue(self.gc.flashBG)
@@ -117,7 +156,6 @@ class TestEventsManager(unittest.TestCase):
     def test_checkCheeseEvents_threshold_30_allows_cat3_right_access(self):
         cheese = SimpleNamespace(points=10, name="NORMAL")
         self.gc.mouse.eatCheeses.return_value = cheese
-        self.gc.cheeses.cheeseList = [cheese]
         self.gc.cheeses.numEaten = 29
         self.gc.cheeses.isEmpty.return_value = False
 
@@ -135,7 +173,6 @@ class TestEventsManager(unittest.TestCase):
     def test_checkCheeseEvents_threshold_70_allows_cat4_left_access(self):
         cheese = SimpleNamespace(points=10, name="NORMAL")
         self.gc.mouse.eatCheeses.return_value = cheese
-        self.gc.cheeses.cheeseList = [cheese]
         self.gc.cheeses.numEaten = 69
         self.gc.cheeses.isEmpty.return_value = False
 
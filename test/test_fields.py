@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+
+from CheeseChase.model.fields import DistanceField
+from CheeseChase.model.vector import Vector2
+from CheeseChase.model.nodes import Node, NodeGroup
+from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT, STOP, CAT1, CAT2, TILEWIDTH, TILEHEIGHT
+from CheeseChase.controller.game_controller import GameController
+from test.helpers import TempCacheMixin
+
+def tile(col, row):
+    return Vector2(col * TILEWIDTH, row * TILEHEIGHT)
+
+class TestDistanceField(unittest.TestCase):
+    def setUp(self):
+        # a loop round a block of wall, with a dead end off the top right corner
+        self.data = np.array([
+            ['+', '.', '.', '.', '+', '.', 'n'],
+            ['.', 'X', 'X', 'X', '|', 'X', 'X'],
+            ['.', 'X', 'X', 'X', '.', 'X', 'X'],
+            ['+', '.', '.', '.', '+', 'X', 'X'],
+        ])
+        self.field = DistanceField(self.data)
+
+    def test_bfs_counts_steps_along_the_paths(self):
+        self.field.update(tile(0, 0))
+        self.assertEqual(self.field.distance(0, 0), 0)
+        self.assertEqual(self.field.distance(4, 0), 4)
+        self.assertEqual(self.field.distance(6, 0), 6)
+        self.assertEqual(self.field.distance(4, 3), 7)
+        # walls and tiles off the grid are out of reach
+        self.assertEqual(self.field.distance(1, 1), -1)
+        self.assertEqual(self.field.distance(-1, 0), -1)
+        self.assertEqual(self.field.distance(0, 4), -1)
+
+    def test_rebuilds_only_when_the_target_changes_tile(self):
+        self.field.update(tile(0, 0))
+        self.field.update(Vector2(5, 0))
+        self.assertEqual(self.field.builds, 1)
+        self.field.update(Vector2(9, 0))
+        self.assertEqual(self.field.builds, 2)
+        self.assertEqual(self.field.distance(0, 0), 1)
+
+    def test_portals_join_their_tiles(self):
+        field = DistanceField(self.data, {0: ((0, 0), (6, 0))})
+        field.update(tile(0, 0))
+        self.assertEqual(field.distance(6, 0), 1)
+        self.assertEqual(field.distance(4, 0), 3)
+
+    def fieldWithGraph(self):
+        with patch("CheeseChase.model.nodes.np.loadtxt", return_value=self.data):
+            nodes = NodeGroup("dummyfile.txt")
+        return nodes, DistanceField(self.data, (), nodes.graph)
+
+    def test_bestDirection_goes_round_the_wall(self):
+        nodes, field = self.fieldWithGraph()
+        corner = nodes.getNodeFromTiles(4, 0)
+        field.update(tile(2, 3))
+        self.assertEqual(field.bestDirection(corner, LEFT, CAT1), DOWN)
+        field.update(tile(0, 0))
+        self.assertEqual(field.bestDirection(corner, UP, CAT1), LEFT)
+
+    def test_bestDirection_never_turns_back(self):
+        nodes, field = self.fieldWithGraph()
+        field.update(tile(0, 0))
+        # arriving from the left, the way back is closest but not an option
+        self.assertEqual(field.bestDirection(nodes.getNodeFromTiles(4, 0), RIGHT, CAT1), DOWN)
+        # a dead end leaves no way but back, which the cat works out for itself
+        self.assertIsNone(field.bestDirection(nodes.getNodeFromTiles(6, 0), RIGHT, CAT1))
+
+    def test_bestDirection_follows_access_rights(self):
+        nodes, field = self.fieldWithGraph()
+        corner = nodes.getNodeFromTiles(4, 0)
+        field.update(tile(2, 3))
+        self.assertEqual(field.bestDirection(corner, LEFT, CAT1), DOWN)
+        corner.access[DOWN].remove(CAT1)
+        self.assertEqual(field.bestDirection(corner, LEFT, CAT1), LEFT)
+        self.assertEqual(field.bestDirection(corner, LEFT, CAT2), DOWN)
+
+    def test_bestDirection_from_a_node_off_the_tile_grid(self):
+        nodes, field = self.fieldWithGraph()
+        below = nodes.getNodeFromTiles(4, 3)
+        home = Node(4.5 * TILEWIDTH, 3 * TILEHEIGHT)
+        home.neighbors[LEFT] = below
+        below.neighbors[RIGHT] = home
+        field.update(tile(0, 3))
+        self.assertEqual(field.bestDirection(home, STOP, CAT1), LEFT)
+
+    def test_bestDirection_gives_up_without_a_graph_or_a_reachable_target(self):
+        nodes, field = self.fieldWithGraph()
+        field.update(tile(1, 1))
+        self.assertIsNone(field.bestDirection(nodes.getNodeFromTiles(0, 0), STOP, CAT1))
+        self.field.update(tile(0, 0))
+        self.assertIsNone(self.field.bestDirection(nodes.getNodeFromTiles(4, 0), STOP, CAT1))
+
+    def test_shipped_maze_is_one_connected_field(self):
+        from importlib import resources
+        from CheeseChase.model.mazedata import Maze1
+        path = resources.files("CheeseChase.resources") / "maze1.txt"
+        data = np.loadtxt(str(path), dtype='<U1')
+        maze = Maze1()
+        field = DistanceField(data, maze.portalPairs)
+        field.update(tile(*maze.mouseStart))
+        reached = np.array(field.distances).reshape(data.shape) >= 0
+        self.assertTrue((reached == np.array(field.walkable).reshape(data.shape)).all())
+        # the tunnel ends are one step apart
+        self.assertEqual(abs(field.distance(0, 17) - field.distance(27, 17)), 1)
+
+
+class TestDistanceFieldInGame(TempCacheMixin, unittest.TestCase):
+    def test_cat_starting_on_the_home_node_is_steered(self):
+        game = GameController(headless=True, pathfinding=True)
+        game.startGame()
+        cat = game.cats.cat1
+        # the home entrance sits half a tile off the grid, and cats may not go back in
+        self.assertNotEqual(cat.node.position.x % TILEWIDTH, 0)
+        game.cats.field.update(game.mouse.position)
+        self.assertIn(game.cats.field.bestDirection(cat.node, cat.direction, cat.name), (LEFT, RIGHT))
@@ -1,6 +1,15 @@
+import os
+import time
 import unittest
 from unittest.mock import MagicMock, patch
-from CheeseChase.controller.game_controller import GameController
+import numpy as np
+from CheeseChase.controller.game_controller import GameController, initPygame
+from CheeseChase.controller.inputs import InputProvider, KeyboardControls, CallableControls
+from CheeseChase.model.constants import UP
+from CheeseChase.model.nodes import NodeGraph
+from CheeseChase.view.sprites import sheets, HeadlessMazeSprites
+from CheeseChase.view.text import textcache
+from test.helpers import TempCacheMixin
 
 
 class TestGameController(unittest.TestCase):
@@ -12,6 +21,7 @@ class TestGameController(unittest.TestCase):
             "TextGroup": patch("CheeseChase.controller.game_controller.TextGroup", autospec=True),
             "LifeSprites": patch("CheeseChase.controller.game_controller.LifeSprites", autospec=True),
             "MazeData": patch("CheeseChase.controller.game_controller.MazeData", autospec=True),
+            "MazeCache": patch("CheeseChase.controller.game_controller.MazeCache", autospec=True),
             "EventsManager": patch("CheeseChase.controller.game_controller.EventsManager", autospec=True),
             "LevelManager": patch("CheeseChase.controller.game_controller.LevelManager", autospec=True),
             "GameView": patch("CheeseChase.controller.game_controller.GameView", autospec=True),
@@ -91,8 +101,15 @@ class TestGameController(unittest.TestCase):
         MockCheeseGroup.assert_called_once()
         MockCatGroup.assert_called_once_with(mock_nodes.getStartTempNode.return_value, self.controller.mouse)
 
+        # Compiled maze shared by sprites, nodes and cheeses
+        compiled = self.controller.mazecache.load.return_value
+        self.controller.mazecache.load.assert_called_once_with(unittest.mock.ANY, unittest.mock.ANY, mock_maze_obj.portalPairs)
+        self.assertIs(MockNodeGroup.call_args.args[1], compiled)
+        self.assertIs(MockCheeseGroup.call_args.args[2], compiled)
+        self.assertIs(MockMazeSprites.call_args.args[2], compiled)
+
         # MazeData object logic
-        mock_maze_obj.setPortalPairs.assert_called_once_with(mock_nodes)
+        mock_maze_obj.setPortalPairs.assert_not_called()
         mock_maze_obj.connectHomeNodes.assert_called_once_with(mock_nodes)
 
         # Cats setup
@@ -181,6 +198,40 @@ class TestGameController(unittest.TestCase):
         self.controller.update()
         self.assertTrue(called["done"])
 
+    # ----------------------------------------------------------------------
+    # fixed timestep
+    # ----------------------------------------------------------------------
+
+    def test_update_steps_at_fixed_rate_and_carries_remainder(self):
+        """A 30ms frame is one 1/60s step; the rest carries into the next frame."""
+        self.controller.update()
+        self.controller.cats.update.assert_called_once_with(self.controller.stepDt)
+        self.assertAlmostEqual(self.controller.accumulator, 0.030 - self.controller.stepDt)
+        alpha = self.controller.view.render.call_args.args[0]
+        self.assertAlmostEqual(alpha, (0.030 - self.controller.stepDt) / self.controller.stepDt)
+        self.controller.update()
+        self.assertEqual(self.controller.cats.update.call_count, 3)
+
+    def test_update_renders_without_stepping_on_short_frames(self):
+        self.controller.clock.tick.return_value = 5
+        self.controller.update()
+        self.controller.cats.update.assert_not_called()
+        self.controller.view.render.assert_called_once()
+
+    def test_update_caps_catch_up_steps(self):
+        """A very slow frame runs at most maxSteps and drops the backlog."""
+        self.controller.clock.tick.return_value = 1000
+        self.controller.update()
+        self.assertEqual(self.controller.cats.update.call_count, self.controller.maxSteps)
+        self.assertLess(self.controller.accumulator, self.controller.stepDt)
+        self.assertAlmostEqual(self.controller.droppedTime + self.controller.accumulator,
+                               1.0 - self.controller.maxSteps * self.controller.stepDt)
+
+    def test_step_saves_positions_for_interpolation(self):
+        self.controller.step(self.controller.stepDt)
+        self.controller.mouse.savePosition.assert_called_once()
+        self.controller.cats.savePositions.assert_called_once()
+
     # ----------------------------------------------------------------------
     # showEntities() / hideEntities()
     # ----------------------------------------------------------------------
@@ -210,3 +261,224 @@ class TestGameController(unittest.TestCase):
         self.controller.updateScore(200)
         self.assertEqual(self.controller.score, 200)
         self.controller.textgroup.updateScore.assert_called_once_with(200)
+
+    # ----------------------------------------------------------------------
+    # profiling
+    # ----------------------------------------------------------------------
+
+    def test_update_records_nothing_while_profiler_is_off(self):
+        self.controller.update()
+        self.assertFalse(self.controller.profiler.enabled)
+        self.assertEqual(self.controller.profiler.samples, {})
+
+    def test_update_times_each_phase_when_profiling(self):
+        self.controller.profiler.toggle()
+        self.controller.update()
+        samples = self.controller.profiler.samples
+        self.assertEqual(set(samples), {"input", "text", "cheeses", "cats", "collisions", "mouse",
+                                        "flash", "pause", "events", "render", "sleep", "frame"})
+        self.assertEqual(len(samples["cats"]), 1)
+        self.assertEqual(len(samples["frame"]), 1)
+
+    def test_phases_share_the_frame_window_and_add_up(self):
+        self.controller.profiler.toggle()
+        self.controller.controls = MagicMock(spec=InputProvider)
+        self.controller.controls.poll.side_effect = lambda: time.sleep(0.01)
+        self.controller.update()
+        self.controller.pause.paused = True
+        self.controller.update()
+        samples = self.controller.profiler.samples
+        self.assertEqual({len(values) for values in samples.values()}, {2})
+        # skipped phases count as 0 for the frame they were skipped in
+        self.assertEqual(samples["cats"][1], 0)
+        # polling the input is charged to a phase of its own
+        self.assertGreaterEqual(samples["input"][0], 10 * 10**6)
+        for i in range(2):
+            parts = sum(values[i] for phase, values in samples.items() if phase not in ("sleep", "frame"))
+            self.assertLessEqual(parts, samples["frame"][i])
+
+    def test_frame_time_leaves_out_the_frame_cap(self):
+        self.controller.profiler.toggle()
+        self.controller.clock.tick.side_effect = lambda fps: time.sleep(0.05) or 30
+        self.controller.update()
+        samples = self.controller.profiler.samples
+        self.assertGreaterEqual(samples["sleep"][0], 50 * 10**6)
+        self.assertLess(samples["frame"][0], samples["sleep"][0])
+
+    def test_paused_steps_skip_cat_and_collision_phases(self):
+        self.controller.profiler.toggle()
+        self.controller.pause.paused = True
+        self.controller.update()
+        samples = self.controller.profiler.samples
+        self.assertEqual(list(samples["cats"]), [0])
+        self.assertEqual(list(samples["collisions"]), [0])
+        self.assertGreater(samples["mouse"][0], 0)
+
+    # ----------------------------------------------------------------------
+    # input providers
+    # ----------------------------------------------------------------------
+
+    def test_controls_default_to_the_keyboard(self):
+        self.assertIsInstance(self.controller.controls, KeyboardControls)
+
+    def test_plain_callables_are_wrapped(self):
+        controller = GameController(controls=lambda: UP)
+        self.assertIsInstance(controller.controls, CallableControls)
+        self.assertEqual(controller.controls(), UP)
+
+    def test_provider_is_attached_polled_per_frame_and_told_of_each_step(self):
+        provider = MagicMock(spec=InputProvider)
+        controller = GameController(controls=provider)
+        provider.attach.assert_called_once_with(controller)
+        for name in ("mouse", "cats", "cheeses", "textgroup", "events_manager", "view", "pause", "clock"):
+            setattr(controller, name, getattr(self.controller, name))
+        self.controller.clock.tick.return_value = 50  # three steps in one frame
+        controller.update()
+        provider.poll.assert_called_once_with()
+        self.assertEqual(provider.endStep.call_count, 3)
+
+    def test_profile_window_is_configurable(self):
+        controller = GameController(profile=True, profileWindow=5)
+        self.assertTrue(controller.profiler.enabled)
+        self.assertEqual(controller.profiler.window, 5)
+
+
+class TestGameControllerHeadless(unittest.TestCase):
+
+    def setUp(self):
+        patchers = {
+            "TextGroup": patch("CheeseChase.controller.game_controller.TextGroup", autospec=True),
+            "LifeSprites": patch("CheeseChase.controller.game_controller.LifeSprites", autospec=True),
+            "MazeData": patch("CheeseChase.controller.game_controller.MazeData", autospec=True),
+            "MazeCache": patch("CheeseChase.controller.game_controller.MazeCache", autospec=True),
+            "EventsManager": patch("CheeseChase.controller.game_controller.EventsManager", autospec=True),
+            "LevelManager": patch("CheeseChase.controller.game_controller.LevelManager", autospec=True),
+            "GameView": patch("CheeseChase.controller.game_controller.GameView", autospec=True),
+            "set_mode": patch("CheeseChase.controller.game_controller.pygame.display.set_mode"),
+        }
+        self.patches = {name: p.start() for name, p in patchers.items()}
+        self.addCleanup(lambda: [p.stop() for p in patchers.values()])
+        self.controls = MagicMock(spec=InputProvider)
+        self.controller = GameController(headless=True, stepDt=0.01, controls=self.controls)
+
+        self.controller.mouse = MagicMock(alive=True)
+        self.controller.cats = MagicMock()
+        self.controller.cheeses = MagicMock()
+        self.controller.textgroup = MagicMock()
+        self.controller.clock = MagicMock()
+
+    def test_no_window_and_starts_unpaused(self):
+        self.patches["set_mode"].assert_not_called()
+        self.assertIsNone(self.controller.screen)
+        self.assertFalse(self.controller.pause.paused)
+
+    def test_update_uses_fixed_dt_without_frame_cap_or_rendering(self):
+        self.controller.update()
+        self.controller.clock.tick.assert_not_called()
+        self.controller.mouse.update.assert_called_once_with(0.01)
+        self.controller.cats.update.assert_called_once_with(0.01)
+        self.controller.view.render.assert_not_called()
+        self.controller.events_manager.checkEvents.assert_not_called()
+        self.controller.events_manager.resumeIfWaiting.assert_called_once()
+
+    @patch("CheeseChase.controller.game_controller.MazeSprites", autospec=True)
+    @patch("CheeseChase.controller.game_controller.CatGroup", autospec=True)
+    @patch("CheeseChase.controller.game_controller.CheeseGroup", autospec=True)
+    @patch("CheeseChase.controller.game_controller.Mouse", autospec=True)
+    @patch("CheeseChase.controller.game_controller.NodeGroup", autospec=True)
+    def test_startGame_skips_background_and_wires_controls(self, MockNodeGroup, MockMouse, MockCheeseGroup,
+                                                             MockCatGroup, MockMazeSprites):
+        MockCatGroup.return_value = MagicMock()
+        self.controller.mazedata.obj = MagicMock()
+        self.controller.mazedata.obj.name = "test_maze"
+        self.controller.mazedata.obj.mouseStart = (1, 1)
+        self.controller.mazedata.obj.addOffset.side_effect = lambda x, y: (x, y)
+        self.controller.setBackground = MagicMock()
+
+        self.controller.startGame()
+
+        self.controller.setBackground.assert_not_called()
+        self.assertIs(MockMouse.return_value.controls, self.controls)
+
+    @patch("CheeseChase.controller.game_controller.MazeSprites", autospec=True)
+    @patch("CheeseChase.controller.game_controller.CatGroup", autospec=True)
+    @patch("CheeseChase.controller.game_controller.CheeseGroup", autospec=True)
+    @patch("CheeseChase.controller.game_controller.Mouse", autospec=True)
+    @patch("CheeseChase.controller.game_controller.NodeGroup", autospec=True)
+    def test_startGame_puts_cats_on_path_tables_when_asked(self, MockNodeGroup, MockMouse, MockCheeseGroup,
+                                                          MockCatGroup, MockMazeSprites):
+        MockCatGroup.return_value = MagicMock()
+        self.controller.mazedata.obj = MagicMock()
+        self.controller.mazedata.obj.name = "test_maze"
+        self.controller.mazedata.obj.mouseStart = (1, 1)
+        self.controller.mazedata.obj.addOffset.side_effect = lambda x, y: (x, y)
+
+        self.controller.mazedata.obj.portalPairs = {}
+        self.controller.mazecache.load.return_value.data = np.array([['+', '.', '+']])
+        MockNodeGroup.return_value.graph = NodeGraph()
+
+        self.controller.startGame()
+        MockCatGroup.return_value.usePaths.assert_not_called()
+
+        self.controller.pathfinding = True
+        self.controller.startGame()
+        MockCatGroup.return_value.usePaths.assert_called_once_with(MockNodeGroup.return_value)
+        MockCatGroup.return_value.useDistanceField.assert_called_once()
+        field = MockCatGroup.return_value.useDistanceField.call_args.args[0]
+        self.assertEqual((field.rows, field.cols), (1, 3))
+        self.assertIs(field.graph, MockNodeGroup.return_value.graph)
+
+
+class TestHeadlessViewObjects(TempCacheMixin, unittest.TestCase):
+
+    @patch("CheeseChase.view.text.textcache.getLabel", wraps=textcache.getLabel)
+    @patch("CheeseChase.view.text.textcache.getFont", wraps=textcache.getFont)
+    @patch("CheeseChase.view.sprites.sheets.getSheet", wraps=sheets.getSheet)
+    def test_headless_games_never_load_the_font_or_the_spritesheet_for_the_view(self, getSheet, getFont, getLabel):
+        controller = GameController(headless=True)
+        getSheet.assert_not_called()
+        controller.startGame()
+        for _ in range(120):
+            controller.update()
+        getFont.assert_not_called()
+        getLabel.assert_not_called()
+        self.assertIsNone(controller.background)
+        self.assertIsInstance(controller.mazesprites, HeadlessMazeSprites)
+        self.assertEqual(len(controller.lifesprites.images), controller.lives)
+
+
+class TestInitPygame(unittest.TestCase):
+
+    def setUp(self):
+        patchers = [patch("CheeseChase.controller.game_controller.pygame.init"),
+                    patch("CheeseChase.controller.game_controller.pygame.display")]
+        self.init, self.display = [p.start() for p in patchers]
+        self.addCleanup(lambda: [p.stop() for p in patchers])
+        self.drivers = []
+        self.init.side_effect = lambda: self.drivers.append(os.environ.get("SDL_VIDEODRIVER"))
+
+    def test_headless_uses_the_dummy_driver_only_during_init(self):
+        with patch.dict(os.environ, {"SDL_VIDEODRIVER": "x11"}):
+            initPygame(True)
+            self.assertEqual(os.environ["SDL_VIDEODRIVER"], "x11")
+        with patch.dict(os.environ):
+            os.environ.pop("SDL_VIDEODRIVER", None)
+            initPygame(True)
+            self.assertNotIn("SDL_VIDEODRIVER", os.environ)
+        self.assertEqual(self.drivers, ["dummy", "dummy"])
+
+    def test_window_after_a_headless_game_gets_a_real_display(self):
+        self.display.get_init.return_value = True
+        self.display.get_driver.return_value = "dummy"
+        with patch.dict(os.environ):
+            os.environ.pop("SDL_VIDEODRIVER", None)
+            initPygame(False)
+        self.display.quit.assert_called_once_with()
+        self.init.assert_called_once_with()
+
+    def test_window_keeps_a_dummy_driver_it_asked_for(self):
+        self.display.get_init.return_value = True
+        self.display.get_driver.return_value = "dummy"
+        with patch.dict(os.environ, {"SDL_VIDEODRIVER": "dummy"}):
+            initPygame(False)
+        self.display.quit.assert_not_called()
@@ -1,7 +1,15 @@
+import itertools
+import random
 import unittest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
+import pygame
 from CheeseChase.view.game_view import GameView
-from CheeseChase.model.constants import SCREENHEIGHT
+from CheeseChase.model.vector import Vector2
+from CheeseChase.model.constants import SCREENHEIGHT, SCREENWIDTH, SCREENSIZE, WHITE
+from CheeseChase.controller.game_controller import GameController
+from CheeseChase.controller.inputs import RandomControls
+from test.helpers import TempCacheMixin
 
 class TestGameView(unittest.TestCase):
     def setUp(self):
@@ -33,8 +41,8 @@ class TestGameView(unittest.TestCase):
         self.screen.blit.assert_any_call(self.mock_controller.background, (0, 0))
         # Components
         self.mock_controller.cheeses.render.assert_called_once_with(self.screen)
-        self.mock_controller.mouse.render.assert_called_once_with(self.screen)
-        self.mock_controller.cats.render.assert_called_once_with(self.screen)
+        self.mock_controller.mouse.render.assert_called_once_with(self.screen, 1.0)
+        self.mock_controller.cats.render.assert_called_once_with(self.screen, 1.0)
         self.mock_controller.textgroup.render.assert_called_once_with(self.screen)
         # Lifesprites blit
         calls = [
@@ -45,3 +53,133 @@ class TestGameView(unittest.TestCase):
         self.screen.blit.assert_any_call(*calls[1][0])
         # Display update called
         mock_update.assert_called_once()
+
+    @patch("CheeseChase.view.game_view.pygame.display.update")
+    def test_render_passes_interpolation_factor_to_entities(self, mock_update):
+        self.view.render(0.25)
+        self.mock_controller.mouse.render.assert_called_once_with(self.screen, 0.25)
+        self.mock_controller.cats.render.assert_called_once_with(self.screen, 0.25)
+
+
+class TestGameViewDirtyRects(unittest.TestCase):
+    def setUp(self):
+        # Real surfaces so that rects and pixels can be checked
+        self.controller = MagicMock()
+        self.controller.screen = pygame.Surface(SCREENSIZE)
+        self.controller.background = pygame.Surface(SCREENSIZE)
+        self.controller.background.fill((0, 0, 255))
+        self.controller.lifesprites.images = []
+        self.controller.cheeses.powercheeses = []
+        self.controller.textgroup.alltext = {}
+        image = pygame.Surface((32, 32))
+        image.fill((255, 255, 0))
+        self.mouse = SimpleNamespace(position=Vector2(100, 100), image=image, radius=10)
+        self.mouse.renderPosition = lambda alpha: self.mouse.position.asTuple()
+        self.mouse.render = lambda screen, alpha: screen.blit(self.mouse.image, (self.mouse.position.x - 8, self.mouse.position.y - 8))
+        self.controller.mouse = self.mouse
+        self.controller.cats = MagicMock()
+        self.controller.cats.__iter__.side_effect = lambda: iter([])
+        self.view = GameView(self.controller, dirtyRects=True)
+
+    @patch("CheeseChase.view.game_view.pygame.display.update")
+    def test_first_frame_is_a_full_update(self, mock_update):
+        self.view.render()
+        mock_update.assert_called_once_with()
+        self.assertEqual(self.view.pixelsPushed, SCREENWIDTH * SCREENHEIGHT)
+
+    @patch("CheeseChase.view.game_view.pygame.display.update")
+    def test_moving_entity_updates_only_its_region(self, mock_update):
+        self.view.render()
+        mock_update.reset_mock()
+        self.mouse.position = Vector2(104, 100)
+        self.view.render()
+        rects = mock_update.call_args.args[0]
+        # old and new positions overlap, so a single merged rect is pushed
+        self.assertEqual(len(rects), 1)
+        self.assertTrue(rects[0].contains(pygame.Rect(91, 91, 38, 34)))
+        self.assertLess(self.view.pixelsPushed, 40 * 40)
+        # old position restored from background, new one drawn
+        self.assertEqual(self.controller.screen.get_at((92, 100))[:3], (0, 0, 255))
+        self.assertEqual(self.controller.screen.get_at((127, 100))[:3], (255, 255, 0))
+        self.controller.cheeses.render.assert_called_with(self.controller.screen, rects)
+
+    @patch("CheeseChase.view.game_view.pygame.display.update")
+    def test_dirty_region_follows_interpolated_position(self, mock_update):
+        self.mouse.renderPosition = MagicMock(return_value=(100, 100))
+        self.view.render(0.5)
+        self.mouse.renderPosition.assert_called_with(0.5)
+        self.mouse.renderPosition.return_value = (300, 300)
+        self.view.render(0.5)
+        rects = mock_update.call_args.args[0]
+        self.assertTrue(any(rect.collidepoint(300, 300) for rect in rects))
+        self.assertTrue(any(rect.collidepoint(100, 100) for rect in rects))
+
+    @patch("CheeseChase.view.game_view.pygame.display.update")
+    def test_eaten_tiles_are_restored(self, mock_update):
+        self.view.render()
+        self.controller.cheeses.erased = [(23, 17)]
+        self.view.render()
+        self.assertIn(pygame.Rect(17 * 16, 23 * 16, 16, 16), mock_update.call_args.args[0])
+        self.assertEqual(self.controller.cheeses.erased, [])
+
+    @patch("CheeseChase.view.game_view.pygame.display.update")
+    def test_changed_text_is_redrawn(self, mock_update):
+        text = SimpleNamespace(position=Vector2(0, 16), label=pygame.Surface((128, 16)), text="00000000", visible=True)
+        text.render = MagicMock()
+        self.controller.textgroup.alltext = {0: text}
+        self.view.render()
+        text.render.reset_mock()
+        self.view.render()
+        # unchanged text away from entities is left alone
+        text.render.assert_not_called()
+        text.text = "00000010"
+        self.view.render()
+        text.render.assert_called_once_with(self.controller.screen)
+        self.assertIn(pygame.Rect(0, 16, 128, 16), mock_update.call_args.args[0])
+
+    @patch("CheeseChase.view.game_view.pygame.display.update")
+    def test_background_change_forces_full_update(self, mock_update):
+        self.view.render()
+        self.view.render()
+        self.controller.background = pygame.Surface(SCREENSIZE)
+        mock_update.reset_mock()
+        self.view.render()
+        mock_update.assert_called_once_with()
+        self.assertEqual(self.view.frames, 3)
+        self.assertEqual(self.view.pixelsPushed, SCREENWIDTH * SCREENHEIGHT)
+
+
+class TestDirtyRectsMatchFullRedraw(TempCacheMixin, unittest.TestCase):
+    def plainBackground(self, game):
+        # setBackground without convert(), the suite has no display mode
+        game.background_norm = pygame.Surface(SCREENSIZE)
+        game.background_norm.fill(WHITE)
+        game.background_flash = pygame.Surface(SCREENSIZE)
+        game.background_flash.fill(WHITE)
+        game.background_norm = game.mazesprites.constructBackground(game.background_norm, game.level % 5)
+        game.background_flash = game.mazesprites.constructBackground(game.background_flash, 5)
+        game.flashBG = False
+        game.background = game.background_norm
+
+    def test_uneven_frames_leave_no_stale_pixels(self):
+        random.seed(0)
+        with patch.object(GameController, "setBackground", lambda game: self.plainBackground(game)):
+            game = GameController(dirtyRects=True, controls=RandomControls(4))
+            game.startGame()
+        game.screen = pygame.Surface(SCREENSIZE)
+        ticks = itertools.cycle((33, 17, 40, 25, 120))
+        game.clock = SimpleNamespace(tick=lambda fps: next(ticks))
+        reference = pygame.Surface(SCREENSIZE)
+        game.events_manager.togglePause()
+        eaten = game.cheeses.numLeft
+        for frame in range(400):
+            if frame == 10:
+                game.events_manager.togglePause()
+                game.events_manager.togglePause()
+            game.update()
+            real, game.screen = game.screen, reference
+            game.view.renderFull(game.accumulator / game.stepDt)
+            game.screen = real
+            self.assertTrue(pygame.image.tostring(reference, "RGB") == pygame.image.tostring(real, "RGB"),
+                            "frame %d differs from a full redraw" % frame)
+        self.assertLess(game.cheeses.numLeft, eaten)
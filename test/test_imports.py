@@ -0,0 +1,38 @@
+import subprocess
+import sys
+import unittest
+
+MODELONLY = ("CheeseChase.model.constants", "CheeseChase.model.vector", "CheeseChase.model.nodes",
+             "CheeseChase.model.fields", "CheeseChase.model.mazecache", "CheeseChase.model.mazedata",
+             "CheeseChase.model.modes", "CheeseChase.model.entity", "CheeseChase.model.cheeses")
+
+
+def loadedAfter(*modules):
+    # a fresh interpreter, so earlier tests' imports don't count
+    code = ("import logging, sys\n" + "".join("import %s\n" % m for m in modules) +
+            "print(sorted(m for m in ('pygame', 'numpy', 'CheeseChase.view.sprites') if m in sys.modules))\n"
+            "print(len(logging.getLogger().handlers))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    modules, handlers = out.split("\n")[:2]
+    return eval(modules), int(handlers)
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_package_import_loads_nothing_heavy(self):
+        self.assertEqual(loadedAfter("CheeseChase"), ([], 0))
+
+    def test_model_subset_runs_without_pygame(self):
+        modules, handlers = loadedAfter(*MODELONLY)
+        self.assertNotIn("pygame", modules)
+        self.assertNotIn("CheeseChase.view.sprites", modules)
+
+    def test_batch_loads_pygame_only_with_a_maze(self):
+        self.assertNotIn("pygame", loadedAfter("CheeseChase.batch")[0])
+
+    def test_game_controller_is_loaded_on_demand(self):
+        import CheeseChase
+        from CheeseChase.controller.game_controller import GameController
+        self.assertIs(CheeseChase.GameController, GameController)
+        with self.assertRaises(AttributeError):
+            CheeseChase.NotThere
@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from CheeseChase.controller.inputs import (ScriptedControls, RandomControls, KeyboardControls, PolicyControls,
+                                           SharedControls, CallableControls, InputProvider, asProvider, DIRECTIONS)
+from pygame.locals import K_UP, K_DOWN, K_LEFT, K_RIGHT
+from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT, STOP
+
+
+class TestScriptedControls(unittest.TestCase):
+
+    def test_holds_each_direction_for_its_frames_and_loops(self):
+        controls = ScriptedControls([(2, UP), (1, LEFT)])
+        self.assertEqual([controls() for i in range(6)], [UP, UP, LEFT, UP, UP, LEFT])
+
+    def test_returns_stop_once_a_non_looping_script_ends(self):
+        controls = ScriptedControls([(1, RIGHT), (0, UP), (1, DOWN)], loop=False)
+        self.assertEqual([controls() for i in range(4)], [RIGHT, DOWN, STOP, STOP])
+
+    def test_empty_script(self):
+        self.assertEqual(ScriptedControls([])(), STOP)
+
+
+class TestRandomControls(unittest.TestCase):
+
+    def test_same_seed_same_inputs(self):
+        a = RandomControls(seed=7, hold=3)
+        b = RandomControls(seed=7, hold=3)
+        self.assertEqual([a() for i in range(60)], [b() for i in range(60)])
+
+    def test_holds_direction(self):
+        controls = RandomControls(seed=1, hold=4)
+        inputs = [controls() for i in range(8)]
+        self.assertEqual(len(set(inputs[:4])), 1)
+        self.assertEqual(len(set(inputs[4:])), 1)
+        self.assertIn(inputs[0], DIRECTIONS)
+
+
+class TestKeyboardControls(unittest.TestCase):
+
+    def pressed(self, *keys):
+        state = {key: False for key in (K_UP, K_DOWN, K_LEFT, K_RIGHT)}
+        state.update({key: True for key in keys})
+        return patch("CheeseChase.controller.inputs.pygame.key.get_pressed", return_value=state)
+
+    def test_reads_arrow_keys(self):
+        for key, direction in ((K_UP, UP), (K_DOWN, DOWN), (K_LEFT, LEFT), (K_RIGHT, RIGHT)):
+            with self.pressed(key):
+                controls = KeyboardControls()
+                controls.poll()
+                self.assertEqual(controls(), direction)
+
+    def test_up_wins_over_other_keys_and_nothing_is_stop(self):
+        controls = KeyboardControls()
+        with self.pressed(K_UP, K_LEFT):
+            controls.poll()
+        self.assertEqual(controls(), UP)
+        with self.pressed():
+            controls.poll()
+        self.assertEqual(controls(), STOP)
+
+    def test_keys_are_read_once_per_poll(self):
+        controls = KeyboardControls()
+        with self.pressed(K_DOWN) as get_pressed:
+            controls.poll()
+            for i in range(5):
+                self.assertEqual(controls(), DOWN)
+        get_pressed.assert_called_once_with()
+
+
+class TestProviders(unittest.TestCase):
+
+    def test_asProvider(self):
+        self.assertIsInstance(asProvider(None), KeyboardControls)
+        scripted = ScriptedControls([(1, UP)])
+        self.assertIs(asProvider(scripted), scripted)
+        wrapped = asProvider(lambda: LEFT)
+        self.assertIsInstance(wrapped, CallableControls)
+        self.assertEqual(wrapped(), LEFT)
+
+    def test_base_provider_hooks_do_nothing(self):
+        provider = InputProvider()
+        provider.attach(MagicMock())
+        provider.poll()
+        provider.endStep()
+        provider.pauseToggled()
+        self.assertEqual(provider(), STOP)
+
+    def test_policy_is_asked_with_the_game(self):
+        game = MagicMock()
+        policy = MagicMock(return_value=RIGHT)
+        controls = PolicyControls(policy)
+        controls.attach(game)
+        self.assertEqual(controls(), RIGHT)
+        policy.assert_called_once_with(game)
+
+
+class TestSharedControls(unittest.TestCase):
+
+    def setUp(self):
+        self.controls = SharedControls()
+        self.addCleanup(self.controls.close)
+
+    def test_starts_stopped(self):
+        self.assertEqual(self.controls(), STOP)
+
+    def test_reads_the_latest_command(self):
+        for direction in (UP, LEFT, STOP, DOWN, RIGHT):
+            self.controls.send(direction)
+            self.assertEqual(self.controls(), direction)
+
+    def test_driver_attaches_by_name(self):
+        driver = SharedControls(self.controls.name)
+        self.addCleanup(driver.close)
+        driver.send(LEFT)
+        self.assertEqual(self.controls(), LEFT)
+
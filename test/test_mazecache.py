@@ -0,0 +1,190 @@
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from importlib import resources
+from unittest.mock import MagicMock, patch
+
+from CheeseChase.model.mazecache import MazeCache, CompiledMaze, compileMaze, cacheDir
+from CheeseChase.model.nodes import NodeGroup
+from CheeseChase.model.cheeses import CheeseGroup
+from CheeseChase.model.mazedata import Maze1, Maze2
+from CheeseChase.model.constants import UP, DOWN, LEFT, RIGHT, PORTAL, TILEWIDTH
+
+class TestMazeCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        base = resources.files("CheeseChase.resources")
+        self.mazefile = str(base / "maze1.txt")
+        self.rotfile = str(base / "maze1_rotation.txt")
+        self.portals = Maze1().portalPairs
+
+    def test_first_load_compiles_and_writes_artefact(self):
+        cache = MazeCache(self.directory)
+        compiled = cache.load(self.mazefile, self.rotfile, self.portals)
+        self.assertIsInstance(compiled, CompiledMaze)
+        self.assertEqual(cache.compiles, 1)
+        files = os.listdir(self.directory)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith("maze1-") and files[0].endswith(".npz"))
+
+    def test_second_process_loads_from_disk(self):
+        MazeCache(self.directory).load(self.mazefile, self.rotfile, self.portals)
+        cache = MazeCache(self.directory)
+        with patch("CheeseChase.model.mazecache.compileMaze") as mock_compile:
+            compiled = cache.load(self.mazefile, self.rotfile, self.portals)
+        mock_compile.assert_not_called()
+        self.assertEqual(cache.diskHits, 1)
+        self.assertEqual(len(compiled.nodes), len(NodeGroup(self.mazefile).nodesLUT))
+
+    def test_repeated_load_uses_memory(self):
+        cache = MazeCache(self.directory)
+        first = cache.load(self.mazefile, self.rotfile, self.portals)
+        second = cache.load(self.mazefile, self.rotfile, self.portals)
+        self.assertIs(first, second)
+        self.assertEqual(cache.memoryHits, 1)
+
+    def test_files_are_hashed_again_only_once_they_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            mazefile = os.path.join(tmp, "maze1.txt")
+            with open(self.mazefile) as src, open(mazefile, 'w') as dst:
+                dst.write(src.read())
+            cache = MazeCache(self.directory)
+            with patch.object(cache, "contentKey", wraps=cache.contentKey) as contentKey:
+                first = cache.load(mazefile, self.rotfile, self.portals)
+                cache.load(mazefile, self.rotfile, self.portals)
+                self.assertEqual(contentKey.call_count, 1)
+                stat = os.stat(mazefile)
+                os.utime(mazefile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+                # same content under a new mtime is the same maze
+                self.assertIs(cache.load(mazefile, self.rotfile, self.portals), first)
+                self.assertEqual(contentKey.call_count, 2)
+
+    def test_key_depends_on_content(self):
+        cache = MazeCache(self.directory)
+        base = resources.files("CheeseChase.resources")
+        other = cache.contentKey(str(base / "maze2.txt"), str(base / "maze2_rotation.txt"), [])
+        self.assertNotEqual(cache.contentKey(self.mazefile, self.rotfile, []), other)
+        self.assertNotEqual(cache.contentKey(self.mazefile, self.rotfile, []),
+                            cache.contentKey(self.mazefile, self.rotfile, list(self.portals.values())))
+
+    def test_key_depends_on_format(self):
+        cache = MazeCache(self.directory)
+        key = cache.contentKey(self.mazefile, self.rotfile, [])
+        with patch("CheeseChase.model.mazecache.FORMAT", 0):
+            self.assertNotEqual(cache.contentKey(self.mazefile, self.rotfile, []), key)
+
+    def test_artefact_from_another_format_is_recompiled(self):
+        with patch("CheeseChase.model.mazecache.FORMAT", 0):
+            MazeCache(self.directory).load(self.mazefile, self.rotfile, self.portals)
+        cache = MazeCache(self.directory)
+        cache.load(self.mazefile, self.rotfile, self.portals)
+        self.assertEqual((cache.diskHits, cache.compiles), (0, 1))
+
+    def test_corrupt_artefact_is_recompiled(self):
+        cache = MazeCache(self.directory)
+        compiled = cache.load(self.mazefile, self.rotfile, self.portals)
+        path = cache.path(self.mazefile, compiled.key)
+        with open(path, 'wb') as f:
+            f.write(b"not a zip file")
+        cache = MazeCache(self.directory)
+        cache.load(self.mazefile, self.rotfile, self.portals)
+        self.assertEqual(cache.compiles, 1)
+
+    def test_unwritable_directory_still_loads(self):
+        with patch("CheeseChase.model.mazecache.os.makedirs", side_effect=OSError("read-only")):
+            compiled = MazeCache(self.directory).load(self.mazefile, self.rotfile, self.portals)
+        self.assertGreater(len(compiled.nodes), 0)
+
+    def test_preload_compiles_on_a_worker_and_load_picks_it_up(self):
+        cache = MazeCache(self.directory)
+        with ThreadPoolExecutor(1) as executor:
+            future = cache.preload(self.mazefile, self.rotfile, self.portals, executor)
+            # asking twice doesn't queue the work twice
+            self.assertIs(cache.preload(self.mazefile, self.rotfile, self.portals, executor), future)
+            future.result()
+        with patch("CheeseChase.model.mazecache.compileMaze") as mock_compile:
+            compiled = cache.load(self.mazefile, self.rotfile, self.portals)
+        mock_compile.assert_not_called()
+        self.assertEqual((cache.compiles, cache.diskHits), (1, 0))
+        self.assertEqual(cache.pending, {})
+        self.assertIs(cache.load(self.mazefile, self.rotfile, self.portals), compiled)
+        self.assertEqual(cache.memoryHits, 1)
+
+    def test_preload_of_a_loaded_maze_does_nothing(self):
+        cache = MazeCache(self.directory)
+        cache.load(self.mazefile, self.rotfile, self.portals)
+        executor = MagicMock()
+        self.assertIsNone(cache.preload(self.mazefile, self.rotfile, self.portals, executor))
+        executor.submit.assert_not_called()
+
+    def test_cacheDir_honours_environment(self):
+        with patch.dict(os.environ, {"CHEESECHASE_CACHE": self.directory}):
+            self.assertEqual(cacheDir(), self.directory)
+
+    @unittest.skipIf(os.name == "nt" or sys.platform == "darwin", "XDG_CACHE_HOME is only read on Linux")
+    def test_cacheDir_treats_empty_variables_as_unset(self):
+        with patch.dict(os.environ, {"CHEESECHASE_CACHE": "", "XDG_CACHE_HOME": ""}):
+            path = cacheDir()
+        self.assertTrue(os.path.isabs(path))
+        self.assertEqual(path, os.path.join(os.path.expanduser("~/.cache"), "CheeseChase"))
+
+
+class TestCompiledMaze(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = MazeCache(tmp.name)
+        self.base = resources.files("CheeseChase.resources")
+
+    def load(self, name, maze):
+        mazefile = str(self.base / ("%s.txt" % name))
+        rotfile = str(self.base / ("%s_rotation.txt" % name))
+        MazeCache(self.cache.directory).load(mazefile, rotfile, maze.portalPairs)
+        # reload from disk so the round trip is covered
+        return mazefile, rotfile, self.cache.load(mazefile, rotfile, maze.portalPairs)
+
+    def test_nodegroup_from_compiled_matches_text(self):
+        for name, maze in (("maze1", Maze1()), ("maze2", Maze2())):
+            mazefile, rotfile, compiled = self.load(name, maze)
+            reference = NodeGroup(mazefile)
+            nodes = NodeGroup(mazefile, compiled)
+            self.assertEqual(list(nodes.nodesLUT.keys()), list(reference.nodesLUT.keys()))
+            for key, node in reference.nodesLUT.items():
+                for direction in (UP, DOWN, LEFT, RIGHT):
+                    expected = node.neighbors[direction]
+                    actual = nodes.nodesLUT[key].neighbors[direction]
+                    if expected is None:
+                        self.assertIsNone(actual)
+                    else:
+                        self.assertEqual(actual.position.asTuple(), expected.position.asTuple())
+
+    def test_portals_are_node_index_pairs(self):
+        mazefile, rotfile, compiled = self.load("maze2", Maze2())
+        self.assertEqual(len(compiled.portals), 2)
+        keys = [tuple(p) for p in compiled.nodes.tolist()]
+        for a, b in compiled.portals.tolist():
+            self.assertEqual(keys[a][1], keys[b][1])
+            self.assertEqual({keys[a][0], keys[b][0]}, {0, 27 * TILEWIDTH})
+
+    def test_nodegroup_from_compiled_links_the_portals(self):
+        mazefile, rotfile, compiled = self.load("maze2", Maze2())
+        reference = NodeGroup(mazefile)
+        Maze2().setPortalPairs(reference)
+        nodes = NodeGroup(mazefile, compiled)
+        self.assertEqual(nodes.graph.links.tolist(), reference.graph.links.tolist())
+
+    def test_cheesegroup_and_symbols_from_compiled_match_text(self):
+        mazefile, rotfile, compiled = self.load("maze1", Maze1())
+        spritesheet = MagicMock()
+        reference = CheeseGroup(mazefile, spritesheet)
+        cheeses = CheeseGroup(mazefile, spritesheet, compiled)
+        self.assertTrue((cheeses.cheeses == reference.cheeses).all())
+        self.assertTrue((cheeses.powers == reference.powers).all())
+        self.assertEqual(cheeses.numLeft, reference.numLeft)
+        self.assertEqual(len(cheeses.powercheeses), 4)
+        self.assertTrue((compiled.data == NodeGroup.readMazeFile(None, mazefile)).all())
+        self.assertTrue((compiled.rotdata == NodeGroup.readMazeFile(None, rotfile)).all())
@@ -101,3 +101,10 @@ class TestMazeData(unittest.TestCase):
         self.assertIsInstance(self.md.obj, Maze1)
         self.md.loadMaze(3)
         self.assertIsInstance(self.md.obj, Maze2)
+
+    def test_loadMaze_starts_from_the_first_maze(self):
+        md = MazeData(first=1)
+        md.loadMaze(0)
+        self.assertIsInstance(md.obj, Maze2)
+        md.loadMaze(1)
+        self.assertIsInstance(md.obj, Maze1)
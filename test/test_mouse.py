@@ -62,23 +62,18 @@ class TestMouse(unittest.TestCase):
         self.assertFalse(mouse.alive)
         self.assertEqual(mouse.direction, STOP)
 
-    def test_eatCheeses_returns_cheese_on_collision(self, MockSprites):
+    def test_eatCheeses_returns_cheese_in_reach(self, MockSprites):
         mouse = Mouse(self.node)
-        cheese1 = MagicMock()
-        cheese2 = MagicMock()
-        mouse.collideCheck = MagicMock(side_effect=[False, True])
-        result = mouse.eatCheeses([cheese1, cheese2])
-        self.assertEqual(result, cheese2)
-        mouse.collideCheck.assert_any_call(cheese1)
-        mouse.collideCheck.assert_any_call(cheese2)
+        cheeses = MagicMock()
+        result = mouse.eatCheeses(cheeses)
+        self.assertEqual(result, cheeses.find.return_value)
+        cheeses.find.assert_called_once_with(mouse.position, mouse.collideRadius)
 
     def test_eatCheeses_returns_none_if_no_collision(self, MockSprites):
         mouse = Mouse(self.node)
-        cheese1 = MagicMock()
-        cheese2 = MagicMock()
-        mouse.collideCheck = MagicMock(return_value=False)
-        result = mouse.eatCheeses([cheese1, cheese2])
-        self.assertIsNone(result)
+        cheeses = MagicMock()
+        cheeses.find.return_value = None
+        self.assertIsNone(mouse.eatCheeses(cheeses))
 
     def test_collideCat_delegates_to_collideCheck(self, MockSprites):
         mouse = Mouse(self.node)
@@ -95,11 +90,10 @@ class TestMouse(unittest.TestCase):
         other.position = MagicMock()
         mouse.collideRadius = 5
         other.collideRadius = 7
-        # Set magnitudeSquared to less than (5+7)^2 = 144
-        diff = MagicMock()
-        diff.magnitudeSquared.return_value = 100
-        mouse.position.__sub__.return_value = diff
+        # Set squared distance to less than (5+7)^2 = 144
+        mouse.position.distanceSquaredTo.return_value = 100
         result = mouse.collideCheck(other)
+        mouse.position.distanceSquaredTo.assert_called_once_with(other.position)
         self.assertTrue(result)
 
     def test_collideCheck_false_if_outside_radius(self, MockSprites):
@@ -109,41 +103,18 @@ class TestMouse(unittest.TestCase):
         other.position = MagicMock()
         mouse.collideRadius = 5
         other.collideRadius = 7
-        # Set magnitudeSquared to greater than (5+7)^2 = 144
-        diff = MagicMock()
-        diff.magnitudeSquared.return_value = 200
-        mouse.position.__sub__.return_value = diff
+        # Set squared distance to greater than (5+7)^2 = 144
+        mouse.position.distanceSquaredTo.return_value = 200
         result = mouse.collideCheck(other)
+        mouse.position.distanceSquaredTo.assert_called_once_with(other.position)
         self.assertFalse(result)
 
-    @patch("CheeseChase.model.mouse.pygame.key.get_pressed")
-    def test_getValidKey_returns_correct_direction(self, MockGetPressed, MockSprites):
+    def test_getValidKey_uses_scripted_controls(self, MockSprites):
         mouse = Mouse(self.node)
-
-        # Use a dict-like mock that handles large key constants
-        class KeyMock(dict):
-            def __getitem__(self, key):
-                return dict.get(self, key, 0)
-
-        # Use pygame key constants for keys!
-        from pygame.locals import K_UP, K_DOWN, K_LEFT, K_RIGHT
-
-        # Test UP
-        MockGetPressed.return_value = KeyMock({K_UP: 1})
+        mouse.controls = MagicMock(return_value=UP)
         self.assertEqual(mouse.getValidKey(), UP)
+        mouse.controls.assert_called_once_with()
 
-        # Test DOWN
-        MockGetPressed.return_value = KeyMock({K_DOWN: 1})
-        self.assertEqual(mouse.getValidKey(), DOWN)
-
-        # Test LEFT
-        MockGetPressed.return_value = KeyMock({K_LEFT: 1})
-        self.assertEqual(mouse.getValidKey(), LEFT)
-
-        # Test RIGHT
-        MockGetPressed.return_value = KeyMock({K_RIGHT: 1})
-        self.assertEqual(mouse.getValidKey(), RIGHT)
-
-        # Test STOP (no key pressed)
-        MockGetPressed.return_value = KeyMock()
+    def test_getValidKey_without_controls_is_stop(self, MockSprites):
+        mouse = Mouse(self.node)
         self.assertEqual(mouse.getValidKey(), STOP)
\ No newline at end of file
@@ -31,15 +31,11 @@ class TestNode(unittest.TestCase):
         self.node.allowAccess(UP, self.mock_entity)
         self.assertIn(CAT1, self.node.access[UP]) # CAT1 should now be added
 
-    @patch("CheeseChase.model.nodes.pygame.draw")
+    @patch("pygame.draw")
     def test_render_draws_lines_and_circles(self, mock_draw):
         screen = MagicMock()
         neighbor = Node(20, 30)
         self.node.neighbors[RIGHT] = neighbor
-        # Mock position methods to return fixed coordinates
-        self.node.position.asTuple = MagicMock(return_value=(5, 10))
-        neighbor.position.asTuple = MagicMock(return_value=(20, 30))
-        self.node.position.asInt = MagicMock(return_value=(5, 10))
         self.node.render(screen)
         # Ensure draw.line and draw.circle are called with expected parameters
         mock_draw.line.assert_called_with(screen, WHITE, (5, 10), (20, 30), 4)
@@ -138,8 +134,8 @@ class TestNodeGroup(unittest.TestCase):
         node = self.ng.nodesLUT[key]
         entity = MagicMock()
         entity.name = CAT4
-        node.access[UP].append("TEST")
         self.ng.denyAccess(0, 0, UP, entity) # Should remove CAT4 if present
+        self.assertNotIn(CAT4, node.access[UP])
         self.ng.allowAccess(0, 0, UP, entity) # Should add CAT4 back
         self.assertIn(CAT4, node.access[UP])
 
@@ -147,7 +143,8 @@ class TestNodeGroup(unittest.TestCase):
         # Test batch deny/allow access for multiple entities
         key = self.ng.constructKey(0, 0)
         node = self.ng.nodesLUT[key]
-        entities = [MagicMock(name=CAT2), MagicMock(name=CAT3)]
+        entities = [MagicMock(), MagicMock()]
+        entities[0].name, entities[1].name = CAT2, CAT3
         # Add entities to access
         for e in entities:
             node.access[UP].append(e.name)
@@ -175,7 +172,8 @@ class TestNodeGroup(unittest.TestCase):
         # Test denying/allowing access for multiple entities on home nodes
         homekey = self.ng.createHomeNodes(2, 2)
         node = self.ng.nodesLUT[homekey]
-        entities = [MagicMock(name=CAT1), MagicMock(name=CAT2)]
+        entities = [MagicMock(), MagicMock()]
+        entities[0].name, entities[1].name = CAT1, CAT2
         node.access[DOWN] = [CAT1, CAT2]
         self.ng.denyHomeAccessList(entities)
         for e in entities:
@@ -190,3 +188,332 @@ class TestNodeGroup(unittest.TestCase):
         screen = MagicMock()
         self.ng.render(screen)
         self.assertEqual(mock_render.call_count, len(self.ng.nodesLUT))
+
+
+class TestNodeGroupVectorisedBuilder(unittest.TestCase):
+    """buildNodes must produce exactly the graph of the cell-by-cell builder."""
+
+    def setUp(self):
+        patcher = patch("CheeseChase.model.nodes.np.loadtxt", return_value=np.array([['+']]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ng = NodeGroup("dummyfile.txt")
+
+    def snapshot(self):
+        graph = []
+        for key, node in self.ng.nodesLUT.items():
+            links = {}
+            for direction in (UP, DOWN, LEFT, RIGHT, PORTAL):
+                neighbor = node.neighbors[direction]
+                links[direction] = None if neighbor is None else neighbor.position.asTuple()
+            graph.append((key, links))
+        return graph
+
+    def legacy(self, data, xoffset=0, yoffset=0):
+        self.ng.createNodeTable(data, xoffset, yoffset)
+        self.ng.connectHorizontally(data, xoffset, yoffset)
+        self.ng.connectVertically(data, xoffset, yoffset)
+
+    def assertSameGraph(self, data, xoffset=0, yoffset=0):
+        self.ng.nodesLUT = {}
+        self.legacy(data, xoffset, yoffset)
+        expected = self.snapshot()
+        self.ng.nodesLUT = {}
+        self.ng.buildNodes(data, xoffset, yoffset)
+        self.assertEqual(self.snapshot(), expected)
+
+    def test_matches_legacy_builder_on_shipped_mazes(self):
+        from importlib import resources
+        for name in ("maze1.txt", "maze2.txt"):
+            path = resources.files("CheeseChase.resources") / name
+            data = np.genfromtxt(str(path), dtype='<U1')
+            self.assertSameGraph(data)
+
+    def test_matches_legacy_builder_on_random_grids(self):
+        rng = np.random.default_rng(7)
+        symbols = np.array(['+', 'P', 'n', '.', '-', '|', 'p', 'X', '1', '='])
+        for shape in ((1, 1), (1, 12), (9, 1), (17, 23), (60, 45)):
+            data = rng.choice(symbols, size=shape, p=[.2, .02, .03, .3, .05, .05, .02, .2, .08, .05])
+            self.assertSameGraph(data)
+
+    def test_matches_legacy_builder_with_offsets(self):
+        homedata = np.array([['X','X','+','X','X'],
+                             ['X','X','.','X','X'],
+                             ['+','X','.','X','+'],
+                             ['+','.','+','.','+'],
+                             ['+','X','X','X','+']])
+        self.assertSameGraph(homedata, 11.5, 14)
+
+    def test_empty_grid_builds_nothing(self):
+        self.ng.nodesLUT = {}
+        self.ng.buildNodes(np.array([['X', '.'], ['.', 'X']]))
+        self.assertEqual(self.ng.nodesLUT, {})
+
+
+class TestPathTables(unittest.TestCase):
+    def setUp(self):
+        # four corner nodes linked in a square, 32px apart
+        patcher = patch("CheeseChase.model.nodes.np.loadtxt", return_value=np.array([
+            ['+', '.', '+'],
+            ['.', 'X', '.'],
+            ['+', '.', '+']
+        ]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ng = NodeGroup("dummyfile.txt")
+        self.a, self.b, self.c, self.d = [self.ng.getNodeFromTiles(col, row) for row, col in ((0, 0), (0, 2), (2, 0), (2, 2))]
+        self.entity = MagicMock()
+        self.entity.name = CAT1
+
+    def test_distances_and_next_hops_on_a_square(self):
+        tables = self.ng.pathTables(CAT1)
+        self.assertEqual(tables.distance(self.a, self.a), 0)
+        self.assertEqual(tables.distance(self.a, self.b), 2 * TILEWIDTH)
+        self.assertEqual(tables.distance(self.a, self.d), 2 * TILEWIDTH + 2 * TILEHEIGHT)
+        self.assertEqual(tables.nextDirection(self.a, self.b), RIGHT)
+        self.assertEqual(tables.nextDirection(self.a, self.c), DOWN)
+        self.assertEqual(tables.nextDirection(self.a, self.a), 0)
+
+    def test_access_rules_are_per_entity(self):
+        self.a.denyAccess(RIGHT, self.entity)
+        self.b.denyAccess(LEFT, self.entity)
+        cat = self.ng.pathTables(CAT1)
+        mouse = self.ng.pathTables(MOUSE)
+        self.assertEqual(cat.distance(self.a, self.b), 6 * TILEWIDTH)
+        self.assertEqual(cat.nextDirection(self.a, self.b), DOWN)
+        self.assertEqual(mouse.distance(self.a, self.b), 2 * TILEWIDTH)
+        # one-way: the way back is still open
+        self.a.allowAccess(RIGHT, self.entity)
+        self.assertEqual(self.ng.pathTables(CAT1).distance(self.a, self.b), 2 * TILEWIDTH)
+        self.assertEqual(self.ng.pathTables(CAT1).distance(self.b, self.a), 6 * TILEWIDTH)
+
+    def test_unreachable_nodes_are_infinitely_far(self):
+        # both ways into the top-left corner closed
+        self.b.denyAccess(LEFT, self.entity)
+        self.c.denyAccess(UP, self.entity)
+        tables = self.ng.pathTables(CAT1)
+        self.assertEqual(tables.distance(self.d, self.a), np.inf)
+        self.assertEqual(tables.nextDirection(self.d, self.a), 0)
+        self.assertIsNone(tables.bestDirection(self.d, self.a, [UP, LEFT]))
+
+    def test_portals_are_free_jumps(self):
+        self.ng.setPortalPair((0, 0), (2, 2))
+        tables = self.ng.pathTables(CAT1)
+        self.assertEqual(tables.distance(self.a, self.d), 0)
+        self.assertEqual(tables.nextDirection(self.a, self.d), PORTAL)
+        self.assertEqual(tables.distance(self.b, self.c), 4 * TILEWIDTH)
+
+    def test_tables_are_reused_until_something_changes(self):
+        tables = self.ng.pathTables(CAT1)
+        self.assertIs(self.ng.pathTables(CAT1), tables)
+        self.a.denyAccess(RIGHT, self.entity)
+        self.assertIsNot(self.ng.pathTables(CAT1), tables)
+        # denying twice is not a change
+        tables = self.ng.pathTables(CAT1)
+        self.a.denyAccess(RIGHT, self.entity)
+        self.assertIs(self.ng.pathTables(CAT1), tables)
+
+    def test_changes_to_another_graph_keep_the_tables(self):
+        tables = self.ng.pathTables(CAT1)
+        other = NodeGroup("dummyfile.txt")
+        other.graph.nodes[0].denyAccess(RIGHT, self.entity)
+        self.assertIs(self.ng.pathTables(CAT1), tables)
+
+    def test_bestDirection_follows_the_maze_not_the_crow(self):
+        tables = self.ng.pathTables(CAT1)
+        self.assertEqual(tables.bestDirection(self.a, self.d, [RIGHT, DOWN]), RIGHT)
+        self.assertEqual(tables.bestDirection(self.a, self.c, [RIGHT, DOWN]), DOWN)
+        self.assertEqual(tables.bestDirection(self.a, self.c, [RIGHT]), RIGHT)
+        self.assertIs(tables.nearestNode(self.b.position / 4), self.a)
+
+
+class TestShippedMazePaths(unittest.TestCase):
+    def test_paths_on_shipped_mazes_are_consistent(self):
+        import tempfile
+        from importlib import resources
+        from CheeseChase.model.mazecache import MazeCache
+        from CheeseChase.model.mazedata import Maze1, Maze2
+        for name, data in (("maze1", Maze1()), ("maze2", Maze2())):
+            base = resources.files("CheeseChase.resources")
+            mazefile = str(base / ("%s.txt" % name))
+            with tempfile.TemporaryDirectory() as directory:
+                compiled = MazeCache(directory).load(mazefile, str(base / ("%s_rotation.txt" % name)), data.portalPairs)
+            nodes = NodeGroup(mazefile, compiled)
+            data.setPortalPairs(nodes)
+            tables = nodes.pathTables(MOUSE)
+            # symmetric for an entity allowed everywhere, and every node reachable
+            self.assertTrue((tables.distances == tables.distances.T).all())
+            self.assertTrue(np.isfinite(tables.distances).all())
+            # walking the next hops always reaches the goal in exactly the tabled distance
+            rng = np.random.default_rng(0)
+            for i, j in rng.integers(0, len(tables.nodes), (50, 2)).tolist():
+                node, goal = tables.nodes[i], tables.nodes[j]
+                walked = 0
+                while node is not goal:
+                    direction = tables.nextDirection(node, goal)
+                    step = node.neighbors[direction]
+                    walked += abs(step.position.x - node.position.x) + abs(step.position.y - node.position.y)
+                    if direction == PORTAL:
+                        walked = walked - abs(step.position.x - node.position.x)
+                    node = step
+                self.assertEqual(walked, tables.distance(tables.nodes[i], goal))
+            # a second group over the same compiled maze reuses the tables
+            again = NodeGroup(mazefile, compiled)
+            data.setPortalPairs(again)
+            self.assertIs(again.pathTables(MOUSE).distances, tables.distances)
+
+
+class TestNodeGraph(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("CheeseChase.model.nodes.np.loadtxt", return_value=np.array([
+            ['+', '.', '+'],
+            ['.', 'X', '.'],
+            ['+', '.', '+']
+        ]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ng = NodeGroup("dummyfile.txt")
+        self.graph = self.ng.graph
+
+    def test_nodes_are_views_onto_array_rows(self):
+        self.assertEqual(len(self.graph), 4)
+        for i, node in enumerate(self.graph.nodes):
+            self.assertEqual(node.index, i)
+            self.assertIs(node.graph, self.graph)
+            self.assertEqual(tuple(self.graph.positions[i]), node.position.asTuple())
+        self.assertEqual(self.graph.links.shape, (4, 5))
+        self.assertEqual(self.graph.links.tolist(), [[-1, 2, -1, 1, -1],
+                                                     [-1, 3, 0, -1, -1],
+                                                     [0, -1, -1, 3, -1],
+                                                     [1, -1, 2, -1, -1]])
+
+    def test_neighbors_read_and_write_the_link_array(self):
+        a, b, c, d = self.graph.nodes
+        self.assertIs(a.neighbors[RIGHT], b)
+        self.assertIsNone(a.neighbors[PORTAL])
+        a.neighbors[PORTAL] = d
+        self.assertEqual(self.graph.links[0, 4], 3)
+        a.neighbors[RIGHT] = None
+        self.assertEqual(self.graph.links[0, 3], -1)
+        self.assertEqual(a.neighbors, {UP: None, DOWN: c, LEFT: None, RIGHT: None, PORTAL: d})
+
+    def test_access_is_a_bitmask_per_direction(self):
+        node = self.graph.nodes[0]
+        full = sum(1 << name for name in (MOUSE, CAT1, CAT2, CAT3, CAT4))
+        self.assertTrue((self.graph.access == full).all())
+        self.assertEqual(list(node.access[UP]), [MOUSE, CAT1, CAT2, CAT3, CAT4])
+        entity = MagicMock()
+        entity.name = CAT2
+        node.denyAccess(LEFT, entity)
+        self.assertEqual(self.graph.access[0, 2], full & ~(1 << CAT2))
+        self.assertNotIn(CAT2, node.access[LEFT])
+        node.access[DOWN] = [MOUSE]
+        self.assertEqual(self.graph.access[0, 1], 1 << MOUSE)
+        with self.assertRaises(ValueError):
+            node.access[DOWN].append("someone")
+
+    def test_growth_keeps_views_pointing_at_live_rows(self):
+        first = self.graph.nodes[0]
+        for i in range(100):
+            Node(i, 99, self.graph)
+        self.assertEqual(len(self.graph), 104)
+        self.assertIs(first.neighbors[RIGHT], self.graph.nodes[1])
+        self.assertEqual(self.graph.positions[-1].tolist(), [99, 99])
+
+    def test_nodes_from_different_graphs_do_not_link(self):
+        other = NodeGroup("dummyfile.txt")
+        with self.assertRaises(ValueError):
+            self.graph.nodes[0].neighbors[LEFT] = other.graph.nodes[1]
+
+    def test_free_nodes_get_their_own_graph(self):
+        a, b = Node(0, 0), Node(16, 0)
+        self.assertIsNot(a.graph, b.graph)
+        self.assertEqual((len(a.graph), len(b.graph)), (1, 1))
+        b.access[LEFT].remove(CAT1)
+        a.neighbors[RIGHT] = b
+        b.neighbors[LEFT] = a
+        self.assertIs(a.graph, b.graph)
+        self.assertEqual(a.graph.links[:, :4].tolist(), [[-1, -1, -1, 1], [-1, -1, 0, -1]])
+        self.assertNotIn(CAT1, b.access[LEFT])
+
+    def test_free_nodes_join_the_graph_they_are_linked_into(self):
+        free = Node(99, 99)
+        first = self.graph.nodes[0]
+        free.neighbors[UP] = first
+        self.assertIs(free.graph, self.graph)
+        self.assertIs(self.graph.nodes[-1], free)
+        self.assertIs(free.neighbors[UP], first)
+        self.assertEqual(self.graph.positions[-1].tolist(), [99, 99])
+        self.assertIs(first.neighbors[RIGHT], self.graph.nodes[1])
+
+    def test_graph_pickles_as_arrays(self):
+        import pickle
+        self.ng.setPortalPair((0, 0), (2, 2))
+        copy = pickle.loads(pickle.dumps(self.graph))
+        self.assertEqual(copy.links.tolist(), self.graph.links.tolist())
+        self.assertEqual(copy.access.tolist(), self.graph.access.tolist())
+        a, b, c, d = copy.nodes
+        self.assertIs(a.neighbors[PORTAL], d)
+        self.assertIs(a.neighbors[RIGHT], b)
+        # a pickled node comes back as the view in its graph
+        node, graph = pickle.loads(pickle.dumps((self.graph.nodes[3], self.graph)))
+        self.assertIs(node, graph.nodes[3])
+
+
+
+class TestCompiledGraph(unittest.TestCase):
+    def test_compiled_maze_loads_straight_into_the_arrays(self):
+        import tempfile
+        from importlib import resources
+        from CheeseChase.model.mazecache import MazeCache
+        base = resources.files("CheeseChase.resources")
+        with tempfile.TemporaryDirectory() as directory:
+            compiled = MazeCache(directory).load(str(base / "maze1.txt"), str(base / "maze1_rotation.txt"))
+        group = NodeGroup(str(base / "maze1.txt"), compiled)
+        self.assertEqual(group.graph.links[:, :4].tolist(), compiled.links.tolist())
+        self.assertEqual(group.graph.positions.tolist(), compiled.nodes.tolist())
+        reference = NodeGroup(str(base / "maze1.txt"))
+        self.assertEqual(reference.graph.links.tolist(), group.graph.links.tolist())
+
+
+class TestAccessMasks(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("CheeseChase.model.nodes.np.loadtxt", return_value=np.array([['+', '.', '+']]))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.ng = NodeGroup("dummyfile.txt")
+        self.ng.homekey = self.ng.constructKey(0, 0)
+        self.node = self.ng.nodesLUT[self.ng.homekey]
+        self.cats = []
+        for name in (CAT1, CAT2, CAT3, CAT4):
+            cat = MagicMock()
+            cat.name = name
+            self.cats.append(cat)
+
+    def test_allows_is_one_and_against_the_mask(self):
+        self.assertTrue(self.node.allows(RIGHT, 1 << CAT1))
+        self.node.denyAccess(RIGHT, self.cats[0])
+        self.assertFalse(self.node.allows(RIGHT, 1 << CAT1))
+        self.assertTrue(self.node.allows(RIGHT, 1 << CAT2))
+        self.assertTrue(self.node.allows(RIGHT, (1 << CAT1) | (1 << CAT2)))
+
+    def test_list_updates_write_the_mask_once(self):
+        before = self.ng.graph.version
+        self.ng.denyAccessList(0, 0, RIGHT, self.cats)
+        self.assertEqual(self.ng.graph.version, before + 1)
+        self.assertEqual(self.ng.graph.access[self.node.index, 3], 1 << MOUSE)
+        self.ng.allowAccessList(0, 0, RIGHT, self.cats[:2])
+        self.assertEqual(list(self.node.access[RIGHT]), [MOUSE, CAT1, CAT2])
+        # missing nodes are ignored as before
+        self.ng.denyAccessList(9, 9, RIGHT, self.cats)
+
+    def test_home_list_updates_write_the_mask_once(self):
+        before = self.ng.graph.version
+        self.ng.denyHomeAccessList(self.cats)
+        self.assertEqual(self.ng.graph.version, before + 1)
+        self.assertEqual(list(self.node.access[DOWN]), [MOUSE])
+        self.ng.allowHomeAccessList(self.cats[2:])
+        self.assertEqual(list(self.node.access[DOWN]), [MOUSE, CAT3, CAT4])
+        # nothing to change, nothing to rebuild
+        self.ng.allowHomeAccessList(self.cats[2:])
+        self.assertEqual(self.ng.graph.version, before + 2)
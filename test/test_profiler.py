@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from CheeseChase.controller.profiler import FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = FrameProfiler(window=4)
+
+    def test_starts_disabled_and_toggles(self):
+        self.assertFalse(self.profiler.enabled)
+        self.assertTrue(self.profiler.toggle())
+        self.assertFalse(self.profiler.toggle())
+
+    def test_mark_charges_time_since_previous_mark(self):
+        with patch("CheeseChase.controller.profiler.perf_counter_ns", side_effect=[0, 100, 350, 1000, 1200, 1500]):
+            self.profiler.beginFrame()
+            self.profiler.begin()
+            self.profiler.mark("text")
+            self.profiler.mark("cats")
+            # a second step in the same frame adds to its phases
+            self.profiler.mark("text")
+            self.profiler.endFrame()
+        self.assertEqual(list(self.profiler.samples["text"]), [450])
+        self.assertEqual(list(self.profiler.samples["cats"]), [650])
+        self.assertEqual(list(self.profiler.samples["frame"]), [1500])
+
+    def test_phases_that_did_not_run_record_zero(self):
+        self.profiler.beginFrame()
+        self.profiler.begin()
+        self.profiler.mark("mouse")
+        self.profiler.endFrame()
+        self.assertEqual(list(self.profiler.samples["cats"]), [0])
+        self.assertEqual(len(self.profiler.samples["cats"]), len(self.profiler.samples["frame"]))
+
+    def test_frame_spans_every_mark_in_between(self):
+        with patch("CheeseChase.controller.profiler.perf_counter_ns", side_effect=[0, 10, 20, 500]):
+            self.profiler.beginFrame()
+            self.profiler.begin()
+            self.profiler.mark("render")
+            self.profiler.endFrame()
+        self.assertEqual(list(self.profiler.samples["render"]), [10])
+        self.assertEqual(list(self.profiler.samples["frame"]), [500])
+
+    def test_window_keeps_only_recent_samples(self):
+        for elapsed in range(10):
+            self.profiler.record("mouse", elapsed * 1000)
+        self.assertEqual(list(self.profiler.samples["mouse"]), [6000, 7000, 8000, 9000])
+
+    def test_stats_in_microseconds(self):
+        for elapsed in (1000, 2000, 3000, 10000):
+            self.profiler.record("cats", elapsed)
+        stats = self.profiler.stats()["cats"]
+        self.assertEqual(stats["count"], 4)
+        self.assertAlmostEqual(stats["mean"], 4.0)
+        self.assertEqual(stats["max"], 10.0)
+        self.assertLessEqual(stats["p95"], stats["p99"])
+        self.assertLessEqual(stats["p99"], stats["max"])
+
+    def test_stats_follow_phase_order(self):
+        for phase in ("frame", "render", "text"):
+            self.profiler.record(phase, 1)
+        self.assertEqual(list(self.profiler.stats()), ["text", "render", "frame"])
+        self.assertIn("render", self.profiler.report())
+
+    def test_dump_writes_json(self):
+        self.profiler.record("text", 1500)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.json")
+            self.profiler.dump(path)
+            with open(path) as f:
+                data = json.load(f)
+        self.assertEqual(data["window"], 4)
+        self.assertEqual(data["phases"]["text"]["mean"], 1.5)
+
+    def test_reset_clears_samples(self):
+        self.profiler.record("text", 1)
+        self.profiler.reset()
+        self.assertEqual(self.profiler.stats(), {})
@@ -0,0 +1,154 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import numpy as np
+from CheeseChase.controller.game_controller import GameController
+from CheeseChase.controller.inputs import RandomControls, KeyboardControls, ScriptedControls
+from CheeseChase.controller.recording import (InputRecorder, Recording, ReplayControls, replay,
+                                              encodeRuns, decodeRuns, CODES, TOGGLESHIFT, MAXTOGGLES)
+from CheeseChase.model.constants import UP, DOWN, LEFT, STOP
+from test.helpers import TempCacheMixin
+
+
+class TestRunLength(unittest.TestCase):
+
+    def test_round_trip(self):
+        values = np.array([0] * 3 + [1] * 200 + [9] + [4] * 70000, dtype=np.uint8)
+        data = encodeRuns(values)
+        np.testing.assert_array_equal(decodeRuns(data), values)
+
+    def test_long_runs_stay_small(self):
+        # one byte of value and three of length for a 70000 step run
+        self.assertEqual(len(encodeRuns(np.full(70000, 3, dtype=np.uint8))), 4)
+
+    def test_empty(self):
+        self.assertEqual(encodeRuns([]), b"")
+        self.assertEqual(len(decodeRuns(b"")), 0)
+
+    def test_truncated_data_raises(self):
+        with self.assertRaises(ValueError):
+            decodeRuns(encodeRuns([1] * 300)[:-1])
+
+
+class TestRecording(unittest.TestCase):
+
+    def test_bytes_round_trip(self):
+        recording = Recording(12345, 1.0/60, True, False, np.array([1, 1, 2, 8], dtype=np.uint8))
+        loaded = Recording.fromBytes(recording.toBytes())
+        self.assertEqual((loaded.seed, loaded.stepDt, loaded.paused, loaded.pathfinding),
+                         (12345, 1.0/60, True, False))
+        np.testing.assert_array_equal(loaded.values, recording.values)
+
+    def test_negative_seeds_round_trip(self):
+        recording = Recording(-1, 1.0/60, False, False, np.zeros(3, dtype=np.uint8))
+        self.assertEqual(Recording.fromBytes(recording.toBytes()).seed, -1)
+
+    def test_save_and_load(self):
+        recording = Recording(7, 0.02, False, True, np.zeros(10, dtype=np.uint8))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.ccr")
+            recording.save(path)
+            loaded = Recording.load(path)
+        self.assertEqual(len(loaded), 10)
+        self.assertTrue(loaded.pathfinding)
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            Recording.fromBytes(b"not a recording at all, sorry")
+        with self.assertRaises(ValueError):
+            Recording.fromBytes(b"CC")
+
+
+class TestInputRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.game = MagicMock(stepDt=0.02, pathfinding=True)
+        self.game.pause.paused = True
+        self.recorder = InputRecorder(seed=3)
+
+    def test_attach_seeds_and_remembers_the_game_settings(self):
+        with patch("CheeseChase.controller.recording.random.seed") as seed:
+            self.recorder.attach(self.game)
+        seed.assert_called_once_with(3)
+        self.assertIsInstance(self.recorder.controls, KeyboardControls)
+        self.assertEqual((self.recorder.stepDt, self.recorder.paused, self.recorder.pathfinding),
+                         (0.02, True, True))
+
+    def test_forwards_hooks_to_the_wrapped_provider(self):
+        inner = MagicMock(spec=ScriptedControls)
+        recorder = InputRecorder(inner, seed=3)
+        recorder.attach(self.game)
+        recorder.poll()
+        recorder.pauseToggled()
+        recorder.endStep()
+        inner.attach.assert_called_once_with(self.game)
+        inner.poll.assert_called_once_with()
+        inner.pauseToggled.assert_called_once_with()
+        inner.endStep.assert_called_once_with()
+
+    def test_one_value_per_step(self):
+        self.recorder = InputRecorder(MagicMock(side_effect=[LEFT, UP]), seed=3)
+        self.recorder.attach(self.game)
+        self.assertEqual(self.recorder(), LEFT)
+        self.recorder.endStep()
+        # the mouse didn't ask this step
+        self.recorder.pauseToggled()
+        self.recorder.endStep()
+        self.assertEqual(self.recorder(), UP)
+        self.recorder.endStep()
+        values = list(self.recorder.recording().values)
+        self.assertEqual([CODES[v & 7] for v in values], [LEFT, STOP, UP])
+        self.assertEqual([v >> TOGGLESHIFT for v in values], [0, 1, 0])
+
+    def test_picks_a_seed_when_none_is_given(self):
+        self.assertIsInstance(InputRecorder().seed, int)
+
+    def test_rejects_seeds_the_header_cannot_hold(self):
+        with self.assertRaises(ValueError):
+            InputRecorder(seed=2**64)
+
+    def test_many_toggles_keep_their_count_or_parity(self):
+        self.recorder.attach(self.game)
+        for count in (5, MAXTOGGLES, MAXTOGGLES + 1, MAXTOGGLES + 2):
+            for i in range(count):
+                self.recorder.pauseToggled()
+            self.recorder.endStep()
+        toggles = [v >> TOGGLESHIFT for v in self.recorder.recording().values]
+        self.assertEqual(toggles, [5, MAXTOGGLES, MAXTOGGLES - 1, MAXTOGGLES])
+
+
+class TestReplay(TempCacheMixin, unittest.TestCase):
+
+    def state(self, game):
+        return (game.level, game.score, game.lives, game.mouse.position.asTuple(),
+                [cat.position.asTuple() for cat in game.cats])
+
+    def test_replay_reproduces_a_headless_session(self):
+        recorder = InputRecorder(RandomControls(2), seed=5)
+        game = GameController(headless=True, controls=recorder)
+        game.startGame()
+        for i in range(1500):
+            game.update()
+        recording = Recording.fromBytes(recorder.recording().toBytes())
+        self.assertEqual(len(recording), 1500)
+        self.assertEqual(self.state(replay(recording)), self.state(game))
+
+    def test_replay_controls_step_through_the_recording(self):
+        values = np.array([CODES.index(DOWN), CODES.index(LEFT) | 2 << TOGGLESHIFT], dtype=np.uint8)
+        controls = ReplayControls(Recording(9, 0.02, True, False, values))
+        game = MagicMock()
+        with patch("CheeseChase.controller.recording.random.seed") as seed:
+            controls.attach(game)
+        seed.assert_called_once_with(9)
+        self.assertTrue(game.pause.paused)
+        controls.start()
+        self.assertEqual(controls(), DOWN)
+        game.events_manager.togglePause.assert_not_called()
+        controls.endStep()
+        # toggles recorded for a step happen just before it
+        self.assertEqual(game.events_manager.togglePause.call_count, 2)
+        self.assertEqual(controls(), LEFT)
+        controls.endStep()
+        self.assertTrue(controls.done)
+        self.assertEqual(controls(), STOP)
@@ -0,0 +1,88 @@
+import os
+import unittest
+from unittest.mock import patch
+from CheeseChase.controller.rollouts import Job, runGame, runRollouts, aggregate, initWorker, POLICIES
+from CheeseChase.controller.game_controller import GameController
+from CheeseChase.controller.inputs import RandomControls
+from CheeseChase.model.constants import STOP
+from test.helpers import TempCacheMixin
+
+
+class TestRollouts(TempCacheMixin, unittest.TestCase):
+
+    def test_job_builds_controls_from_policy_name_or_factory(self):
+        self.assertIsInstance(Job(1, policy="random").controls(), RandomControls)
+        self.assertEqual(Job(1, policy="idle").controls()(), STOP)
+        self.assertEqual(Job(1, policy=RandomControls).policyName(), "RandomControls")
+
+    def test_runGame_stops_at_frame_budget(self):
+        result = runGame(Job(seed=0, policy="random", frames=300))
+        self.assertEqual(result["frames"], 300)
+        self.assertEqual(result["maze"], 0)
+        self.assertEqual(result["policy"], "random")
+        self.assertFalse(result["gameOver"])
+        self.assertGreater(result["wallTime"], 0)
+
+    def test_runGame_stops_at_game_over(self):
+        result = runGame(Job(seed=0, maze=1, policy="idle", frames=100000))
+        self.assertTrue(result["gameOver"])
+        self.assertEqual(result["livesLost"], 5)
+        # the maze is picked apart from the level, which counts from 0
+        self.assertEqual(result["level"], 0)
+        self.assertLess(result["frames"], 100000)
+
+    def test_runGame_plays_the_job_maze_from_level_0(self):
+        games = []
+        def build(*args, **kwargs):
+            games.append(GameController(*args, **kwargs))
+            return games[-1]
+        with patch("CheeseChase.controller.rollouts.GameController", side_effect=build):
+            result = runGame(Job(seed=0, maze=1, frames=10))
+        self.assertEqual(games[0].mazedata.obj.name, "maze2")
+        self.assertEqual(result["level"], 0)
+
+    def test_runGame_is_reproducible(self):
+        first = runGame(Job(seed=4, frames=1500))
+        second = runGame(Job(seed=4, frames=1500))
+        for key in ("score", "level", "frames", "livesLost"):
+            self.assertEqual(first[key], second[key])
+
+    def test_runRollouts_in_process(self):
+        jobs = [Job(seed, frames=100) for seed in range(3)]
+        results = list(runRollouts(jobs, workers=0))
+        self.assertEqual([result["seed"] for result in results], [0, 1, 2])
+
+    def test_runRollouts_in_a_process_pool(self):
+        jobs = [Job(seed, maze=seed % 2, frames=100) for seed in range(4)]
+        results = list(runRollouts(jobs, workers=2))
+        self.assertEqual(sorted((result["seed"], result["maze"]) for result in results),
+                         [(0, 0), (1, 1), (2, 0), (3, 1)])
+
+    def test_pool_workers_are_spawned_not_forked(self):
+        with patch("CheeseChase.controller.rollouts.ProcessPoolExecutor") as pool:
+            list(runRollouts([], workers=2))
+        self.assertEqual(pool.call_args.kwargs["mp_context"].get_start_method(), "spawn")
+        self.assertIs(pool.call_args.kwargs["initializer"], initWorker)
+
+    def test_aggregate_groups_by_policy_and_maze(self):
+        results = [
+            {"policy": "random", "maze": 0, "score": 100, "level": 0, "frames": 10, "livesLost": 1, "gameOver": False, "wallTime": 1},
+            {"policy": "random", "maze": 0, "score": 300, "level": 1, "frames": 30, "livesLost": 5, "gameOver": True, "wallTime": 2},
+            {"policy": "idle", "maze": 1, "score": 30, "level": 1, "frames": 5, "livesLost": 5, "gameOver": True, "wallTime": 1},
+        ]
+        summary = aggregate(results)
+        self.assertEqual(list(summary), [("idle", 1), ("random", 0)])
+        stats = summary[("random", 0)]
+        self.assertEqual(stats["games"], 2)
+        self.assertEqual(stats["meanScore"], 200)
+        self.assertEqual(stats["maxScore"], 300)
+        self.assertEqual(stats["meanLevel"], 0.5)
+        self.assertEqual(stats["gameOvers"], 1)
+        self.assertEqual(stats["wallTime"], 3)
+
+    @patch("CheeseChase.controller.rollouts.pygame.init")
+    def test_initWorker_forces_dummy_video(self, mock_init):
+        with patch.dict(os.environ, {"SDL_VIDEODRIVER": "x11"}):
+            initWorker()
+            self.assertEqual(os.environ["SDL_VIDEODRIVER"], "dummy")
+        mock_init.assert_called_once()
@@ -1,16 +1,21 @@
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 import numpy as np
 
 from CheeseChase.view.sprites import (
-    Spritesheet, MouseSprites, CatSprites, LifeSprites, MazeSprites, DEATH
+    Spritesheet, SheetRegistry, MouseSprites, CatSprites, LifeSprites, MazeSprites, DEATH
 )
 from CheeseChase.model.constants import TILEWIDTH, TILEHEIGHT, LEFT, RIGHT, UP, DOWN, STOP, SCATTER, CHASE, FREIGHT, SPAWN
 
 class TestSpritesheet(unittest.TestCase):
+    @patch("CheeseChase.view.sprites.sheets", new_callable=SheetRegistry)
+    @patch("CheeseChase.view.sprites.pygame.display.get_surface", return_value=MagicMock())
     @patch("CheeseChase.view.sprites.resources.files")
     @patch("CheeseChase.view.sprites.pygame.image.load")
-    def test_init_sets_up_sheet_and_colorkey(self, mock_load, mock_files):
+    def test_init_sets_up_sheet_and_colorkey(self, mock_load, mock_files, mock_surface, mock_sheets):
         # Arrange: make image.load return an image-like mock
         mock_img = MagicMock()
         mock_img.convert.return_value = mock_img
@@ -30,6 +35,7 @@ class TestSpritesheet(unittest.TestCase):
         mock_img.convert.assert_called_once()
         mock_img.get_at.assert_called_once_with((0,0))
         mock_img.set_colorkey.assert_called_once_with((1,2,3,4))
+        self.assertIs(s.sheet, mock_img)
 
     def test_getImage_sets_clip_and_returns_subsurface(self):
         # Create instance without running __init__
@@ -48,6 +54,67 @@ class TestSpritesheet(unittest.TestCase):
             s.sheet.subsurface.assert_called_once_with("cliprect")
             self.assertEqual(res, "subsurf")
 
+class TestSheetRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = SheetRegistry()
+        self.mock_img = MagicMock()
+        self.mock_img.convert.return_value = self.mock_img
+        load_patcher = patch("CheeseChase.view.sprites.pygame.image.load", return_value=self.mock_img)
+        self.mock_load = load_patcher.start()
+        self.addCleanup(load_patcher.stop)
+
+    def test_loadSheet_skips_convert_without_a_display(self):
+        # Headless games never open a window, so there is no pixel format to convert to
+        with patch("CheeseChase.view.sprites.pygame.display.get_surface", return_value=None):
+            sheet = self.registry.getSheet("sheet.png")
+        self.mock_img.convert.assert_not_called()
+        self.assertIs(sheet, self.mock_img)
+        self.mock_img.set_colorkey.assert_called_once()
+
+    def test_preloaded_sheet_is_decoded_on_a_worker_and_converted_on_request(self):
+        with ThreadPoolExecutor(1) as executor:
+            future = self.registry.preload("sheet.png", executor)
+            self.assertIs(self.registry.preload("sheet.png", executor), future)
+            future.result()
+        self.mock_load.assert_called_once()
+        self.mock_img.convert.assert_not_called()
+        sheet = self.registry.getSheet("sheet.png")
+        self.assertIs(sheet, self.mock_img)
+        self.mock_load.assert_called_once()
+        self.mock_img.set_colorkey.assert_called_once()
+        self.assertEqual(self.registry.pending, {})
+
+    def test_getSheet_decodes_each_sheet_once(self):
+        first = self.registry.getSheet("sheet.png")
+        second = self.registry.getSheet("sheet.png")
+        # Same surface handed out, image decoded only once
+        self.assertIs(first, second)
+        self.mock_load.assert_called_once()
+        self.assertEqual(self.registry.loads["sheet.png"], 1)
+        self.assertEqual(self.registry.requests["sheet.png"], 2)
+
+    def test_spritesheets_share_registry_surface(self):
+        with patch("CheeseChase.view.sprites.sheets", self.registry):
+            a = Spritesheet()
+            b = Spritesheet()
+        self.assertIs(a.sheet, b.sheet)
+        self.mock_load.assert_called_once()
+
+    def test_stats_reports_loads_requests_and_time(self):
+        self.registry.getSheet("sheet.png")
+        self.registry.getSheet("sheet.png")
+        stats = self.registry.stats()
+        self.assertEqual(stats["sheet.png"]["loads"], 1)
+        self.assertEqual(stats["sheet.png"]["requests"], 2)
+        self.assertGreaterEqual(stats["sheet.png"]["loadTime"], 0)
+
+    def test_clear_forces_reload(self):
+        self.registry.getSheet("sheet.png")
+        self.registry.clear()
+        self.registry.getSheet("sheet.png")
+        self.assertEqual(self.mock_load.call_count, 2)
+        self.assertEqual(self.registry.loads["sheet.png"], 2)
+
 class TestMouseSprites(unittest.TestCase):
     @patch("CheeseChase.view.sprites.Spritesheet.__init__", return_value=None)
     @patch("CheeseChase.view.sprites.Spritesheet.getImage", return_value="startimg")
@@ -57,59 +124,77 @@ class TestMouseSprites(unittest.TestCase):
         self.assertEqual(entity.image, "startimg")
         # animations should include DEATH
         self.assertIn(DEATH, ms.animations)
-        self.assertEqual(ms.stopimage, (0, 0))
+        self.assertEqual(ms.stopimage, "startimg")
+
+    @patch("CheeseChase.view.sprites.Spritesheet.__init__", return_value=None)
+    def test_init_cuts_frames_once(self, mock_init):
+        entity = MagicMock()
+        with patch.object(MouseSprites, "getImage", side_effect=lambda x, y: (x, y)) as mock_getImage:
+            ms = MouseSprites(entity)
+        # 4 direction frames + 10 death frames, nothing else
+        self.assertEqual(mock_getImage.call_count, 14)
+        self.assertEqual(dict(ms.frames), {LEFT: (0, 0), RIGHT: (2, 0), DOWN: (4, 0), UP: (6, 0)})
+        self.assertEqual(ms.animations[DEATH].frames[0], (0, 6))
+        self.assertEqual(ms.animations[DEATH].frames[-1], (18, 6))
+        # frame table is read-only
+        with self.assertRaises(TypeError):
+            ms.frames[LEFT] = "other"
 
     def test_update_alive_direction_assigns_images_and_stopimage(self):
         # create instance without running Spritesheet.__init__
         ms = MouseSprites.__new__(MouseSprites)
         ms.getImage = MagicMock(return_value="img")
+        ms.frames = {LEFT: "left", RIGHT: "right", DOWN: "down", UP: "up"}
         ms.animations = {}
-        ms.stopimage = (2, 0)
+        ms.stopimage = "right"
         ms.entity = MagicMock()
         ms.entity.alive = True
 
         # LEFT
         ms.entity.direction = LEFT
         ms.update(0.1)
-        self.assertEqual(ms.entity.image, "img")
-        self.assertEqual(ms.stopimage, (0, 0))
+        self.assertEqual(ms.entity.image, "left")
+        self.assertEqual(ms.stopimage, "left")
 
         # RIGHT
         ms.entity.direction = RIGHT
         ms.update(0.1)
-        self.assertEqual(ms.entity.image, "img")
-        self.assertEqual(ms.stopimage, (2, 0))
+        self.assertEqual(ms.entity.image, "right")
+        self.assertEqual(ms.stopimage, "right")
 
         # DOWN
         ms.entity.direction = DOWN
         ms.update(0.1)
-        self.assertEqual(ms.entity.image, "img")
-        self.assertEqual(ms.stopimage, (4, 0))
+        self.assertEqual(ms.entity.image, "down")
+        self.assertEqual(ms.stopimage, "down")
 
         # UP
         ms.entity.direction = UP
         ms.update(0.1)
-        self.assertEqual(ms.entity.image, "img")
-        self.assertEqual(ms.stopimage, (6, 0))
+        self.assertEqual(ms.entity.image, "up")
+        self.assertEqual(ms.stopimage, "up")
 
-        # STOP uses stopimage
+        # STOP keeps the last moving frame
         ms.entity.direction = STOP
         ms.update(0.1)
-        self.assertEqual(ms.entity.image, "img")
+        self.assertEqual(ms.entity.image, "up")
+
+        # no surfaces are cut while updating
+        ms.getImage.assert_not_called()
 
     def test_update_dead_uses_death_animation(self):
         ms = MouseSprites.__new__(MouseSprites)
         ms.getImage = MagicMock(return_value="img")
-        # set animations to return tuple coords when update called
+        # death animation hands out pre-cut frames
         anim = MagicMock()
-        anim.update.return_value = (3, 4)
+        anim.update.return_value = "deathframe"
         ms.animations = {DEATH: anim}
         ms.entity = MagicMock()
         ms.entity.alive = False
         ms.update(0.1)
-        # when dead, entity.image should be set via getImage called with animation tuple
-        ms.getImage.assert_called_with(3, 4)
-        self.assertEqual(ms.entity.image, "img")
+        anim.update.assert_called_once_with(0.1)
+        self.assertEqual(ms.entity.image, "deathframe")
+        ms.getImage.assert_not_called()
 
     def test_reset_calls_animation_reset(self):
         ms = MouseSprites.__new__(MouseSprites)
@@ -118,11 +203,12 @@ class TestMouseSprites(unittest.TestCase):
         ms.reset()
         anim.reset.assert_called_once()
 
-    def test_getStartImage_delegates_to_getImage(self):
+    def test_getStartImage_uses_left_frame(self):
         ms = MouseSprites.__new__(MouseSprites)
-        ms.getImage = MagicMock(return_value="start")
+        ms.getImage = MagicMock(return_value="cut")
+        ms.frames = {LEFT: "start"}
         self.assertEqual(ms.getStartImage(), "start")
-        ms.getImage.assert_called_once_with(0, 0)
+        ms.getImage.assert_not_called()
 
 class TestCatSprites(unittest.TestCase):
     @patch("CheeseChase.view.sprites.Spritesheet.__init__", return_value=None)
@@ -131,11 +217,32 @@ class TestCatSprites(unittest.TestCase):
         entity = MagicMock()
         cs = CatSprites(entity)
         self.assertEqual(entity.image, "catstart")
-        self.assertEqual(cs.stopimage, (0, 2))
+        self.assertEqual(cs.stopimage, "catstart")
+
+    @patch("CheeseChase.view.sprites.Spritesheet.__init__", return_value=None)
+    def test_init_builds_mode_direction_table(self, mock_init):
+        entity = MagicMock()
+        with patch.object(CatSprites, "getImage", side_effect=lambda x, y: (x, y)) as mock_getImage:
+            cs = CatSprites(entity)
+        # 4 normal + 4 spawn + 1 freight frame
+        self.assertEqual(mock_getImage.call_count, 9)
+        for mode in (SCATTER, CHASE):
+            self.assertEqual(cs.frames[(mode, LEFT)], (0, 2))
+            self.assertEqual(cs.frames[(mode, UP)], (6, 2))
+        self.assertEqual(cs.frames[(SPAWN, RIGHT)], (2, 4))
+        self.assertEqual(cs.frames[(FREIGHT, STOP)], (8, 2))
+        self.assertNotIn((SCATTER, STOP), cs.frames)
 
     def test_update_behaviour_for_modes_and_directions(self):
         cs = CatSprites.__new__(CatSprites)
         cs.getImage = MagicMock(return_value="cimg")
+        cs.frames = {}
+        for direction in (LEFT, RIGHT, DOWN, UP):
+            cs.frames[(SCATTER, direction)] = "normal%d" % direction
+            cs.frames[(CHASE, direction)] = "normal%d" % direction
+            cs.frames[(SPAWN, direction)] = "spawn%d" % direction
+        for direction in (LEFT, RIGHT, DOWN, UP, STOP):
+            cs.frames[(FREIGHT, direction)] = "freight"
         cs.entity = MagicMock()
         # SCATTER/CHASE directions
         for mode in (SCATTER, CHASE):
@@ -144,23 +251,29 @@ class TestCatSprites(unittest.TestCase):
             for direction in (LEFT, RIGHT, DOWN, UP):
                 cs.entity.direction = direction
                 cs.update(0.1)
-                self.assertEqual(cs.entity.image, "cimg")
+                self.assertEqual(cs.entity.image, "normal%d" % direction)
+        # STOP keeps the current image
+        cs.entity.direction = STOP
+        cs.update(0.1)
+        self.assertEqual(cs.entity.image, "normal%d" % UP)
         # FREIGHT
         cs.entity.mode.current = FREIGHT
         cs.update(0.1)
-        self.assertEqual(cs.entity.image, "cimg")
+        self.assertEqual(cs.entity.image, "freight")
         # SPAWN directions
         cs.entity.mode.current = SPAWN
         for direction in (LEFT, RIGHT, DOWN, UP):
             cs.entity.direction = direction
             cs.update(0.1)
-            self.assertEqual(cs.entity.image, "cimg")
+            self.assertEqual(cs.entity.image, "spawn%d" % direction)
+        cs.getImage.assert_not_called()
 
-    def test_getStartImage_delegates_to_getImage(self):
+    def test_getStartImage_uses_scatter_left_frame(self):
         cs = CatSprites.__new__(CatSprites)
-        cs.getImage = MagicMock(return_value="startc")
+        cs.getImage = MagicMock(return_value="cut")
+        cs.frames = {(SCATTER, LEFT): "startc"}
         self.assertEqual(cs.getStartImage(), "startc")
-        cs.getImage.assert_called_once_with(0, 2)
+        cs.getImage.assert_not_called()
 
 class TestLifeSprites(unittest.TestCase):
     @patch("CheeseChase.view.sprites.Spritesheet.__init__", return_value=None)
@@ -193,15 +306,17 @@ class TestLifeSprites(unittest.TestCase):
 
 class TestMazeSprites(unittest.TestCase):
     @patch("CheeseChase.view.sprites.Spritesheet.__init__", return_value=None)
-    @patch("CheeseChase.view.sprites.np.loadtxt")
-    def test_init_loads_maze_and_rotdata(self, mock_loadtxt, mock_init):
-        mock_loadtxt.side_effect = [
-            np.array([["1","2"],["3","4"]]),
-            np.array([["0","1"],["2","3"]])
+    @patch("CheeseChase.view.sprites.MazeSprites.readMazeFile")
+    def test_init_loads_maze_and_rotdata(self, mock_read, mock_init):
+        mock_read.side_effect = [
+            [["1","2"],["3","4"]],
+            [["0","1"],["2","3"]]
         ]
         ms = MazeSprites("mazefile", "rotfile")
-        self.assertTrue((ms.data == np.array([["1","2"],["3","4"]])).all())
-        self.assertTrue((ms.rotdata == np.array([["0","1"],["2","3"]])).all())
+        mock_read.assert_any_call("mazefile")
+        mock_read.assert_any_call("rotfile")
+        self.assertEqual(ms.data, [["1","2"],["3","4"]])
+        self.assertEqual(ms.rotdata, [["0","1"],["2","3"]])
 
     @patch("CheeseChase.view.sprites.pygame.transform.rotate", return_value="rotsprite")
     def test_rotate_calls_pygame_transform_rotate(self, mock_rotate):
@@ -240,10 +355,19 @@ class TestMazeSprites(unittest.TestCase):
         mock_getImage.assert_called_once_with(ms, 3, 4, TILEWIDTH, TILEHEIGHT)
         self.assertEqual(res, "mimg")
 
-    @patch("CheeseChase.view.sprites.np.loadtxt", return_value=np.array([["a"]]))
-    def test_readMazeFile_returns_array(self, mock_loadtxt):
+    def test_readMazeFile_returns_rows_of_symbols(self):
+        ms = MazeSprites.__new__(MazeSprites)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.txt")
+            with open(path, "w") as f:
+                f.write("X 1 .\n\n2 = +\n")
+            rows = ms.readMazeFile(path)
+        self.assertEqual(rows, [["X", "1", "."], ["2", "=", "+"]])
+
+    def test_readMazeFile_matches_numpy_on_shipped_mazes(self):
+        from importlib import resources
         ms = MazeSprites.__new__(MazeSprites)
-        arr = ms.readMazeFile("mazefile.txt")
-        mock_loadtxt.assert_called_once_with("mazefile.txt", dtype='<U1')
-        self.assertTrue((arr == np.array([["a"]])).all())
+        for name in ("maze1.txt", "maze1_rotation.txt", "maze2.txt", "maze2_rotation.txt"):
+            path = str(resources.files("CheeseChase.resources") / name)
+            self.assertEqual(ms.readMazeFile(path), np.loadtxt(path, dtype='<U1').tolist())
 
@@ -1,6 +1,9 @@
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
-from CheeseChase.view.text import Text, TextGroup
+from CheeseChase.view.text import Text, TextGroup, TextCache, CounterText
 from CheeseChase.model.constants import RED, TILEHEIGHT, SCORETXT, LEVELTXT, READYTXT, PAUSETXT, GAMEOVERTXT
 
 class TestTextAndTextGroup(unittest.TestCase):
@@ -8,6 +11,9 @@ class TestTextAndTextGroup(unittest.TestCase):
         # Patch resources.files used to build font path and pygame.font.Font so no real pygame/font is required
         files_patcher = patch("CheeseChase.view.text.resources.files")
         font_patcher = patch("CheeseChase.view.text.pygame.font.Font")
+        cache_patcher = patch("CheeseChase.view.text.textcache", new_callable=TextCache)
+        self.textcache = cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
 
         self.mock_files = files_patcher.start()
         self.addCleanup(files_patcher.stop)
@@ -24,8 +30,14 @@ class TestTextAndTextGroup(unittest.TestCase):
         # create a mock font instance with render method
         self.mock_font_inst = MagicMock()
         self.mock_font_inst.render.return_value = "label-surface"
+        self.mock_font_inst.size.return_value = (16, 16)
         self.mock_font_class.return_value = self.mock_font_inst
 
+        # counters compose their label on their own surface
+        surface_patcher = patch("CheeseChase.view.text.pygame.Surface")
+        self.mock_surface_class = surface_patcher.start()
+        self.addCleanup(surface_patcher.stop)
+
     def test_text_initialization_and_font_setup(self):
         t = Text("Hello", RED, 10, 20, 12)
         # font constructed with path string and size
@@ -59,8 +71,6 @@ class TestTextAndTextGroup(unittest.TestCase):
     def test_render_blits_when_visible_and_skips_when_not(self):
         t = Text("Hi", RED, 3, 4, 10)
         screen = MagicMock()
-        # ensure position.asTuple returns tuple (3,4)
-        t.position.asTuple = MagicMock(return_value=(3, 4))
         t.visible = True
         t.label = "lbl"
         t.render(screen)
@@ -125,3 +135,90 @@ class TestTextAndTextGroup(unittest.TestCase):
         tg.render(screen)
         for tkey in list(tg.alltext.keys()):
             tg.alltext[tkey].render.assert_called_once_with(screen)
+
+    def test_font_is_loaded_once_per_path_and_size(self):
+        Text("A", RED, 0, 0, 12)
+        Text("B", RED, 0, 0, 12)
+        Text("C", RED, 0, 0, 8)
+        # one Font per distinct size, reused afterwards
+        self.assertEqual(self.mock_font_class.call_count, 2)
+        self.assertEqual(self.textcache.fontMisses, 2)
+        self.assertEqual(self.textcache.fontHits, 1)
+
+    def test_repeated_labels_are_rendered_once(self):
+        for i in range(3):
+            Text("200", RED, i, i, 8, time=1)
+        self.mock_font_inst.render.assert_called_once_with("200", 1, RED)
+        stats = self.textcache.stats()
+        self.assertEqual(stats["labelMisses"], 1)
+        self.assertEqual(stats["labelHits"], 2)
+
+    def test_preloaded_font_is_built_from_memory(self):
+        cache = TextCache()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "font.ttf")
+            with open(path, "wb") as f:
+                f.write(b"font bytes")
+            with ThreadPoolExecutor(1) as executor:
+                cache.preloadFont(path, executor).result()
+        cache.getFont(path, 8)
+        cache.getFont(path, 16)
+        # both sizes come from the bytes read once, the file is gone by now
+        self.assertEqual(self.mock_font_class.call_count, 2)
+        for call in self.mock_font_class.call_args_list:
+            self.assertEqual(call.args[0].getvalue(), b"font bytes")
+        self.assertEqual(cache.pending, {})
+
+    def test_label_cache_evicts_least_recently_used(self):
+        cache = TextCache(maxlabels=2)
+        cache.getLabel("fontpath", 8, "200", RED)
+        cache.getLabel("fontpath", 8, "400", RED)
+        cache.getLabel("fontpath", 8, "200", RED)  # refresh "200"
+        cache.getLabel("fontpath", 8, "800", RED)  # evicts "400"
+        self.assertIn(("fontpath", 8, "200", RED), cache.labels)
+        self.assertNotIn(("fontpath", 8, "400", RED), cache.labels)
+        self.assertEqual(len(cache.labels), 2)
+
+    def test_label_cache_keys_on_color_and_size(self):
+        cache = TextCache()
+        cache.getLabel("fontpath", 8, "READY!", RED)
+        cache.getLabel("fontpath", 8, "READY!", (0, 0, 0))
+        cache.getLabel("fontpath", 16, "READY!", RED)
+        self.assertEqual(cache.labelMisses, 3)
+        cache.clear()
+        self.assertEqual(cache.stats()["labels"], 0)
+
+    def test_counter_prerenders_digits_once(self):
+        CounterText(0, RED, 0, 0, 16, 8)
+        CounterText(1, RED, 0, 0, 16, 3)
+        rendered = [c.args[0] for c in self.mock_font_inst.render.call_args_list]
+        self.assertEqual(sorted(rendered), list("0123456789"))
+
+    def test_counter_blits_only_changed_digits(self):
+        counter = CounterText(0, RED, 0, 0, 16, 8)
+        label = self.mock_surface_class.return_value
+        self.assertEqual(counter.glyphBlits, 8)
+        self.mock_font_inst.render.reset_mock()
+        label.blit.reset_mock()
+        counter.setText("00000120")
+        self.assertEqual(counter.text, "00000120")
+        self.assertEqual(label.blit.call_count, 2)
+        self.assertEqual(counter.glyphBlits, 10)
+        self.mock_font_inst.render.assert_not_called()
+        # same value again costs nothing
+        counter.setText("00000120")
+        self.assertEqual(label.blit.call_count, 2)
+
+    def test_counter_falls_back_to_font_for_non_digits(self):
+        counter = CounterText(0, RED, 0, 0, 16, 3)
+        counter.setText("---")
+        self.assertEqual(counter.label, "label-surface")
+        counter.setText("007")
+        self.assertEqual(counter.label, self.mock_surface_class.return_value)
+
+    def test_textgroup_score_and_level_are_counters(self):
+        tg = TextGroup()
+        self.assertIsInstance(tg.alltext[SCORETXT], CounterText)
+        self.assertIsInstance(tg.alltext[LEVELTXT], CounterText)
+        self.assertEqual(tg.alltext[SCORETXT].text, "00000000")
+        self.assertEqual(tg.alltext[LEVELTXT].text, "001")
@@ -96,3 +96,36 @@ class TestVector2(unittest.TestCase):
         # String representation should be "<x, y>"
         v = Vector2(2, 3)
         self.assertEqual(str(v), "<2, 3>")
+
+    def test_slots_and_class_level_threshold(self):
+        # No per-instance __dict__, threshold shared by every vector
+        v = Vector2(1, 2)
+        self.assertFalse(hasattr(v, "__dict__"))
+        with self.assertRaises(AttributeError):
+            v.z = 3
+        self.assertIs(Vector2.thresh, v.thresh)
+
+    def test_inplace_operators_mutate_and_return_self(self):
+        v = Vector2(1, 2)
+        same = v
+        v += Vector2(3, 4)
+        self.assertIs(v, same)
+        self.assertEqual(v.asTuple(), (4, 6))
+        v -= Vector2(1, 1)
+        self.assertIs(v, same)
+        self.assertEqual(v.asTuple(), (3, 5))
+        v *= 2
+        self.assertIs(v, same)
+        self.assertEqual(v.asTuple(), (6, 10))
+
+    def test_addScaled(self):
+        v = Vector2(1, 1)
+        result = v.addScaled(Vector2(-1, 0), 2.5)
+        self.assertIs(result, v)
+        self.assertEqual(v.asTuple(), (-1.5, 1))
+
+    def test_distanceSquaredTo_matches_subtraction(self):
+        a = Vector2(3.5, -2)
+        b = Vector2(-1, 4)
+        self.assertEqual(a.distanceSquaredTo(b), (a - b).magnitudeSquared())
+        self.assertEqual(a.distanceSquaredTo(a), 0)